@@ -16,7 +16,7 @@
 # limitations under the License.
 #
 import os
-from elf_file_mgr import ElfFileMgr
+from elf_file_mgr import ElfFileMgr, CompactElfFileMgr, GraphDump
 
 
 def __create_arg_parser():
@@ -33,6 +33,37 @@ def __create_arg_parser():
     parser.add_argument('-n', '--no-fail',
                         help='force to pass all rules', required=False)
 
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes to parse ELF files, 0 means all cpus', required=False)
+
+    parser.add_argument('--cache',
+                        help='ELF scan cache file reused across runs', required=False)
+
+    parser.add_argument('--cache-hash', action='store_true',
+                        help='validate ELF scan cache entries by content hash when mtime changed', required=False)
+
+    parser.add_argument('--graph', choices=['dict', 'compact'], default='dict',
+                        help='dependency graph backend, compact uses less memory for large products', required=False)
+
+    parser.add_argument('--report-memory', action='store_true',
+                        help='report peak memory used by scanning and checking', required=False)
+
+    parser.add_argument('--snapshot',
+                        help='snapshot of modules and violations, the baseline of incremental checking', required=False)
+
+    parser.add_argument('--changed',
+                        help='file listing changed modules, or "snapshot" to compare modules with the snapshot; '
+                             'only changed modules and their transitive callers and callees are checked', required=False)
+
+    parser.add_argument('--report-jsonl',
+                        help='stream rule checking results to this file as JSON Lines', required=False)
+
+    parser.add_argument('--dump-graph',
+                        help='dump the dependency graph to this SQLite file for later analyses', required=False)
+
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='print statistics of rules checking', required=False)
+
     return parser
 
 
@@ -49,7 +80,17 @@ def __read_part_chipsetsdk_arg(out_path):
 
 
 def _deps_guard_module(out_path, args=None):
-    mgr = ElfFileMgr(out_path)
+    report_memory = getattr(args, "report_memory", False)
+    if report_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    if getattr(args, "graph", "dict") == "compact":
+        mgr_class = CompactElfFileMgr
+    else:
+        mgr_class = ElfFileMgr
+    mgr = mgr_class(out_path, jobs=getattr(args, "jobs", 1),
+                    cache_file=getattr(args, "cache", None), cache_hash=getattr(args, "cache_hash", False))
     mgr.scan_all_files()
 
     from rules_checker import check_all_rules
@@ -58,6 +99,14 @@ def _deps_guard_module(out_path, args=None):
         passed = check_all_rules(mgr, args, True)
     else:
         passed = check_all_rules(mgr, args, False)
+
+    if getattr(args, "dump_graph", None):
+        GraphDump.dump(mgr, args.dump_graph)
+
+    if report_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("Peak memory of %s graph: %.1f MB" % (getattr(args, "graph", "dict"), peak / 1024.0 / 1024.0))
     if passed:
         print("All rules passed")
         return
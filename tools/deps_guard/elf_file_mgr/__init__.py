@@ -19,3 +19,5 @@
 from .elf_walker import ELFWalker
 
 from .elf_file_mgr import ElfFileMgr
+from .compact_graph import CompactElfFileMgr
+from .graph_dump import GraphDump
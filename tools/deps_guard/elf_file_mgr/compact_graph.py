@@ -0,0 +1,432 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import sys
+from array import array
+from stat import ST_SIZE
+
+from .elf_file import ElfFile
+from .elf_file_mgr import ElfFileMgr
+
+# Attributes set by the loaders and parsers, stored in slots instead of a dict per module
+NODE_KEYS = ("id", "name", "size", "type", "path", "missing", "duplicate",
+             "subsystem", "componentName", "moduleName", "labelPath", "version_script",
+             "third_party", "chipset", "napi", "sa_id", "shlib_type",
+             "innerapi", "innerapi_tags", "innerapi_declared",
+             "modGroup", "platformsdk", "chipsetsdk", "hdiType",
+             "text_size", "data_size", "bss_size")
+
+# Dependency lists, computed from the adjacency arrays of the graph
+EDGE_KEYS = ("deps", "dependedBy", "deps_internal", "deps_external", "dependedBy_internal", "dependedBy_external")
+
+_NODE_KEY_SET = frozenset(NODE_KEYS)
+_EDGE_KEY_SET = frozenset(EDGE_KEYS)
+
+# Bit flags of one dependency: (value bit, presence bit)
+_EDGE_FLAGS = {
+    "external": (0x1, 0x0),
+    "platformsdk": (0x2, 0x8),
+    "chipsetsdk": (0x4, 0x10)
+}
+_EDGE_KEYS = ("id", "caller_id", "callee_id", "caller", "callee", "external", "calls", "platformsdk", "chipsetsdk")
+
+
+class CompactElfFile(object):
+    """
+    ELF module node of the compact graph.
+    It keeps the dict interface of ElfFileWithDepsInfo so rules_checker works unchanged.
+    """
+    __slots__ = ("_graph", "_f", "_f_safe", "_elf_info", "_extra") + NODE_KEYS
+
+    def __init__(self, graph, file, prefix):
+        self._graph = graph
+        self._f = file
+        self._f_safe = "'%s'" % file
+        self._elf_info = None
+        self._extra = None
+
+        self["name"] = os.path.basename(file)
+        self["size"] = os.stat(self._f)[ST_SIZE]
+        if self["name"].find(".so") > 0:
+            self["type"] = "lib"
+        else:
+            self["type"] = "bin"
+        self["path"] = file[len(prefix):]
+
+    # Share the ELF reading with the dict based ElfFile
+    is_library = ElfFile.is_library
+    get_file = ElfFile.get_file
+    get_elf_info = ElfFile.get_elf_info
+    set_elf_info = ElfFile.set_elf_info
+    library_depends = ElfFile.library_depends
+    _library_depends_by_strings = ElfFile._library_depends_by_strings
+
+    def __getitem__(self, key):
+        if key in _EDGE_KEY_SET:
+            return self._graph.get_edges(self.id, key)
+        if key in _NODE_KEY_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        # Dependency lists are derived from the graph, assigning them is ignored
+        if key in _EDGE_KEY_SET:
+            return
+        if isinstance(value, str):
+            value = sys.intern(value)
+        elif key == "innerapi_tags":
+            value = self._graph.intern_tags(value)
+        if key in _NODE_KEY_SET:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __contains__(self, key):
+        if key in _EDGE_KEY_SET:
+            return True
+        if key in _NODE_KEY_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def keys(self):
+        res = [k for k in NODE_KEYS if hasattr(self, k)]
+        res.extend(EDGE_KEYS)
+        if self._extra:
+            res.extend(self._extra.keys())
+        return res
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactElfFile):
+            return NotImplemented
+
+        return self.id == other.id
+
+    def __hash__(self):
+        return self.id
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return "%s:%d deps(%d) dependedBy(%d)" % (self["name"], self["id"], len(self["deps"]), len(self["dependedBy"]))
+
+    def depends_on(self, mod):
+        for dep in self["deps"]:
+            if dep["callee"] == mod:
+                return True
+        return False
+
+
+class CompactDependency(object):
+    """
+    View of one dependency stored in the arrays of CompactGraph.
+    """
+    __slots__ = ("_graph", "_idx")
+
+    def __init__(self, graph, idx):
+        self._graph = graph
+        self._idx = idx
+
+    def __getitem__(self, key):
+        graph = self._graph
+        if key == "caller":
+            return graph.get_node(graph.callers[self._idx])
+        if key == "callee":
+            return graph.get_node(graph.callees[self._idx])
+        if key == "caller_id":
+            return graph.callers[self._idx]
+        if key == "callee_id":
+            return graph.callees[self._idx]
+        if key == "id":
+            return self._idx + 1
+        if key in _EDGE_FLAGS:
+            value_bit, present_bit = _EDGE_FLAGS[key]
+            flags = graph.flags[self._idx]
+            if present_bit and not flags & present_bit:
+                raise KeyError(key)
+            return bool(flags & value_bit)
+        if key == "calls":
+            return graph.calls.get(self._idx, 0)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        graph = self._graph
+        if key in _EDGE_FLAGS:
+            value_bit, present_bit = _EDGE_FLAGS[key]
+            flags = graph.flags[self._idx] | present_bit
+            if value:
+                flags = flags | value_bit
+            else:
+                flags = flags & ~value_bit
+            graph.flags[self._idx] = flags
+        elif key == "calls":
+            graph.calls[self._idx] = value
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in _EDGE_FLAGS:
+            present_bit = _EDGE_FLAGS[key][1]
+            return not present_bit or bool(self._graph.flags[self._idx] & present_bit)
+        return key in _EDGE_KEYS
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def keys(self):
+        return [k for k in _EDGE_KEYS if k in self]
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactDependency):
+            return NotImplemented
+
+        return self._idx == other._idx
+
+    def __hash__(self):
+        return self._idx
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return "(%s:%s[%d] -%d:%d-> %s:%s[%d])" % (self["caller"]["componentName"], self["caller"]["name"], self["caller"]["id"], int(self["external"]), self["calls"], self["callee"]["componentName"], self["callee"]["name"], self["callee"]["id"])
+
+
+class CompactGraph(object):
+    """
+    Dependency graph with integer ids and CSR style adjacency arrays.
+    Edge i goes from callers[i] to callees[i]; deps and dependedBy of a node are
+    ranges in the offset arrays built by finalize().
+    """
+
+    def __init__(self):
+        self._nodes = []
+        self.callers = array("i")
+        self.callees = array("i")
+        self.flags = array("B")
+        self.calls = {}
+        self._tags = {}
+        self._dirty = True
+        self._deps_offsets = array("i")
+        self._deps_edges = array("i")
+        self._by_offsets = array("i")
+        self._by_edges = array("i")
+
+    def add_node(self, elf):
+        self._nodes.append(elf)
+        self._dirty = True
+
+    def get_node(self, elf_id):
+        return self._nodes[elf_id - 1]
+
+    def add_edge(self, caller_id, callee_id):
+        self.callers.append(caller_id)
+        self.callees.append(callee_id)
+        self.flags.append(0)
+        self._dirty = True
+        return CompactDependency(self, len(self.callers) - 1)
+
+    def edge_count(self):
+        return len(self.callers)
+
+    def intern_tags(self, tags):
+        # innerapi_tags take only a few distinct values, share one tuple for each of them
+        tags = tuple(tags)
+        return self._tags.setdefault(tags, tags)
+
+    def finalize(self):
+        if not self._dirty:
+            return
+        self._deps_offsets, self._deps_edges = self.__build_csr(self.callers)
+        self._by_offsets, self._by_edges = self.__build_csr(self.callees)
+        self._dirty = False
+
+    def __build_csr(self, keys):
+        # Counting sort of edge indexes by node id, stable so the insertion order of edges is kept
+        node_cnt = len(self._nodes)
+        offsets = array("i", [0]) * (node_cnt + 2)
+        for node_id in keys:
+            offsets[node_id + 1] += 1
+        for idx in range(1, node_cnt + 2):
+            offsets[idx] += offsets[idx - 1]
+        edges = array("i", [0]) * len(keys)
+        pos = array("i", offsets)
+        for edge_idx, node_id in enumerate(keys):
+            edges[pos[node_id]] = edge_idx
+            pos[node_id] += 1
+        return offsets, edges
+
+    def get_edges(self, elf_id, key):
+        self.finalize()
+        if key.startswith("deps"):
+            offsets, edges = self._deps_offsets, self._deps_edges
+        else:
+            offsets, edges = self._by_offsets, self._by_edges
+
+        indexes = edges[offsets[elf_id]:offsets[elf_id + 1]]
+        if key.endswith("_internal"):
+            indexes = [idx for idx in indexes if not self.flags[idx] & 0x1]
+        elif key.endswith("_external"):
+            indexes = [idx for idx in indexes if self.flags[idx] & 0x1]
+        return [CompactDependency(self, idx) for idx in indexes]
+
+    def get_all_deps(self):
+        return [CompactDependency(self, idx) for idx in range(len(self.callers))]
+
+
+class CompactElfFileMgr(ElfFileMgr):
+    """
+    ElfFileMgr backed by CompactGraph, for products with a large number of modules.
+    """
+
+    def __init__(self, product_out_path=None, jobs=1, cache_file=None, cache_hash=False):
+        self._graph = CompactGraph()
+        super(CompactElfFileMgr, self).__init__(product_out_path, self.__create_elf_file, None, jobs,
+                                                cache_file, cache_hash)
+
+    def __create_elf_file(self, file, prefix):
+        return CompactElfFile(self._graph, file, prefix)
+
+    def add_elf_file(self, elf):
+        super(CompactElfFileMgr, self).add_elf_file(elf)
+        self._graph.add_node(elf)
+
+    def add_dependence(self, caller, callee):
+        dep = self._graph.add_edge(caller["id"], callee["id"])
+        self._dep_idx = self._dep_idx + 1
+        return dep
+
+    def get_all_deps(self):
+        return self._graph.get_all_deps()
+
+    def _build_deps_tree(self):
+        super(CompactElfFileMgr, self)._build_deps_tree()
+        self._graph.finalize()
+
+
+def __new_node(mgr, idx):
+    # Build a node without touching the file system, with the attributes set by CompileInfoLoader
+    if isinstance(mgr, CompactElfFileMgr):
+        elf = CompactElfFile.__new__(CompactElfFile)
+        elf._graph = mgr._graph
+        elf._f = elf._f_safe = elf._elf_info = elf._extra = None
+    else:
+        from .elf_file_mgr import ElfFileWithDepsInfo
+        elf = ElfFileWithDepsInfo.__new__(ElfFileWithDepsInfo)
+        elf["deps"] = []
+        elf["dependedBy"] = []
+    elf["name"] = "libmodule_%d.z.so" % idx
+    elf["size"] = idx * 64
+    elf["type"] = "lib"
+    elf["path"] = "system/lib64/libmodule_%d.z.so" % idx
+    elf["missing"] = []
+    elf["subsystem"] = "subsystem_%d" % (idx % 50)
+    elf["componentName"] = "component_%d" % (idx % 500)
+    elf["moduleName"] = "module_%d" % idx
+    elf["labelPath"] = "//foundation/component_%d:module_%d" % (idx % 500, idx)
+    elf["version_script"] = ""
+    elf["shlib_type"] = ""
+    elf["innerapi_tags"] = ["platformsdk"] if idx % 7 == 0 else []
+    for k in ("third_party", "chipset", "napi", "innerapi", "innerapi_declared", "platformsdk", "chipsetsdk"):
+        elf[k] = False
+    elf["sa_id"] = 0
+    elf["modGroup"] = "private"
+    elf["hdiType"] = ""
+    for k in ("deps_internal", "deps_external", "dependedBy_internal", "dependedBy_external"):
+        elf[k] = []
+    return elf
+
+
+def __measure(mgr_class, node_cnt, edge_cnt):
+    import random
+    import tracemalloc
+
+    rand = random.Random(1)
+    tracemalloc.start()
+    mgr = mgr_class.__new__(mgr_class)
+    if mgr_class is CompactElfFileMgr:
+        mgr._graph = CompactGraph()
+    mgr._elf_files = []
+    mgr._path_dict = {}
+    mgr._basename_dict = {}
+    mgr._deps = []
+    mgr._dependence_class = None
+    mgr._dep_idx = 1
+    mgr._elf_idx = 1
+    if mgr_class is ElfFileMgr:
+        from .elf_file_mgr import Dependency
+        mgr._dependence_class = Dependency
+
+    for idx in range(node_cnt):
+        mgr.add_elf_file(__new_node(mgr, idx))
+    elfs = mgr.get_all()
+    for caller in elfs:
+        for _ in range(edge_cnt // node_cnt):
+            mgr.add_dependence(caller, elfs[rand.randrange(node_cnt)])
+    if mgr_class is CompactElfFileMgr:
+        mgr._graph.finalize()
+
+    # Same updates as CompileInfoLoader.__update_deps
+    for dep in mgr.get_all_deps():
+        caller = dep["caller"]
+        callee = dep["callee"]
+        dep["platformsdk"] = False
+        dep["chipsetsdk"] = False
+        dep["external"] = caller["componentName"] != callee["componentName"]
+        if dep["external"]:
+            caller["deps_external"].append(dep)
+            callee["dependedBy_external"].append(dep)
+        else:
+            caller["deps_internal"].append(dep)
+            callee["dependedBy_internal"].append(dep)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, mgr
+
+
+if __name__ == '__main__':
+    nodes = 20000
+    edges = 200000
+    if len(sys.argv) > 2:
+        nodes = int(sys.argv[1])
+        edges = int(sys.argv[2])
+
+    dict_peak, _ = __measure(ElfFileMgr, nodes, edges)
+    compact_peak, _ = __measure(CompactElfFileMgr, nodes, edges)
+    print("%d modules, %d dependencies" % (nodes, edges))
+    print("dict backend:    peak %.1f MB" % (dict_peak / 1024.0 / 1024.0))
+    print("compact backend: peak %.1f MB" % (compact_peak / 1024.0 / 1024.0))
@@ -19,13 +19,15 @@
 import os
 from stat import ST_SIZE
 
-from .utils import command, command_without_error
+from .utils import command_without_error
+from .elf_reader import read_elf_info
 
 
 class ElfFile(dict):
     def __init__(self, file, prefix):
         self._f = file
         self._f_safe = "'%s'" % file
+        self._elf_info = None
 
         self["name"] = os.path.basename(file)
         self["size"] = os.stat(self._f)[ST_SIZE]
@@ -49,10 +51,30 @@ class ElfFile(dict):
     def get_file(self):
         return self._f
 
+    def get_elf_info(self):
+        if self._elf_info is None:
+            self._elf_info = read_elf_info(self._f)
+        return self._elf_info
+
+    def set_elf_info(self, info):
+        self._elf_info = info
+
     # Return a set of libraries the passed objects depend on.
     def library_depends(self):
         if not os.access(self._f, os.F_OK):
             raise Exception("Cannot find lib: " + self._f)
+        try:
+            needed = self.get_elf_info()["needed"]
+        except ValueError as e:
+            print("Warning: %s, fall back to strings" % str(e))
+            return self._library_depends_by_strings()
+
+        res = []
+        for line in needed:
+            res.append([line.split("/")[-1].strip(), line])
+        return res
+
+    def _library_depends_by_strings(self):
         file_name = self._f_safe.split("/")[-1].strip("'")
         dynamics = command_without_error("strings", self._f_safe, f"|grep -E 'lib[-_/a-zA-Z0-9.]+\.so$'|grep -v ':'|grep -v {file_name}")
         res = []
@@ -65,25 +87,23 @@ class ElfFile(dict):
         return res
 
     def __extract_soname(self):
-        soname_data = command("mklibs-readelf", "--print-soname", self._f_safe)
-        if soname_data:
-            return soname_data.pop()
-        return ""
+        return self.get_elf_info()["soname"]
 
     def __extract_elf_size(self):
-        size_data = command("size", self._f_safe)
-        if not size_data or len(size_data) < 2:
-            self["text_size"] = 0
-            self["data_size"] = 0
-            self["bss_size"] = 0
-            return 0
-
-        vals = size_data[1].split()
-        self["text_size"] = int(vals[0])
-        self["data_size"] = int(vals[1])
-        self["bss_size"] = int(vals[2])
+        info = self.get_elf_info()
+        self["text_size"] = info["text_size"]
+        self["data_size"] = info["data_size"]
+        self["bss_size"] = info["bss_size"]
         return ""
 
+# Worker for parallel scanning, returns a picklable record of one ELF file
+def load_elf_record(file):
+    try:
+        return file, read_elf_info(file)
+    except (OSError, ValueError):
+        return file, None
+
+
 if __name__ == '__main__':
     import elf_walker
 
@@ -19,9 +19,12 @@
 import string
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-from .elf_file import ElfFile
+from .elf_file import ElfFile, load_elf_record
 from .elf_walker import ELFWalker
+from .scan_cache import ElfScanCache
+from .module_index import ModuleIndex
 from .module_info import CompileInfoLoader
 from .hdi import HdiParser
 from .sa import SAParser
@@ -77,7 +80,8 @@ class Dependency(dict):
 
 
 class ElfFileMgr(object):
-    def __init__(self, product_out_path=None, elf_file_class=None, dependence_class=None):
+    def __init__(self, product_out_path=None, elf_file_class=None, dependence_class=None, jobs=1,
+                 cache_file=None, cache_hash=False):
         self._elf_files = []
         self._path_dict = {}
         self._basename_dict = {}
@@ -95,11 +99,22 @@ class ElfFileMgr(object):
         self._elf_idx = 1
 
         self._not_found_depened_files = []
+        self._module_index = None
+
+        # Number of worker processes for ELF parsing, 0 means os.cpu_count()
+        if not jobs:
+            jobs = os.cpu_count() or 1
+        self._jobs = jobs
+
+        self._scan_cache = None
+        if cache_file:
+            self._scan_cache = ElfScanCache(cache_file, cache_hash)
 
         walker = ELFWalker(product_out_path)
         self._prefix = walker.get_product_images_path()
         self._product_out_path = walker.get_product_out_path()
         self._link_file_map = walker.get_link_file_map()
+        self.__build_link_index()
 
     def scan_all_files(self):
         walker = ELFWalker(self._product_out_path)
@@ -114,6 +129,7 @@ class ElfFileMgr(object):
         CompileInfoLoader.load(self, self._product_out_path)
         HdiParser.load(self, self._product_out_path)
         SAParser.load(self, self._product_out_path)
+        self._module_index = None
 
     def get_product_images_path(self):
         return self._prefix
@@ -183,8 +199,30 @@ class ElfFileMgr(object):
     def get_all_deps(self):
         return self._deps
 
+    def get_affected_modules(self, changed):
+        # Changed modules with all of their transitive callers and callees, in module order
+        affected = set()
+        for key, side in (("deps", "callee_id"), ("dependedBy", "caller_id")):
+            pending = [elf["id"] for elf in changed]
+            visited = set(pending)
+            while pending:
+                elf = self.get_elf_by_idx(pending.pop())
+                for dep in elf[key]:
+                    if dep[side] not in visited:
+                        visited.add(dep[side])
+                        pending.append(dep[side])
+            affected |= visited
+        return [elf for elf in self._elf_files if elf["id"] in affected]
+
+    def get_module_index(self):
+        # Built on first use, after compile information of all modules is loaded
+        if not self._module_index:
+            self._module_index = ModuleIndex(self)
+        return self._module_index
+
     def _scan_all_elf_files(self, walker):
         print("Scanning %d ELF files now ..." % len(walker.get_elf_files()))
+        records = self.__load_elf_records(walker.get_elf_files())
         for f in walker.get_elf_files():
             elf = self._elf_file_class(f, self._prefix)
             if elf["path"] in self._path_dict:
@@ -195,6 +233,8 @@ class ElfFileMgr(object):
             if elf["name"] in ["hdc_std"]:
                 continue
 
+            if records.get(f):
+                elf.set_elf_info(records[f])
             self.add_elf_file(elf)
 
         # Reorder libraries with same name as defined by LD_LIBRARY_PATH
@@ -203,6 +243,42 @@ class ElfFileMgr(object):
                 continue
             self._basename_dict[bname] = self.__reorder_library(val)
 
+    def __load_elf_records(self, files):
+        # Without cache and workers, ELF files are parsed lazily when building the deps tree
+        if not self._scan_cache and self._jobs <= 1:
+            return {}
+
+        records = {}
+        missed_files = files
+        if self._scan_cache:
+            missed_files = []
+            for f in files:
+                info = self._scan_cache.get(f)
+                if info is None:
+                    missed_files.append(f)
+                else:
+                    records[f] = info
+
+        records.update(self.__parse_elf_files(missed_files))
+
+        if self._scan_cache:
+            for f in missed_files:
+                if records.get(f):
+                    self._scan_cache.put(f, records[f])
+            self._scan_cache.save()
+            print(self._scan_cache.get_summary())
+        return records
+
+    def __parse_elf_files(self, files):
+        # Parse ELF headers and dependencies in worker processes, the graph itself is still built in order
+        if self._jobs <= 1 or len(files) < 2:
+            return dict(map(load_elf_record, files))
+
+        print("Parsing %d ELF files with %d workers ..." % (len(files), self._jobs))
+        chunksize = max(1, len(files) // (self._jobs * 4))
+        with ProcessPoolExecutor(max_workers=self._jobs) as pool:
+            return dict(pool.map(load_elf_record, files, chunksize=chunksize))
+
     def __reorder_library(self, val):
         orders = []
         idx = 0
@@ -242,6 +318,7 @@ class ElfFileMgr(object):
         for elf in self._elf_files:
             self.__build_deps_tree_for_one_elf(elf)
         print("    Got %d dependencies" % self._dep_idx)
+        print("    %d link lookups, %d resolved through links" % (self._link_lookups, self._link_resolved))
 
     def __build_deps_tree_for_one_elf(self, elf):
         elf["missing"] = []
@@ -260,20 +337,36 @@ class ElfFileMgr(object):
                     dep_elf[0]["duplicate"] = True
                 self.add_dependence(elf, dep_elf[0])
 
-    def __get_link_file(self, name):
+    def __build_link_index(self):
+        # basename of link -> path of link target relative to images path, the first link wins
+        self._link_path_dict = {}
+        self._link_elf_dict = {}
+        self._link_lookups = 0
+        self._link_resolved = 0
+        norm_prefix = os.path.normpath(self._prefix) + "/"
         for src, target in self._link_file_map.items():
-            tmp_name = os.path.basename(src)
-            if name != tmp_name:
+            name = os.path.basename(src)
+            if name in self._link_path_dict:
                 continue
-            tmp_name = os.path.dirname(src)
-            tmp_name = os.path.join(tmp_name, target)
+            link_file = os.path.join(os.path.dirname(src), target)
             if name in ["libc.so"]:
-                tmp_name = os.path.normpath(tmp_name)
-                norm_prefix = os.path.normpath(self._prefix) + "/"
-                link_elf = ElfFile(tmp_name, norm_prefix)
+                self._link_path_dict[name] = os.path.normpath(link_file)[len(norm_prefix):]
             else:
-                link_elf = ElfFile(tmp_name, self._prefix)
-            return self.get_elf_by_path(link_elf["path"])
+                self._link_path_dict[name] = link_file[len(self._prefix):]
+
+    def __get_link_file(self, name):
+        self._link_lookups = self._link_lookups + 1
+        if name in self._link_elf_dict:
+            link_elf = self._link_elf_dict[name]
+        else:
+            link_elf = None
+            if name in self._link_path_dict:
+                link_elf = self.get_elf_by_path(self._link_path_dict[name])
+            self._link_elf_dict[name] = link_elf
+
+        if link_elf:
+            self._link_resolved = self._link_resolved + 1
+        return link_elf
 
 
 if __name__ == '__main__':
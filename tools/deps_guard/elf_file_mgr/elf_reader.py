@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import mmap
+import struct
+
+ELFCLASS32 = 1
+ELFCLASS64 = 2
+ELFDATA2LSB = 1
+ELFDATA2MSB = 2
+
+SHT_DYNAMIC = 6
+SHT_NOBITS = 8
+SHF_WRITE = 0x1
+SHF_ALLOC = 0x2
+
+PT_LOAD = 1
+PT_DYNAMIC = 2
+
+DT_NULL = 0
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_SONAME = 14
+DT_RPATH = 15
+DT_RUNPATH = 29
+
+# Struct layouts without the byte order prefix, indexed by ELF class
+_EHDR_FORMAT = {
+    # e_phoff, e_shoff, e_phentsize, e_phnum, e_shentsize, e_shnum, e_shstrndx
+    ELFCLASS32: (0x1C, "II", 0x2A, "HHHHH"),
+    ELFCLASS64: (0x20, "QQ", 0x36, "HHHHH")
+}
+_SHDR_FORMAT = {
+    # sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size, sh_link
+    ELFCLASS32: "IIIIIII",
+    ELFCLASS64: "IIQQQQI"
+}
+_PHDR_FORMAT = {
+    ELFCLASS32: ("IIIIII", (0, 1, 2, 4)),   # p_type, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz
+    ELFCLASS64: ("IIQQQQ", (0, 2, 3, 5))    # p_type, p_flags, p_offset, p_vaddr, p_paddr, p_filesz
+}
+_DYN_FORMAT = {
+    ELFCLASS32: "iI",
+    ELFCLASS64: "qQ"
+}
+
+
+class ElfReader(object):
+    """
+    Read dynamic section information of an ELF32/ELF64 file in process.
+    The file is mapped into memory, no external tool is needed.
+    """
+
+    def __init__(self, file):
+        self._f = file
+        self._data = None
+        self._endian = "<"
+        self._class = ELFCLASS64
+
+    def read(self):
+        with open(self._f, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError("%s is empty" % self._f)
+        try:
+            self._data = data
+            return self.__parse()
+        except (struct.error, IndexError) as e:
+            raise ValueError("%s is not a valid ELF file: %s" % (self._f, str(e)))
+        finally:
+            self._data = None
+            data.close()
+
+    def __unpack(self, fmt, offset):
+        return struct.unpack_from(self._endian + fmt, self._data, offset)
+
+    def __parse(self):
+        data = self._data
+        if len(data) < 16 or data[:4] != b"\x7fELF":
+            raise ValueError("%s has no ELF magic" % self._f)
+        if data[4] not in _EHDR_FORMAT:
+            raise ValueError("%s has unknown ELF class %d" % (self._f, data[4]))
+        if data[5] not in (ELFDATA2LSB, ELFDATA2MSB):
+            raise ValueError("%s has unknown ELF data encoding %d" % (self._f, data[5]))
+        self._class = data[4]
+        self._endian = "<" if data[5] == ELFDATA2LSB else ">"
+
+        off_pos, off_fmt, num_pos, num_fmt = _EHDR_FORMAT[self._class]
+        phoff, shoff = self.__unpack(off_fmt, off_pos)
+        phentsize, phnum, shentsize, shnum, shstrndx = self.__unpack(num_fmt, num_pos)
+
+        info = {
+            "needed": [],
+            "soname": "",
+            "rpath": "",
+            "runpath": "",
+            "sections": {},
+            "text_size": 0,
+            "data_size": 0,
+            "bss_size": 0
+        }
+
+        sections = self.__read_sections(shoff, shentsize, shnum)
+        if sections:
+            self.__collect_section_sizes(sections, shstrndx, info)
+
+        dynamic = self.__find_dynamic_from_sections(sections)
+        if not dynamic:
+            dynamic = self.__find_dynamic_from_segments(phoff, phentsize, phnum)
+        if dynamic:
+            self.__read_dynamic(dynamic, info)
+        return info
+
+    def __read_sections(self, shoff, shentsize, shnum):
+        sections = []
+        if not shoff or not shnum:
+            return sections
+        fmt = _SHDR_FORMAT[self._class]
+        for idx in range(shnum):
+            name, sh_type, flags, _, offset, size, link = self.__unpack(fmt, shoff + idx * shentsize)
+            sections.append((name, sh_type, flags, offset, size, link))
+        return sections
+
+    def __collect_section_sizes(self, sections, shstrndx, info):
+        strtab_offset = -1
+        if shstrndx < len(sections):
+            strtab_offset = sections[shstrndx][3]
+
+        for name, sh_type, flags, _, size, _ in sections:
+            if strtab_offset >= 0:
+                section_name = self.__read_string(strtab_offset + name)
+                if section_name:
+                    info["sections"][section_name] = size
+
+            # Same accounting as the berkeley format of binutils size
+            if not flags & SHF_ALLOC:
+                continue
+            if sh_type == SHT_NOBITS:
+                info["bss_size"] += size
+            elif flags & SHF_WRITE:
+                info["data_size"] += size
+            else:
+                info["text_size"] += size
+
+    def __find_dynamic_from_sections(self, sections):
+        for _, sh_type, _, offset, size, link in sections:
+            if sh_type != SHT_DYNAMIC:
+                continue
+            if link >= len(sections):
+                return None
+            return offset, size, sections[link][3]
+        return None
+
+    def __find_dynamic_from_segments(self, phoff, phentsize, phnum):
+        # Fallback for files without section headers: locate PT_DYNAMIC and map DT_STRTAB address to file offset
+        if not phoff or not phnum:
+            return None
+        fmt, fields = _PHDR_FORMAT[self._class]
+        loads = []
+        dynamic = None
+        for idx in range(phnum):
+            vals = self.__unpack(fmt, phoff + idx * phentsize)
+            p_type, p_offset, p_vaddr, p_filesz = [vals[i] for i in fields]
+            if p_type == PT_LOAD:
+                loads.append((p_vaddr, p_offset, p_filesz))
+            elif p_type == PT_DYNAMIC:
+                dynamic = (p_offset, p_filesz)
+        if not dynamic:
+            return None
+
+        strtab_addr = None
+        for tag, val in self.__iter_dynamic(dynamic[0], dynamic[1]):
+            if tag == DT_STRTAB:
+                strtab_addr = val
+                break
+        if strtab_addr is None:
+            return None
+        for vaddr, offset, filesz in loads:
+            if vaddr <= strtab_addr < vaddr + filesz:
+                return dynamic[0], dynamic[1], strtab_addr - vaddr + offset
+        return None
+
+    def __iter_dynamic(self, offset, size):
+        fmt = _DYN_FORMAT[self._class]
+        entsize = struct.calcsize(fmt)
+        end = min(offset + size, len(self._data))
+        while offset + entsize <= end:
+            tag, val = self.__unpack(fmt, offset)
+            if tag == DT_NULL:
+                break
+            yield tag, val
+            offset += entsize
+
+    def __read_dynamic(self, dynamic, info):
+        offset, size, strtab_offset = dynamic
+        for tag, val in self.__iter_dynamic(offset, size):
+            if tag == DT_NEEDED:
+                info["needed"].append(self.__read_string(strtab_offset + val))
+            elif tag == DT_SONAME:
+                info["soname"] = self.__read_string(strtab_offset + val)
+            elif tag == DT_RPATH:
+                info["rpath"] = self.__read_string(strtab_offset + val)
+            elif tag == DT_RUNPATH:
+                info["runpath"] = self.__read_string(strtab_offset + val)
+
+    def __read_string(self, offset):
+        if offset >= len(self._data):
+            return ""
+        end = self._data.find(b"\x00", offset)
+        if end < 0:
+            end = len(self._data)
+        return self._data[offset:end].decode("utf-8", errors="replace")
+
+
+def read_elf_info(file):
+    return ElfReader(file).read()
+
+
+def __benchmark(files):
+    import time
+
+    start = time.time()
+    for f in files:
+        os.popen("strings '%s' |grep -E 'lib[-_/a-zA-Z0-9.]+\\.so$'|grep -v ':'" % f).read()
+    popen_cost = time.time() - start
+
+    start = time.time()
+    for f in files:
+        try:
+            read_elf_info(f)
+        except ValueError:
+            pass
+    reader_cost = time.time() - start
+
+    print("strings|grep: %d files in %.3fs" % (len(files), popen_cost))
+    print("ElfReader:    %d files in %.3fs" % (len(files), reader_cost))
+    if reader_cost > 0:
+        print("Speedup:      %.1fx" % (popen_cost / reader_cost))
+
+
+if __name__ == '__main__':
+    import sys
+
+    bench_files = []
+    for path in sys.argv[1:]:
+        if os.path.isfile(path):
+            bench_files.append(path)
+            continue
+        for root, _, names in os.walk(path):
+            for name in names:
+                full_path = os.path.join(root, name)
+                if os.path.islink(full_path) or not os.path.isfile(full_path):
+                    continue
+                with open(full_path, "rb") as fp:
+                    if fp.read(4) == b"\x7fELF":
+                        bench_files.append(full_path)
+    __benchmark(bench_files)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import time
+import sqlite3
+
+GRAPH_DUMP_VERSION = 1
+
+# (key, column type) of the modules table, list values are stored comma separated
+MODULE_COLUMNS = (("id", "INTEGER PRIMARY KEY"), ("name", "TEXT"), ("path", "TEXT"), ("type", "TEXT"),
+                  ("size", "INTEGER"), ("subsystem", "TEXT"), ("componentName", "TEXT"),
+                  ("moduleName", "TEXT"), ("labelPath", "TEXT"), ("shlib_type", "TEXT"),
+                  ("innerapi_tags", "TEXT"), ("modGroup", "TEXT"), ("hdiType", "TEXT"),
+                  ("sa_id", "INTEGER"), ("napi", "INTEGER"), ("chipset", "INTEGER"),
+                  ("third_party", "INTEGER"), ("platformsdk", "INTEGER"), ("chipsetsdk", "INTEGER"),
+                  ("duplicate", "INTEGER"), ("missing", "TEXT"))
+
+# (key, column type) of the deps table
+DEP_COLUMNS = (("id", "INTEGER PRIMARY KEY"), ("caller_id", "INTEGER"), ("callee_id", "INTEGER"),
+               ("external", "INTEGER"), ("calls", "INTEGER"), ("platformsdk", "INTEGER"),
+               ("chipsetsdk", "INTEGER"))
+
+
+class GraphDump(object):
+    """
+    Dump the dependency graph of all modules to a SQLite file.
+    Later analyses open it with any SQLite client instead of scanning the images again:
+      modules(id, name, path, ...)   one row per ELF file
+      deps(id, caller_id, callee_id, external, calls, platformsdk, chipsetsdk)
+      meta(key, value)               product path, creation time and dump version
+    """
+
+    @staticmethod
+    def __module_value(mod, key):
+        if key == "duplicate":
+            return int(bool(mod.get("duplicate", False)))
+        value = mod.get(key)
+        if isinstance(value, (list, tuple)):
+            return ",".join(value)
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    @staticmethod
+    def __dep_value(dep, key):
+        try:
+            value = dep[key]
+        except KeyError:
+            return None
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    @staticmethod
+    def __create_table(conn, table, columns):
+        conn.execute("CREATE TABLE %s (%s)" % (table, ", ".join(["%s %s" % (k, t) for k, t in columns])))
+
+    @staticmethod
+    def dump(mgr, db_file):
+        tmp_file = db_file + ".tmp"
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+        conn = sqlite3.connect(tmp_file)
+        try:
+            GraphDump.__create_table(conn, "meta", (("key", "TEXT PRIMARY KEY"), ("value", "TEXT")))
+            GraphDump.__create_table(conn, "modules", MODULE_COLUMNS)
+            GraphDump.__create_table(conn, "deps", DEP_COLUMNS)
+
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("version", str(GRAPH_DUMP_VERSION)),
+                ("product", mgr.get_product_out_path() or ""),
+                ("created", str(int(time.time())))
+            ])
+
+            module_keys = [k for k, _ in MODULE_COLUMNS]
+            conn.executemany("INSERT INTO modules VALUES (%s)" % ",".join("?" * len(module_keys)),
+                             ([GraphDump.__module_value(mod, k) for k in module_keys] for mod in mgr.get_all()))
+
+            dep_keys = [k for k, _ in DEP_COLUMNS]
+            conn.executemany("INSERT INTO deps VALUES (%s)" % ",".join("?" * len(dep_keys)),
+                             ([GraphDump.__dep_value(dep, k) for k in dep_keys] for dep in mgr.get_all_deps()))
+
+            conn.execute("CREATE INDEX modules_name ON modules(name)")
+            conn.execute("CREATE INDEX deps_caller ON deps(caller_id)")
+            conn.execute("CREATE INDEX deps_callee ON deps(callee_id)")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_file, db_file)
+        print("Dependency graph of %d modules and %d dependencies dumped to %s"
+              % (len(mgr.get_all()), len(mgr.get_all_deps()), db_file))
+
+
+def __show_summary(db_file, top):
+    conn = sqlite3.connect(db_file)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        modules = conn.execute("SELECT COUNT(*) FROM modules").fetchone()[0]
+        deps = conn.execute("SELECT COUNT(*) FROM deps").fetchone()[0]
+        print("%s: product %s, %d modules, %d dependencies" % (db_file, meta.get("product"), modules, deps))
+
+        print("Top %d depended modules:" % top)
+        sql = "SELECT m.name, m.path, COUNT(*) AS callers FROM deps d JOIN modules m ON m.id = d.callee_id " \
+              "GROUP BY d.callee_id ORDER BY callers DESC, m.path LIMIT ?"
+        for name, path, callers in conn.execute(sql, (top,)):
+            print("    %6d %s (%s)" % (callers, name, path))
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: %s graph.db [top]" % sys.argv[0])
+        sys.exit(1)
+    __show_summary(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 10)
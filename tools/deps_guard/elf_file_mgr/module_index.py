@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+VENDOR_PATHS = ("vendor/", "updater_vendor/", "chip_prod/", "eng_chipset/", "log/", "userdata/")
+SYSTEM_PATHS = ("system/", "updater/", "ramdisk/", "eng_system/", "patch/", "updater_ramdisk/")
+
+# Modules with these innerapi_tags are not system only or vendor only
+SHARED_INNERAPI_TAGS = frozenset(["llndk", "chipsetsdk", "chipsetsdk_indirect", "chipsetsdk_sp", "chipsetsdk_sp_indirect",
+                                  "passthrough", "passthrough_indirect"])
+
+
+def classify_module(mod, tags):
+    if not (mod["name"].endswith(".so") or mod["name"].endswith(".so.1")):
+        return "other"
+    if tags & SHARED_INNERAPI_TAGS:
+        return "other"
+
+    mod_path = mod["path"]
+    for system_path in SYSTEM_PATHS:
+        if system_path in mod_path:
+            return "system"
+    for vendor_path in VENDOR_PATHS:
+        if vendor_path in mod_path:
+            return "vendor"
+    return "other"
+
+
+class ModuleIndex(object):
+    """
+    Classification of all modules computed once after compile information is loaded:
+    system/vendor/other scope and innerapi_tags as a frozenset, indexed by module id.
+    """
+
+    def __init__(self, mgr):
+        self._scopes = [None]
+        self._tags = [None]
+        self._lookups = 0
+
+        tag_sets = {}
+        for mod in mgr.get_all():
+            tags = frozenset(mod.get("innerapi_tags") or ())
+            tags = tag_sets.setdefault(tags, tags)
+            self._tags.append(tags)
+            self._scopes.append(classify_module(mod, tags))
+
+    def is_only(self, mod):
+        self._lookups += 1
+        return self._scopes[mod["id"]]
+
+    def get_tags(self, mod):
+        self._lookups += 1
+        return self._tags[mod["id"]]
+
+    def get_summary(self):
+        # Each module is classified once, lookups beyond that would have been recomputations
+        classified = len(self._scopes) - 1
+        return "Module index: %d modules classified, %d lookups, %d recomputations avoided" % (
+            classified, self._lookups, max(self._lookups - classified, 0))
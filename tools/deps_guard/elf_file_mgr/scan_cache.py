@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import json
+import hashlib
+
+CACHE_VERSION = 1
+
+
+class ElfScanCache(object):
+    """
+    On-disk cache of parsed ELF information across deps_guard runs.
+    Entries are keyed by file path and validated by size and mtime; with use_hash
+    a file whose mtime changed but whose content did not is still a hit.
+    """
+
+    def __init__(self, cache_file, use_hash=False):
+        self._cache_file = cache_file
+        self._use_hash = use_hash
+        self._entries = {}
+        self._used = set()
+        self._hits = 0
+        self._misses = 0
+        self.__load()
+
+    def __load(self):
+        if not os.path.exists(self._cache_file):
+            return
+        try:
+            with open(self._cache_file, "r") as f:
+                root = json.load(f)
+            entries = root["entries"]
+            if root.get("version") != CACHE_VERSION:
+                print("ELF scan cache %s has version %s, rebuild it" % (self._cache_file, root.get("version")))
+                return
+            if root.get("checksum") != self.__checksum(entries):
+                print("Warning: ELF scan cache %s is corrupted, rebuild it" % self._cache_file)
+                return
+            self._entries = entries
+        except (OSError, ValueError, KeyError, TypeError):
+            print("Warning: ELF scan cache %s is corrupted, rebuild it" % self._cache_file)
+
+    @staticmethod
+    def __checksum(entries):
+        content = json.dumps(entries, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def __file_hash(file):
+        sha = hashlib.sha256()
+        with open(file, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def get(self, file):
+        try:
+            st = os.stat(file)
+        except OSError:
+            self._misses += 1
+            return None
+
+        entry = self._entries.get(file)
+        if not entry or entry.get("size") != st.st_size:
+            self._misses += 1
+            return None
+
+        if entry.get("mtime") != st.st_mtime_ns:
+            if not self._use_hash or not entry.get("hash") or entry["hash"] != self.__file_hash(file):
+                self._misses += 1
+                return None
+            entry["mtime"] = st.st_mtime_ns
+
+        self._used.add(file)
+        self._hits += 1
+        return entry["info"]
+
+    def put(self, file, info):
+        try:
+            st = os.stat(file)
+        except OSError:
+            return
+        entry = {
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "info": info
+        }
+        if self._use_hash:
+            entry["hash"] = self.__file_hash(file)
+        self._entries[file] = entry
+        self._used.add(file)
+
+    def save(self):
+        # Drop files that are gone from the image, write to a temporary file and rename to keep the cache consistent
+        entries = dict((k, v) for k, v in self._entries.items() if k in self._used)
+        root = {
+            "version": CACHE_VERSION,
+            "checksum": self.__checksum(entries),
+            "entries": entries
+        }
+        tmp_file = self._cache_file + ".tmp"
+        try:
+            with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), "w") as f:
+                json.dump(root, f)
+            os.replace(tmp_file, self._cache_file)
+        except OSError as e:
+            print("Warning: save ELF scan cache failed: %s" % str(e))
+
+    def get_summary(self):
+        return "ELF scan cache: %d hits, %d misses" % (self._hits, self._misses)
@@ -24,6 +24,7 @@ from .base_innerapi_rule import BaseInnerapiRule
 from .chipsetsdk_sp import ChipsetsdkSPRule
 from .llndk import LLndkRule
 from .passthrough import PassthroughRule
+from .rule_engine import RuleEngine
 
 
 def check_all_rules(mgr, args, check_all):
@@ -42,13 +43,10 @@ def check_all_rules(mgr, args, check_all):
             PassthroughRule
         ]
 
-    passed = True
+    engine = RuleEngine(mgr, args)
     for rule in rules:
-        r = rule(mgr, args)
-        r.log("Do %s rule checking now:" % rule.RULE_NAME)
-        if not r.check():
-            passed = False
-            r.log("  Please refer to: \033[91m%s\x1b[0m" % r.get_help_url())
+        engine.add_rule(rule)
+    passed = engine.check()
 
     if args and args.no_fail:
         return True
@@ -24,9 +24,10 @@ from .base_rule import BaseRule
 
 class BaseInnerapiRule(BaseRule):
     RULE_NAME = "BaseInnerApi"
+    INCREMENTAL = False
 
-    def __init__(self, mgr, args):
-        super().__init__(mgr, args)
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
         self.__ignored_tags = ["platformsdk", "sasdk", "platformsdk_indirect", "ndk"]
         self.__valid_system_tags = ["llndk", "chipsetsdk", "chipsetsdk_indirect", "chipsetsdk_sp", 
                                     "chipsetsdk_sp_indirect", "passthrough"] + self.__ignored_tags
@@ -34,19 +35,33 @@ class BaseInnerapiRule(BaseRule):
                                    "passthrough_indirect"] + self.__ignored_tags
         self.__base_sofiles = ["libc.so", "libutils.z.so", "ld-musl-aarch64.so.1", "libconfiguration.z.so", "libusbmanager.z.so", 
                                "libsms.z.so"]
+        self.__valid_system_tag_set = frozenset(self.__valid_system_tags)
+        self.__valid_vendor_tag_set = frozenset(self.__valid_vendor_tags)
         self.load_lists()
+        self.__check_modules = []
+        self.__stopped = False
+
+    def visit_module(self, mod):
+        # Modules are checked until the first one without innerapi_tags
+        if self.__stopped:
+            return
+        innerapi_tags = mod["innerapi_tags"]
+        if not innerapi_tags or len(innerapi_tags) == 0:
+            self.__stopped = True
+            return
+        self.__check_modules.append(mod)
 
     def check(self):
+        self.visit_all()
         passed = True
         white_lists = self.get_dep_whitelist()
 
-        for mod in self.get_mgr().get_all():
+        for mod in self.__check_modules:
             innerapi_tags = mod["innerapi_tags"]
-            if not innerapi_tags or len(innerapi_tags) == 0:
-                return passed
 
             # mod is system only scene
-            if self.is_only(mod) == "system" and all(item in self.__valid_system_tags for item in innerapi_tags):
+            mod_scope = self.is_only(mod)
+            if mod_scope == "system" and self.get_tags(mod) <= self.__valid_system_tag_set:
                 for dep in mod["deps"]:
                     callee = dep["callee"]
                     callee_innerapi_tags = callee["innerapi_tags"]
@@ -56,23 +71,18 @@ class BaseInnerapiRule(BaseRule):
 
                     if "duplicate" in callee.keys() and callee["duplicate"]:
                         passed = False
-                        self.error("NEED MODIFY: %s has the same name in other package path, sofile name should be modified" % (callee["name"]))
+                        self.error("NEED MODIFY: %s has the same name in other package path, sofile name should be modified" % (callee["name"]), mod["name"])
                         continue
 
                     # check if in whitelist
-                    in_whitelist = False
-                    for so_dict in white_lists:
-                        for k, v in so_dict.items():
-                            if k == mod["name"] and v == callee["name"]:
-                                in_whitelist = True
-                                break
+                    in_whitelist = white_lists.contains(mod["name"], callee["name"])
 
                     if self.is_only(callee) == "system" or \
-                            (callee_innerapi_tags and all(item in self.__valid_system_tags for item in callee_innerapi_tags)) or in_whitelist:
+                            (callee_innerapi_tags and self.get_tags(callee) <= self.__valid_system_tag_set) or in_whitelist:
                         continue
                     else:
                         self.error("NEED MODIFY: system only module %s depends on wrong module as %s in %s, dep module path is %s" 
-                                   %(mod["name"], callee["name"], mod["labelPath"], callee["path"]))
+                                   %(mod["name"], callee["name"], mod["labelPath"], callee["path"]), mod["name"])
                         passed = False
             
                 # dep is missing, not sure if it's correct. need verify it
@@ -81,23 +91,15 @@ class BaseInnerapiRule(BaseRule):
                         continue
                     if dep_name in self.get_allow_list():
                         continue
-                    in_whitelist = False
-                    for so_dict in white_lists:
-                        for k, v in so_dict.items():
-                            if k == mod["name"] and v == dep_name:
-                                in_whitelist = True
-                                break
-
-                    if in_whitelist:
+                    if white_lists.contains(mod["name"], dep_name):
                         continue
                     else:
                         self.error("NEED MODIFY: system only module %s depends on %s which is unknown so type"
-                                   %(mod["name"], dep_name))
+                                   %(mod["name"], dep_name), mod["name"])
                         passed = False
 
             # mod is vendor only scene
-            elif self.is_only(mod) == "vendor" and \
-                    all(item in self.__valid_vendor_tags for item in innerapi_tags):
+            elif mod_scope == "vendor" and self.get_tags(mod) <= self.__valid_vendor_tag_set:
                 for dep in mod["deps"]:
                     callee = dep["callee"]
                     callee_innerapi_tags = callee["innerapi_tags"]
@@ -107,23 +109,18 @@ class BaseInnerapiRule(BaseRule):
 
                     if "duplicate" in callee.keys() and callee["duplicate"]:
                         passed = False
-                        self.error("NEED MODIFY: %s has the same name in other package path, sofile name should be modified" % (callee["name"]))
+                        self.error("NEED MODIFY: %s has the same name in other package path, sofile name should be modified" % (callee["name"]), mod["name"])
                         continue
 
                     # check if in whitelist
-                    in_whitelist = False
-                    for so_dict in white_lists:
-                        for k, v in so_dict.items():
-                            if k == mod["name"] and v == callee["name"]:
-                                in_whitelist = True
-                                break
+                    in_whitelist = white_lists.contains(mod["name"], callee["name"])
 
                     if self.is_only(callee) == "vendor" or \
-                            (callee_innerapi_tags and all(item in self.__valid_vendor_tags for item in callee_innerapi_tags)) or in_whitelist:
+                            (callee_innerapi_tags and self.get_tags(callee) <= self.__valid_vendor_tag_set) or in_whitelist:
                         continue
                     else:
                         self.error("NEED MODIFY: vendor only module %s depends on wrong module as %s in %s, dep module path is %s" 
-                                   %(mod["name"], callee["name"], mod["labelPath"], callee["path"]))
+                                   %(mod["name"], callee["name"], mod["labelPath"], callee["path"]), mod["name"])
                         passed = False
 
                 # dep is missing, not sure if it's correct. need verify it
@@ -132,18 +129,11 @@ class BaseInnerapiRule(BaseRule):
                         continue
                     if dep_name in self.get_vendor_allow_list():
                         continue
-                    in_whitelist = False
-                    for so_dict in white_lists:
-                        for k, v in so_dict.items():
-                            if k == mod["name"] and v == dep_name:
-                                in_whitelist = True
-                            break
-
-                    if in_whitelist:
+                    if white_lists.contains(mod["name"], dep_name):
                         continue
                     else:
                         self.error("NEED MODIFY: vendor only module %s depends on %s which is unknown so type"
-                                   %(mod["name"], dep_name))
+                                   %(mod["name"], dep_name), mod["name"])
                         passed = False
         return passed
 
@@ -19,19 +19,37 @@
 import os
 import json
 
+from .rule_data import RuleData
+from .dep_whitelist import DepWhitelist
+
 
 class BaseRule(object):
     RULE_NAME = ""
+    # Rules whose result of a module depends on other modules (visiting order, stage gating)
+    # set it to False, they check all modules in incremental checking too
+    INCREMENTAL = True
 
-    def __init__(self, mgr, args):
+    def __init__(self, mgr, args, rule_data=None):
         self._mgr = mgr
         self._args = args
+        if rule_data:
+            self._rule_data = rule_data
+        else:
+            self._rule_data = RuleData()
+        self._violations = []
+        self._visited = False
+        self._partial = False
+        self._report_sink = None
+        self.__lists_loaded = False
         self.__white_lists = self.load_files("whitelist.json")
         self.__out_path = mgr.get_product_out_path()
         self.__base_sofiles = ["libc.so", "libutils.z.so", "ld-musl-aarch64.so.1", "libconfiguration.z.so", "libusbmanager.z.so",
                                "libsms.z.so"]
     
     def load_lists(self):
+        if self.__lists_loaded:
+            return
+        self.__lists_loaded = True
         self.__passthroughs_lists = self.load_list_json("Passthrough", "passthrough_info.json")
         self.__llndk_lists = self.load_list_json("LLndk", "llndk_info.json")
         self.__chipsetsdksp_lists = self.load_list_json("ChipsetsdkSP", "chipsetsdk_sp_info.json")
@@ -47,9 +65,7 @@ class BaseRule(object):
         for d in rules_dir:
             rules_file = os.path.join(d, self.__class__.RULE_NAME, name)
             try:
-                with open(rules_file, "r") as f:
-                    jsonstr = "".join([line.strip() for line in f if not line.strip().startswith("//")])
-                    res = res + json.loads(jsonstr)
+                res = res + self._rule_data.load_json(rules_file, True)
             except:
                 pass
 
@@ -58,6 +74,18 @@ class BaseRule(object):
     def get_mgr(self):
         return self._mgr
 
+    def get_rule_data(self):
+        return self._rule_data
+
+    def get_violations(self):
+        return self._violations
+
+    def get_violation_count(self):
+        return len(self._violations)
+
+    def set_report_sink(self, sink):
+        self._report_sink = sink
+
     def get_white_lists(self):
         return self.__white_lists
 
@@ -65,9 +93,15 @@ class BaseRule(object):
         print(info)
 
     def warn(self, info):
+        if self._report_sink:
+            self._report_sink.violation(self.__class__.RULE_NAME, "warning", None, str(info))
         print("\033[35m[WARNING]\x1b[0m: %s" % info)
 
-    def error(self, info):
+    # subject is the name of the module the violation belongs to, used to merge incremental results
+    def error(self, info, subject=None):
+        self._violations.append((subject, str(info)))
+        if self._report_sink:
+            self._report_sink.violation(self.__class__.RULE_NAME, "error", subject, str(info))
         print("\033[91m[NOT ALLOWED]\x1b[0m: %s" % info)
 
     def get_help_url(self):
@@ -77,59 +111,58 @@ class BaseRule(object):
         return self.__out_path
 
     def is_only(self, mod):
-        vendor_paths = ["vendor/", "updater_vendor/", "chip_prod/", "eng_chipset/", "log/", "userdata/"]
-        system_paths = ["system/", "updater/", "ramdisk/", "eng_system/", "patch/", "updater_ramdisk/"]
+        return self._mgr.get_module_index().is_only(mod)
+
+    def get_tags(self, mod):
+        return self._mgr.get_module_index().get_tags(mod)
 
-        innerapi_tags = ["llndk", "chipsetsdk", "chipsetsdk_indirect", "chipsetsdk_sp", "chipsetsdk_sp_indirect", 
-                         "passthrough", "passthrough_indirect"]
-        is_system = False
-        is_vendor = False
-    
-        if not (mod["name"].endswith(".so") or mod["name"].endswith(".so.1")):
-            return "other"
-    
-        mod_path = mod["path"]
-        for system_path in system_paths:
-            if system_path in mod_path:
-                is_system = True
-                break
-        for vendor_path in vendor_paths:
-            if vendor_path in mod_path:
-                is_vendor = True
-                break
-    
-        mod_innerapi_tags = mod["innerapi_tags"]
-        if all(item not in mod_innerapi_tags for item in innerapi_tags):
-            if is_system:
-                return "system"
-            elif is_vendor:
-                return "vendor"
-            else:
-                return "other"
-        else:
-            return "other"   
- 
     def get_dep_whitelist(self):   
         whitelist_file = os.path.join(self.get_out_path().replace("out", "out/products_ext"), "chipsetsdk_dep_whitelist.json")
         if not os.path.exists(whitelist_file):
             whitelist_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), f"../rules/chipsetsdk_dep_whitelist.json")
-        res = []
+        res = DepWhitelist()
         if os.path.exists(whitelist_file):
             self.log("****chipsetsdk dep whitelist file is {}****".format(whitelist_file))
-            with open(whitelist_file, "r") as f:
-                contents = f.read()
+            contents = self._rule_data.read(whitelist_file)
             if not contents:
                 self.log("****system/vendor only whitelist.json {} is null****".format(whitelist_file))
-            json_data = json.loads(contents)
+            json_data = self._rule_data.load_json(whitelist_file)
             for so in json_data:
                 so_file_name = so.get("so_file_name")
                 dep_file_name = so.get("dep_file_name")
-                so_dict = {so_file_name: dep_file_name}
-                if so_dict not in res:
-                    res.append(so_dict)
+                res.add(so_file_name, dep_file_name)
 
         return res
 
+    # To be override, called by RuleEngine for each module in one walk of the graph
+    def visit_module(self, mod):
+        pass
+
+    # To be override, called by RuleEngine for each dependency of the visited module
+    def visit_dependency(self, mod, dep):
+        pass
+
+    def set_visited(self, partial=False):
+        self._visited = True
+        self._partial = partial
+
+    def is_partial_check(self):
+        # Only the modules affected by a change are visited
+        return self._partial
+
+    def visit_all(self):
+        # Rules checked without RuleEngine walk the graph by themselves
+        if self._visited:
+            return
+        visit_deps = type(self).visit_dependency is not BaseRule.visit_dependency
+        for mod in self._mgr.get_all():
+            self.visit_module(mod)
+            if not visit_deps:
+                continue
+            for dep in mod["deps"]:
+                self.visit_dependency(mod, dep)
+        self._visited = True
+
     # To be override
     def check(self):
         # Default pass
@@ -138,10 +171,12 @@ class BaseRule(object):
     def check_if_deps_correctly(self, check_modules, valid_mod_tags, valid_dep_tags, white_lists):
         # check if mod and callee have wrong innerapi tags
         self.load_lists()
+        valid_mod_tag_set = frozenset(valid_mod_tags)
+        valid_dep_tag_set = frozenset(valid_dep_tags)
         passed = True
         for mod in check_modules:
             innerapi_tags = mod["innerapi_tags"]
-            if innerapi_tags and all(item in valid_mod_tags for item in innerapi_tags):
+            if innerapi_tags and self.get_tags(mod) <= valid_mod_tag_set:
                 for dep in mod["deps"]:
                     callee = dep["callee"]
 
@@ -150,65 +185,50 @@ class BaseRule(object):
 
                     if "duplicate" in callee.keys() and callee["duplicate"]:
                         passed = False
-                        self.error("NEED MODIFY: %s has the same name in other package path, sofile name should be modified" % (callee["name"]))
+                        self.error("NEED MODIFY: %s has the same name in other package path, sofile name should be modified" % (callee["name"]), mod["name"])
 
                     dep_innerapi_tags = callee["innerapi_tags"]
-                    wrong_tags = [item for item in dep_innerapi_tags if item not in valid_dep_tags]
 
-                    in_whitelist = False
-                    for so_dict in white_lists:
-                        for k, v in so_dict.items():
-                            if k == mod["name"] and v == callee["name"]:
-                                in_whitelist = True
-                                break
-
-                    if in_whitelist:
+                    if white_lists.contains(mod["name"], callee["name"]):
                         continue
                     
                     # llndk can dep system only sofile
-                    if "system" in valid_dep_tags and self.is_only(callee) == "system":
+                    callee_scope = self.is_only(callee)
+                    if "system" in valid_dep_tag_set and callee_scope == "system":
                         continue
 
                     # check system/vendor only
-                    if self.is_only(callee) == "system":
+                    if callee_scope == "system":
                         passed = False
                         self.error("NEED MODIFY: %s with innerapi_tags [%s] cannot depend system only file %s with %s" 
-                            % (mod["name"], ",".join(innerapi_tags), callee["name"], callee["labelPath"]))
-                    elif self.is_only(callee) == "vendor":
+                            % (mod["name"], ",".join(innerapi_tags), callee["name"], callee["labelPath"]), mod["name"])
+                    elif callee_scope == "vendor":
                         passed = False
                         self.error("NEED MODIFY: %s with innerapi_tags [%s] cannot depend vendor only file %s with %s" 
-                            % (mod["name"], ",".join(innerapi_tags), callee["name"], callee["labelPath"]))
+                            % (mod["name"], ",".join(innerapi_tags), callee["name"], callee["labelPath"]), mod["name"])
 
-                    if dep_innerapi_tags and all(item in valid_dep_tags for item in dep_innerapi_tags):
-                        continue
-                    elif not dep_innerapi_tags:
+                    if not dep_innerapi_tags or self.get_tags(callee) <= valid_dep_tag_set:
                         continue
 
+                    wrong_tags = [item for item in dep_innerapi_tags if item not in valid_dep_tag_set]
                     passed = False
                     self.error("NEED MODIFY: %s with innerapi_tags [%s] has dep file %s with %s contains wrong dep innerapi_tags [%s] in innerapi_tags [%s]" 
-                        % (mod["name"], ",".join(innerapi_tags), callee["name"], callee["labelPath"], ",".join(wrong_tags), ",".join(dep_innerapi_tags)))
+                        % (mod["name"], ",".join(innerapi_tags), callee["name"], callee["labelPath"], ",".join(wrong_tags), ",".join(dep_innerapi_tags)), mod["name"])
                 # dep is missing, not sure if it's correct. need verify it
                 for dep_name in mod["missing"]:
                     if dep_name in self.__base_sofiles:
                         continue
-                    in_whitelist = False
-                    for so_dict in white_lists:
-                        for k, v in so_dict.items():
-                            if k == mod["name"] and v == dep_name:
-                                in_whitelist = True
-                                break
-
-                    if in_whitelist:
+                    if white_lists.contains(mod["name"], dep_name):
                         continue
                     else:
                         self.error("NEED MODIFY: system only module %s depends on %s which is unknown so type"
-                                   %(mod["name"], dep_name))
+                                   %(mod["name"], dep_name), mod["name"])
                         passed = False
 
             else:
                 wrong_tags = [item for item in innerapi_tags if item not in valid_mod_tags]
                 self.error("NEED MODIFY: module %s with %s contains wrong mod innerapi_tags [%s] in innerapi_tags [%s]" 
-                           % (mod["name"], mod["path"], ",".join(wrong_tags), ",".join(innerapi_tags)))
+                           % (mod["name"], mod["path"], ",".join(wrong_tags), ",".join(innerapi_tags)), mod["name"])
                 return False
 
         return passed
@@ -222,12 +242,11 @@ class BaseRule(object):
     def parser_rules_file(self, rules_file, res):
         try:
             self.log("****Parsing rules file in {}****".format(rules_file))
-            with open(rules_file, "r") as f:
-                contents = f.read()
+            contents = self._rule_data.read(rules_file)
             if not contents:
                 self.log("****rules file {} is null****".format(rules_file))
                 return res
-            json_data = json.loads(contents)
+            json_data = self._rule_data.load_json(rules_file)
             for so in json_data:
                 so_file_name = so.get("so_file_name")
                 if so_file_name and so_file_name not in res:
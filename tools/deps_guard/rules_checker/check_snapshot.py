@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import json
+
+SNAPSHOT_VERSION = 2
+
+
+class CheckSnapshot(object):
+    """
+    Modules and rule violations of the last deps_guard run.
+    It is the baseline of incremental checking: modules changed since then are found
+    by comparing fingerprints, and violations of unaffected modules are kept.
+    """
+
+    def __init__(self, snapshot_file):
+        self._snapshot_file = snapshot_file
+        self._modules = {}
+        self._violations = {}
+        self._loaded = False
+        self.__load()
+
+    def __load(self):
+        if not os.path.exists(self._snapshot_file):
+            return
+        try:
+            with open(self._snapshot_file, "r") as f:
+                root = json.load(f)
+            if root.get("version") != SNAPSHOT_VERSION:
+                print("Snapshot %s has version %s, check all modules" % (self._snapshot_file, root.get("version")))
+                return
+            self._modules = root["modules"]
+            self._violations = root["violations"]
+            self._loaded = True
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            print("Warning: snapshot %s is corrupted, check all modules" % self._snapshot_file)
+
+    def is_loaded(self):
+        return self._loaded
+
+    @staticmethod
+    def __fingerprint(elf):
+        try:
+            st = os.stat(elf.get_file())
+            stat_info = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            stat_info = [elf["size"], 0]
+        return stat_info + [sorted(elf.get("innerapi_tags") or []), elf.get("labelPath", ""),
+                            elf.get("componentName", ""), elf.get("shlib_type", "")]
+
+    def get_changed_names(self, mgr):
+        # Compare with modules of the last run, removed modules affect their former callers and callees too
+        names = set()
+        paths = set()
+        for elf in mgr.get_all():
+            paths.add(elf["path"])
+            module = self._modules.get(elf["path"])
+            if not module or module["fingerprint"] != self.__fingerprint(elf):
+                names.add(elf["name"])
+        for path, module in self._modules.items():
+            if path in paths:
+                continue
+            names.add(os.path.basename(path))
+            names.update(module["callers"])
+            names.update(module["callees"])
+        return names
+
+    def get_former_neighbors(self, mods):
+        # Callers and callees of the modules in the last run: a removed dependency is not in the graph any more,
+        # but the violations of its former callee or caller may be gone with it
+        names = set()
+        for elf in mods:
+            module = self._modules.get(elf["path"])
+            if module:
+                names.update(module["callers"])
+                names.update(module["callees"])
+        return names
+
+    @staticmethod
+    def read_changed_list(list_file):
+        names = []
+        with open(list_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    names.append(line)
+        return names
+
+    @staticmethod
+    def resolve(mgr, entries):
+        # Entries are module names, paths in images or full paths of image files
+        prefix = mgr.get_product_images_path()
+        mods = []
+        names = set()
+        for entry in entries:
+            path = entry
+            if path.startswith(prefix):
+                path = path[len(prefix):]
+            names.add(os.path.basename(path))
+
+            elf = mgr.get_elf_by_path(path)
+            if elf:
+                mods.append(elf)
+                continue
+            elfs = mgr.get_elf_by_name(os.path.basename(path))
+            if isinstance(elfs, list):
+                mods.extend(elfs)
+            elif elfs:
+                mods.append(elfs)
+        return mods, names
+
+    def merge(self, rule_name, violations, affected_names):
+        # Without affected names all modules are checked, the result replaces the baseline
+        if affected_names is None:
+            kept = []
+        else:
+            kept = [item for item in self._violations.get(rule_name, [])
+                    if item[0] is not None and item[0] not in affected_names]
+        merged = kept + [list(item) for item in violations]
+        self._violations[rule_name] = merged
+        return merged, len(kept)
+
+    def save(self, mgr):
+        modules = {}
+        for elf in mgr.get_all():
+            modules[elf["path"]] = {
+                "fingerprint": self.__fingerprint(elf),
+                "callers": sorted(set(dep["caller"]["name"] for dep in elf["dependedBy"])),
+                "callees": sorted(set(dep["callee"]["name"] for dep in elf["deps"]))
+            }
+        root = {
+            "version": SNAPSHOT_VERSION,
+            "modules": modules,
+            "violations": self._violations
+        }
+        tmp_file = self._snapshot_file + ".tmp"
+        try:
+            with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), "w") as f:
+                json.dump(root, f)
+            os.replace(tmp_file, self._snapshot_file)
+        except OSError as e:
+            print("Warning: save snapshot failed: %s" % str(e))
@@ -24,14 +24,26 @@ from .base_rule import BaseRule
 
 class ChipsetSDKRule(BaseRule):
     RULE_NAME = "ChipsetSDK"
+    INCREMENTAL = False
 
-    def __init__(self, mgr, args):
-        super().__init__(mgr, args)
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
         self.__out_path = mgr.get_product_out_path()
         self.__white_lists = self.load_chipsetsdk_json("chipsetsdk_info.json")
         self.__ignored_tags = ["platformsdk", "sasdk", "platformsdk_indirect", "ndk"]
         self.__valid_mod_tags = ["llndk", "chipsetsdk", "chipsetsdk_indirect", "chipsetsdk_sp", 
                                  "chipsetsdk_sp_indirect", "passthrough"] + self.__ignored_tags
+        self.__load_chipsetsdks()
+        self.__load_chipsetsdk_indirects()
+
+        self.__chipsetsdk_mods = []
+        self.__chipsetsdk_mod_ids = set()
+        self.__all_mods = set()
+        self.__all_paths = {}
+        self.__modules_with_chipsetsdk_tag = []
+        self.__modules_with_chipsetsdk_indirect_tag = []
+        self.__untagged_mods = []
+        self.__skip_deps = True
 
     def get_sofile_list(self):
         return self.__white_lists
@@ -63,9 +75,48 @@ class ChipsetSDKRule(BaseRule):
         
         return res
 
+    def visit_module(self, mod):
+        self.__skip_deps = True
+
+        # Collect all modules with chipsetsdk tag
+        if self.__is_chipsetsdk_tagged(mod):
+            self.__modules_with_chipsetsdk_tag.append(mod)
+
+        # Collect all modules with chipsetsdk_indirect tag
+        if self.__is_chipsetsdk_indirect(mod):
+            self.__modules_with_chipsetsdk_indirect_tag.append(mod)
+
+        # If callee is chipset module, it is OK
+        if not mod["path"].endswith(".so"):
+            return
+
+        self.__all_mods.add(mod["name"])
+        self.__all_paths[mod["name"]] = mod["path"]
+
+        # Check if all chipsetsdk/chisetsdk_indirect module are tagged correctly
+        if "chipset-sdk/" in mod["path"]:
+            if mod["name"] not in self.__chipsetsdks and mod["name"] not in self.__indirects:
+                self.__untagged_mods.append(mod)
+                return
+
+        self.__skip_deps = False
+
+    def visit_dependency(self, mod, dep):
+        if self.__skip_deps:
+            return
+
+        # Collect system modules depended by chipset modules
+        callee = dep["callee"]
+        if not callee["path"].startswith("system"):
+            return
+        if callee["id"] in self.__chipsetsdk_mod_ids:
+            return
+        if "hdiType" not in callee or callee["hdiType"] != "hdi_proxy":
+            self.__chipsetsdk_mods.append(callee)
+            self.__chipsetsdk_mod_ids.add(callee["id"])
+
     def check(self):
-        self.__load_chipsetsdks()
-        self.__load_chipsetsdk_indirects()
+        self.visit_all()
         white_lists = self.get_dep_whitelist()
 
         # Check if all chipset modules depends on chipsetsdk modules only
@@ -91,19 +142,20 @@ class ChipsetSDKRule(BaseRule):
         if not passed:
             return passed
 
-        self.__write_innerkits_header_files()
+        # Chipset SDK list can only be generated from all modules
+        if not self.is_partial_check():
+            self.__write_innerkits_header_files()
 
         return True
 
     def __parser_rules_file(self, rules_file, res):
         try:
             self.log("****Parsing rules file in {}****".format(rules_file))
-            with open(rules_file, "r") as f:
-                contents = f.read()
+            contents = self.get_rule_data().read(rules_file)
             if not contents:
                 self.log("****rules file {} is null****".format(rules_file))
                 return res
-            json_data = json.loads(contents)
+            json_data = self.get_rule_data().load_json(rules_file)
             for so in json_data:
                 so_file_name = so.get("so_file_name")
                 if so_file_name and so_file_name not in res:
@@ -164,70 +216,13 @@ class ChipsetSDKRule(BaseRule):
         return headers
 
     def __check_tags_correctly(self):
-        lists = self.get_dep_whitelist()
-
         passed = True
 
-        self.__chipsetsdk_mods = []
-        self.__all_mods = []
-        self.__all_paths = {}
-        self.__modules_with_chipsetsdk_tag = []
-        self.__modules_with_chipsetsdk_indirect_tag = []
-
-        # Check if any napi modules has dependedBy
-        for mod in self.get_mgr().get_all():
-            # Collect all modules with chipsetsdk tag
-            if self.__is_chipsetsdk_tagged(mod):
-                self.__modules_with_chipsetsdk_tag.append(mod)
-
-            # Collect all modules with chipsetsdk_indirect tag
-            if self.__is_chipsetsdk_indirect(mod):
-                self.__modules_with_chipsetsdk_indirect_tag.append(mod)
-
-            # If callee is chipset module, it is OK
-            if not mod["path"].endswith(".so"):
-                continue
-
-            self.__all_mods.append(mod["name"])
-            self.__all_paths[mod["name"]] = mod["path"]
-            
-            # Check if all chipsetsdk/chisetsdk_indirect module are tagged correctly
-            if "chipset-sdk/" in mod["path"]:
-                if mod["name"] not in self.__chipsetsdks and mod["name"] not in self.__indirects:
-                    # Not allowed
-                    passed = False
-                    self.error("NEED MODIFY: so file %s in %s should be add in file chipsetsdk_info.json or chipsetsdk_indirect_info.json"
-                            % (mod["name"], mod["labelPath"]))
-                    continue
-
-            # Check chipset modules depends
-            for dep in mod["deps"]:
-                callee = dep["callee"]
-
-                # If callee is chipset module, it is OK
-                if not callee["path"].startswith("system"):
-                    continue
-
-                # Add to list
-                if callee not in self.__chipsetsdk_mods:
-                    if "hdiType" not in callee or callee["hdiType"] != "hdi_proxy":
-                        self.__chipsetsdk_mods.append(callee)
-
-                # If callee is chipset module, it is OK
-                if not callee["path"].endswith(".so"):
-                    continue
-
-                # If callee is in Chipset SDK white list module, it is OK
-                if callee["name"] in lists:
-                    continue
-
-                # If callee is asan library, it is OK
-                if callee["name"].endswith(".asan.so"):
-                    continue
-
-                # If callee is hdi proxy module, it is OK
-                if "hdiType" in callee and callee["hdiType"] == "hdi_proxy":
-                    continue
+        for mod in self.__untagged_mods:
+            # Not allowed
+            passed = False
+            self.error("NEED MODIFY: so file %s in %s should be add in file chipsetsdk_info.json or chipsetsdk_indirect_info.json"
+                    % (mod["name"], mod["labelPath"]), mod["name"])
 
         return passed
 
@@ -245,7 +240,7 @@ class ChipsetSDKRule(BaseRule):
             if mod not in modules_with_chipsetsdk_tags:
                 passed = False
                 self.error('Chipset SDK module %s in chipsetsdk_info.json should add innerapi_tags with "chipsetsdk"'
-                          % mod)
+                          % mod, mod)
 
         for mod in self.__indirects:
             if mod not in self.__all_mods:
@@ -256,7 +251,7 @@ class ChipsetSDKRule(BaseRule):
             if mod not in indirect_tags:
                 passed = False
                 self.error('chipsetsdk_indirect module %s in chipsetsdk_indirect_info.json should add innerapi_tags "chipsetsdk_indirect"'
-                          % mod)
+                          % mod, mod)
 
         return passed
 
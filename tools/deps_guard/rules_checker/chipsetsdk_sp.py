@@ -24,13 +24,22 @@ from .base_rule import BaseRule
 
 class ChipsetsdkSPRule(BaseRule):
     RULE_NAME = "ChipsetsdkSP"
+    INCREMENTAL = False
 
-    def __init__(self, mgr, args):
-        super().__init__(mgr, args)
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
         self.__out_path = mgr.get_product_out_path()
         self.__white_lists = self.load_chipsetsdk_json("chipsetsdk_sp_info.json")
         self.__ignored_tags = ["platformsdk", "sasdk", "platformsdk_indirect", "ndk"]
         self.__valid_mod_tags = ["llndk", "chipsetsdk_sp", "chipsetsdk_sp_indirect", "passthrough"] + self.__ignored_tags
+        self.__load_chipsetsdk_sps()
+        self.__load_chipsetsdk_sp_indirects()
+
+        self.__modules_with_chipsetsdk_sp_tag = []
+        self.__modules_with_chipsetsdk_sp_indirect_tag = []
+        self.__all_mods = set()
+        self.__all_paths = {}
+        self.__untagged_mods = []
 
     def get_white_lists(self):
         return self.__white_lists
@@ -62,9 +71,28 @@ class ChipsetsdkSPRule(BaseRule):
 
         return res
 
+    def visit_module(self, mod):
+        # Collect all modules with chipsetsdk_sp tag
+        if self.__is_chipsetsdk_sp_tagged(mod):
+            self.__modules_with_chipsetsdk_sp_tag.append(mod)
+
+        # Collect all modules with chipsetsdk_sp_indirect tag
+        if self.__is_chipsetsdk_sp_indirect(mod):
+            self.__modules_with_chipsetsdk_sp_indirect_tag.append(mod)
+
+        if not mod["name"].endswith(".so"):
+            return
+
+        self.__all_mods.add(mod["name"])
+        self.__all_paths[mod["name"]] = mod["path"]
+
+        # check if all path in chipset-sdk-sp so contains sp/indirect innerapi_tags
+        if "chipset-sdk-sp" in mod["path"]:
+            if mod["name"] not in self.__chipsetsdk_sps and mod["name"] not in self.__indirects:
+                self.__untagged_mods.append(mod)
+
     def check(self):
-        self.__load_chipsetsdk_sps()
-        self.__load_chipsetsdk_sp_indirects()
+        self.visit_all()
         white_lists = self.get_dep_whitelist()
 
         # Check if all chipset modules depends on chipsetsdk_sp modules only
@@ -95,12 +123,11 @@ class ChipsetsdkSPRule(BaseRule):
     def __parser_rules_file(self, rules_file, res):
         try:
             self.log("****Parsing rules file in {}****".format(rules_file))
-            with open(rules_file, "r") as f:
-                contents = f.read()
+            contents = self.get_rule_data().read(rules_file)
             if not contents:
                 self.log("****rules file {} is null****".format(rules_file))
                 return res
-            json_data = json.loads(contents)
+            json_data = self.get_rule_data().load_json(rules_file)
             for so in json_data:
                 so_file_name = so.get("so_file_name")
                 if so_file_name and so_file_name not in res:
@@ -125,38 +152,14 @@ class ChipsetsdkSPRule(BaseRule):
         return False
 
     def __check_depends_on_chipsetsdk_sp(self):
-        self.__modules_with_chipsetsdk_sp_tag = []
-        self.__modules_with_chipsetsdk_sp_indirect_tag = []
-        self.__all_mods = []
-        self.__all_paths = {}
-
         passed = True
 
-        # Check if any napi modules has dependedBy
-        for mod in self.get_mgr().get_all():
-            # Collect all modules with chipsetsdk_sp tag
-            if self.__is_chipsetsdk_sp_tagged(mod):
-                self.__modules_with_chipsetsdk_sp_tag.append(mod)
+        for mod in self.__untagged_mods:
+            # Not allowed
+            passed = False
+            self.error("NEED MODIFY: so file %s in %s should be add in file chipsetsdk_sp_info.json or chipsetsdk_sp_indirect_info.json"
+                % (mod["name"], mod["labelPath"]), mod["name"])
 
-            # Collect all modules with chipsetsdk_sp_indirect tag
-            if self.__is_chipsetsdk_sp_indirect(mod):
-                self.__modules_with_chipsetsdk_sp_indirect_tag.append(mod)
-
-            if not mod["name"].endswith(".so"):
-                continue
-
-            self.__all_mods.append(mod["name"])
-            self.__all_paths[mod["name"]] = mod["path"]
-            
-            # check if all path in chipset-sdk-sp so contains sp/indirect innerapi_tags
-            if "chipset-sdk-sp" in mod["path"]:
-                if mod["name"] not in self.__chipsetsdk_sps and mod["name"] not in self.__indirects:
-                    # Not allowed
-                    passed = False
-                    self.error("NEED MODIFY: so file %s in %s should be add in file chipsetsdk_sp_info.json or chipsetsdk_sp_indirect_info.json"
-                        % (mod["name"], mod["labelPath"]))
-                    continue
-        
         return passed
     
     def __check_if_tagged_correctly(self):
@@ -173,7 +176,7 @@ class ChipsetsdkSPRule(BaseRule):
             if mod not in sp_tags:
                 passed = False
                 self.error('ChipsetSP SDK module %s in chipsetsdk_sp_info.json should add innerapi_tags with "chipsetsdk_sp"'
-                          % mod)
+                          % mod, mod)
 
         for mod in self.__indirects:
             if mod not in self.__all_mods:
@@ -184,7 +187,7 @@ class ChipsetsdkSPRule(BaseRule):
             if mod not in indirect_tags:
                 passed = False
                 self.error('chipsetsdk_sp_indirect module %s in chipsetsdk_sp_indirect_info.json should add innerapi_tags "chipsetsdk_sp_indirect"'
-                          % mod)
+                          % mod, mod)
 
         return passed
     
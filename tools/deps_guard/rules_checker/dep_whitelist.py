@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import fnmatch
+
+WILDCARD_CHARS = ("*", "?", "[")
+
+
+def _is_pattern(name):
+    return any(c in name for c in WILDCARD_CHARS)
+
+
+class DepWhitelist(object):
+    """
+    Allowed (so_file_name, dep_file_name) dependencies indexed by hash.
+    Names may use shell style wildcards, "*" alone matches any module.
+    Iterating it yields {so_file_name: dep_file_name} items as get_dep_whitelist() did before.
+    """
+
+    def __init__(self):
+        self._items = []
+        self._pairs = set()
+        self._any_caller = set()      # callees allowed for all callers
+        self._any_callee = set()      # callers allowed to depend on all callees
+        self._patterns = {}           # caller -> [callee pattern], caller is exact
+        self._caller_patterns = []    # (caller pattern, callee pattern)
+
+    def add(self, caller, callee):
+        if (caller, callee) in self._pairs:
+            return
+        self._pairs.add((caller, callee))
+        self._items.append({caller: callee})
+        if not isinstance(caller, str) or not isinstance(callee, str):
+            return
+
+        if caller == "*" and not _is_pattern(callee):
+            self._any_caller.add(callee)
+        elif callee == "*" and not _is_pattern(caller):
+            self._any_callee.add(caller)
+        elif _is_pattern(caller):
+            self._caller_patterns.append((caller, callee))
+        elif _is_pattern(callee):
+            self._patterns.setdefault(caller, []).append(callee)
+
+    def contains(self, caller, callee):
+        if (caller, callee) in self._pairs:
+            return True
+        if callee in self._any_caller or caller in self._any_callee:
+            return True
+        for pattern in self._patterns.get(caller, ()):
+            if fnmatch.fnmatchcase(callee, pattern):
+                return True
+        for caller_pattern, callee_pattern in self._caller_patterns:
+            if fnmatch.fnmatchcase(caller, caller_pattern) and fnmatch.fnmatchcase(callee, callee_pattern):
+                return True
+        return False
+
+    def __contains__(self, pair):
+        return self.contains(pair[0], pair[1])
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def __benchmark(edge_cnt, whitelist_cnt):
+    import random
+    import time
+
+    rand = random.Random(1)
+    names = ["libmodule_%d.z.so" % idx for idx in range(edge_cnt // 10)]
+    edges = [(rand.choice(names), rand.choice(names)) for _ in range(edge_cnt)]
+
+    items = []
+    whitelist = DepWhitelist()
+    for caller, callee in rand.sample(edges, whitelist_cnt):
+        items.append({caller: callee})
+        whitelist.add(caller, callee)
+
+    start = time.time()
+    scan_hits = 0
+    for caller, callee in edges:
+        in_whitelist = False
+        for so_dict in items:
+            for k, v in so_dict.items():
+                if k == caller and v == callee:
+                    in_whitelist = True
+                    break
+        if in_whitelist:
+            scan_hits += 1
+    scan_cost = time.time() - start
+
+    start = time.time()
+    index_hits = 0
+    for caller, callee in edges:
+        if whitelist.contains(caller, callee):
+            index_hits += 1
+    index_cost = time.time() - start
+
+    print("%d edges, %d whitelist items" % (edge_cnt, whitelist_cnt))
+    print("list scan:  %d allowed in %.3fs" % (scan_hits, scan_cost))
+    print("hash index: %d allowed in %.3fs" % (index_hits, index_cost))
+    if index_cost > 0:
+        print("Speedup:    %.1fx" % (scan_cost / index_cost))
+
+
+if __name__ == '__main__':
+    import sys
+
+    edges = 50000
+    items = 500
+    if len(sys.argv) > 2:
+        edges = int(sys.argv[1])
+        items = int(sys.argv[2])
+    __benchmark(edges, items)
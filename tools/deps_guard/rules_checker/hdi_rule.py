@@ -24,36 +24,45 @@ from .base_rule import BaseRule
 class HdiRule(BaseRule):
     RULE_NAME = "NO-Depends-On-HDI"
 
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
+        self.__hdi_without_shlib_type = []
+        self.__non_hdi_with_hdi_shlib_type = []
+        self.__depended_hdi_mods = []
+
+    def visit_module(self, mod):
+        lists = self.get_white_lists()
+
+        is_hdi = False
+        if "hdiType" in mod and mod["hdiType"] == "hdi_service":
+            is_hdi = True
+        # Collect non HDI modules with shlib_type of value "hdi"
+        if not is_hdi and ("shlib_type" in mod and mod["shlib_type"] == "hdi"):
+            self.__non_hdi_with_hdi_shlib_type.append(mod)
+
+        # Collect HDI modules without shlib_type with value of "hdi"
+        if is_hdi and ("shlib_type" not in mod or mod["shlib_type"] != "hdi"):
+            if mod["name"] not in lists:
+                self.__hdi_without_shlib_type.append(mod)
+
+        if not self.__ignore_mod(mod, is_hdi, lists):
+            self.__depended_hdi_mods.append(mod)
+
     def check(self):
         return self.__check_depends_on_hdi()
 
     def __check_depends_on_hdi(self):
+        self.visit_all()
         lists = self.get_white_lists()
 
         passed = True
 
-        hdi_without_shlib_type = []
-        non_hdi_with_hdi_shlib_type = []
-
-        # Check if any napi modules has dependedBy
-        for mod in self.get_mgr().get_all():
-            is_hdi = False
-            if "hdiType" in mod and mod["hdiType"] == "hdi_service":
-                is_hdi = True
-            # Collect non HDI modules with shlib_type of value "hdi"
-            if not is_hdi and ("shlib_type" in mod and mod["shlib_type"] == "hdi"):
-                non_hdi_with_hdi_shlib_type.append(mod)
-
-            # Collect HDI modules without shlib_type with value of "hdi"
-            if is_hdi and ("shlib_type" not in mod or mod["shlib_type"] != "hdi"):
-                if mod["name"] not in lists:
-                    hdi_without_shlib_type.append(mod)
-
-            if self.__ignore_mod(mod, is_hdi, lists):
-                continue
+        hdi_without_shlib_type = self.__hdi_without_shlib_type
+        non_hdi_with_hdi_shlib_type = self.__non_hdi_with_hdi_shlib_type
 
+        for mod in self.__depended_hdi_mods:
             # Check if HDI modules is depended by other modules
-            self.error("hdi module %s depended by:" % mod["name"])
+            self.error("hdi module %s depended by:" % mod["name"], mod["name"])
             for dep in mod["dependedBy"]:
                 caller = dep["caller"]
                 self.log("   module [%s] defined in [%s]" % (caller["name"], caller["labelPath"]))
@@ -63,7 +72,7 @@ class HdiRule(BaseRule):
             for mod in hdi_without_shlib_type:
                 if mod["name"] not in lists:
                     passed = False
-                    self.error('hdi module %s has no shlib_type="hdi", add it in %s' % (mod["name"], mod["labelPath"]))
+                    self.error('hdi module %s has no shlib_type="hdi", add it in %s' % (mod["name"], mod["labelPath"]), mod["name"])
 
         if len(non_hdi_with_hdi_shlib_type) > 0:
             for mod in non_hdi_with_hdi_shlib_type:
@@ -24,14 +24,21 @@ from .base_rule import BaseRule
 
 class LLndkRule(BaseRule):
     RULE_NAME = "LLndk"
+    INCREMENTAL = False
 
-    def __init__(self, mgr, args):
-        super().__init__(mgr, args)
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
         self.__out_path = mgr.get_product_out_path()
         self.__white_lists = self.load_llndk_json("llndk_info.json")
         self.__ignored_tags = ["platformsdk", "sasdk", "platformsdk_indirect", "ndk"]
         self.__valid_mod_tags = ["llndk", "chipsetsdk", "chipsetsdk_indirect", "chipsetsdk_sp",
                                  "chipsetsdk_sp_indirect", "passthrough", "system"] + self.__ignored_tags
+        self.__load_llndks()
+
+        self.__modules_with_llndk_tag = []
+        self.__all_mods = set()
+        self.__all_paths = {}
+        self.__unlisted_mods = []
 
     def get_white_lists(self):
         return self.__white_lists
@@ -63,27 +70,26 @@ class LLndkRule(BaseRule):
 
         return res
 
+    def visit_module(self, mod):
+        if self.__is_llndk_tagged(mod):
+            self.__modules_with_llndk_tag.append(mod)
+
+        self.__all_mods.add(mod["name"])
+        self.__all_paths[mod["name"]] = mod["path"]
+
+        if self.__is_llndk_tagged(mod) and mod["name"] not in self.__llndks:
+            self.__unlisted_mods.append(mod)
+
     def check(self):
-        self.__modules_with_llndk_tag = []
-        self.__all_mods = []
-        self.__all_paths = {}
+        self.visit_all()
         white_lists = self.get_dep_whitelist()
-        self.__load_llndks()
-        
+
         passed = True
-        for mod in self.get_mgr().get_all():
-            if self.__is_llndk_tagged(mod):
-                self.__modules_with_llndk_tag.append(mod)
-            
-            self.__all_mods.append(mod["name"])
-            self.__all_paths[mod["name"]] = mod["path"]
-
-            if self.__is_llndk_tagged(mod) and mod["name"] not in self.__llndks:
-                # Not allowed
-                self.error("NEED MODIFY: so file %s in %s should be add in file llndk_info.json"
-                           % (mod["name"], mod["labelPath"]))
-                passed = False
-                continue
+        for mod in self.__unlisted_mods:
+            # Not allowed
+            self.error("NEED MODIFY: so file %s in %s should be add in file llndk_info.json"
+                       % (mod["name"], mod["labelPath"]), mod["name"])
+            passed = False
         if not passed:
             return passed
 
@@ -104,12 +110,11 @@ class LLndkRule(BaseRule):
     def __parser_rules_file(self, rules_file, res):
         try:
             self.log("****Parsing rules file in {}****".format(rules_file))
-            with open(rules_file, "r") as f:
-                contents = f.read()
+            contents = self.get_rule_data().read(rules_file)
             if not contents:
                 self.log("****rules file {} is null****".format(rules_file))
                 return res
-            json_data = json.loads(contents)
+            json_data = self.get_rule_data().load_json(rules_file)
             for so in json_data:
                 so_file_name = so.get("so_file_name")
                 if so_file_name and so_file_name not in res:
@@ -135,7 +140,7 @@ class LLndkRule(BaseRule):
                 continue
             if mod not in llndk_tags:
                 passed = False
-                self.error('llndk module %s in llndk_info.json should add innerapi_tags with "llndk"' % mod)
+                self.error('llndk module %s in llndk_info.json should add innerapi_tags with "llndk"' % mod, mod)
 
         return passed
 
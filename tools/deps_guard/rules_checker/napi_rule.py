@@ -24,22 +24,25 @@ from .base_rule import BaseRule
 class NapiRule(BaseRule):
     RULE_NAME = "NO-Depends-On-NAPI"
 
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
+        self.__depended_napi_mods = []
+
+    def visit_module(self, mod):
+        # Collect napi modules which has dependedBy
+        if mod["napi"] and len(mod["dependedBy"]) > 0:
+            self.__depended_napi_mods.append(mod)
+
     def check(self):
         return self.__check_depends_on_napi()
 
     def __check_depends_on_napi(self):
+        self.visit_all()
         lists = self.get_white_lists()
         white_lists = ["featureability", "rdb", "dataability", "image_napi", "hint2type"]
         passed = True
 
-        # Check if any napi modules has dependedBy
-        for mod in self.get_mgr().get_all():
-            if not mod["napi"]:
-                continue
-
-            if len(mod["dependedBy"]) == 0:
-                continue
-
+        for mod in self.__depended_napi_mods:
             target_name = mod["labelPath"][mod["labelPath"].find(":")+1:]
             if target_name in lists:
                 continue
@@ -47,7 +50,7 @@ class NapiRule(BaseRule):
             if target_name in white_lists:
                 continue
 
-            self.error("napi module %s depended by:" % mod["name"])
+            self.error("napi module %s depended by:" % mod["name"], mod["name"])
             for dep in mod["dependedBy"]:
                 caller = dep["caller"]
                 self.log("   module [%s] defined in [%s]" % (caller["name"], caller["labelPath"]))
@@ -24,13 +24,22 @@ from .base_rule import BaseRule
 
 class PassthroughRule(BaseRule):
     RULE_NAME = "Passthrough"
+    INCREMENTAL = False
 
-    def __init__(self, mgr, args):
-        super().__init__(mgr, args)
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
         self.__out_path = mgr.get_product_out_path()
         self.__white_lists = self.load_passthrough_json("passthrough_info.json")
         self.__ignored_tags = ["platformsdk", "sasdk", "platformsdk_indirect", "ndk"]
         self.__valid_mod_tags = ["llndk", "chipsetsdk_sp", "passthrough", "passthrough_indirect"] + self.__ignored_tags
+        self.__load_passthroughs()
+        self.__load_passthrough_indirects()
+
+        self.__modules_with_passthrough_tag = []
+        self.__modules_with_passthrough_indirect_tag = []
+        self.__all_mods = set()
+        self.__all_paths = {}
+        self.__unlisted_mods = []
 
     def get_white_lists(self):
         return self.__white_lists
@@ -62,9 +71,33 @@ class PassthroughRule(BaseRule):
 
         return res
 
+    def visit_module(self, mod):
+        # Collect all modules with passthrough tag
+        if self.__is_passthrough_tagged(mod):
+            self.__modules_with_passthrough_tag.append(mod)
+
+        # Collect all modules with passthrough_indirect tag
+        if self.__is_passthrough_indirect(mod):
+            self.__modules_with_passthrough_indirect_tag.append(mod)
+
+        # Check passthrough so only
+        if not mod["path"].endswith("so"):
+            return
+
+        self.__all_mods.add(mod["name"])
+        self.__all_paths[mod["name"]] = mod["path"]
+
+        if "passthrough" in mod["path"] and "passthrough/indirect" not in mod["path"]:
+            if mod["name"] not in self.__passthroughs:
+                self.__unlisted_mods.append((mod, "passthrough_info.json"))
+                return
+
+        if "passthrough/indirect" in mod["path"]:
+            if mod["name"] not in self.__indirects:
+                self.__unlisted_mods.append((mod, "passthrough_indirect_info.json"))
+
     def check(self):
-        self.__load_passthroughs()
-        self.__load_passthrough_indirects()
+        self.visit_all()
         white_lists = self.get_dep_whitelist()
 
         # Check if all chipset modules depends on chipsetsdk modules only
@@ -95,12 +128,11 @@ class PassthroughRule(BaseRule):
     def __parser_rules_file(self, rules_file, res):
         try:
             self.log("****Parsing rules file in {}****".format(rules_file))
-            with open(rules_file, "r") as f:
-                contents = f.read()
+            contents = self.get_rule_data().read(rules_file)
             if not contents:
                 self.log("****rules file {} is null****".format(rules_file))
                 return res
-            json_data = json.loads(contents)
+            json_data = self.get_rule_data().load_json(rules_file)
             for so in json_data:
                 so_file_name = so.get("so_file_name")
                 if so_file_name and so_file_name not in res:
@@ -127,43 +159,11 @@ class PassthroughRule(BaseRule):
     def __check_depends_on_passthrough(self):
         passed = True
 
-        self.__modules_with_passthrough_tag = []
-        self.__modules_with_passthrough_indirect_tag = []
-        self.__all_mods = []
-        self.__all_paths = {}
-
-        # Check if any napi modules has dependedBy
-        for mod in self.get_mgr().get_all():
-            # Collect all modules with passthrough tag
-            if self.__is_passthrough_tagged(mod):
-                self.__modules_with_passthrough_tag.append(mod)
-
-            # Collect all modules with passthrough_indirect tag
-            if self.__is_passthrough_indirect(mod):
-                self.__modules_with_passthrough_indirect_tag.append(mod)
-
-            # Check passthrough so only
-            if not mod["path"].endswith("so"):
-                continue
-
-            self.__all_mods.append(mod["name"])
-            self.__all_paths[mod["name"]] = mod["path"]
-
-            if "passthrough" in mod["path"] and "passthrough/indirect" not in mod["path"]:
-                if mod["name"] not in self.__passthroughs:
-                    # Not allowed
-                    passed = False
-                    self.error("NEED MODIFY: so file %s in %s should be add in file passthrough_info.json"
-                            % (mod["name"], mod["labelPath"]))
-                    continue
-
-            if "passthrough/indirect" in mod["path"]:
-                if mod["name"] not in self.__indirects:
-                    # Not allowed
-                    passed = False
-                    self.error("NEED MODIFY: so file %s in %s should be add in file passthrough_indirect_info.json"
-                            % (mod["name"], mod["labelPath"]))
-                    continue
+        for mod, list_file in self.__unlisted_mods:
+            # Not allowed
+            passed = False
+            self.error("NEED MODIFY: so file %s in %s should be add in file %s"
+                    % (mod["name"], mod["labelPath"], list_file), mod["name"])
 
         return passed
 
@@ -181,7 +181,7 @@ class PassthroughRule(BaseRule):
             if mod not in passthrough_tags:
                 passed = False    
                 self.error('Passthrough module %s in passthrough_info.json should add innerapi_tags with "passthrough"'
-                          % mod)
+                          % mod, mod)
 
         for mod in self.__indirects:
             if mod not in self.__all_mods:
@@ -192,7 +192,7 @@ class PassthroughRule(BaseRule):
             if mod not in indirect_tags:
                 passed = False
                 self.error('passthrough_indirect module %s in passthrough_indirect_info.json should add innerapi_tags "passthrough_indirect"'
-                          % mod)
+                          % mod, mod)
 
         return passed
 
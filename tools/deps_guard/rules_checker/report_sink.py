@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import json
+import time
+
+
+class JsonLinesReportSink(object):
+    """
+    Stream rule checking results as JSON Lines, one record per line flushed as soon as it is reported.
+    Records have a "type" field:
+      start:     {"type": "start", "product": ..., "time": ...}
+      rule:      {"type": "rule", "rule": ...}                      a rule begins checking
+      violation: {"type": "violation", "rule": ..., "level": "error"|"warning", "module": ..., "message": ...}
+      result:    {"type": "result", "rule": ..., "passed": ..., "violations": ..., "seconds": ..., "help": ...}
+      summary:   {"type": "summary", "passed": ..., "rules": ..., "violations": ...}
+    """
+
+    def __init__(self, report_file):
+        self._report_file = report_file
+        self._f = os.fdopen(os.open(report_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), "w",
+                            encoding="utf-8")
+        self._rules = 0
+        self._violations = 0
+
+    def __write(self, record):
+        if not self._f:
+            return
+        self._f.write(json.dumps(record, ensure_ascii=False))
+        self._f.write("\n")
+        self._f.flush()
+
+    def start(self, product_out_path):
+        self.__write({"type": "start", "product": product_out_path, "time": time.time()})
+
+    def begin_rule(self, rule_name):
+        self._rules += 1
+        self.__write({"type": "rule", "rule": rule_name})
+
+    def violation(self, rule_name, level, subject, message):
+        if level == "error":
+            self._violations += 1
+        self.__write({"type": "violation", "rule": rule_name, "level": level, "module": subject, "message": message})
+
+    def end_rule(self, rule_name, passed, violations, seconds, help_url):
+        self.__write({"type": "result", "rule": rule_name, "passed": passed, "violations": violations,
+                      "seconds": round(seconds, 3), "help": help_url})
+
+    def close(self, passed):
+        self.__write({"type": "summary", "passed": passed, "rules": self._rules, "violations": self._violations})
+        if self._f:
+            self._f.close()
+            self._f = None
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+
+
+class RuleData(object):
+    """
+    Rule files shared by all rules of one checking run, each file is read and parsed once.
+    Errors are cached too and raised again to every caller.
+    """
+
+    def __init__(self):
+        self._contents = {}
+        self._json = {}
+        self._reads = 0
+        self._hits = 0
+
+    def read(self, rules_file):
+        if rules_file in self._contents:
+            self._hits += 1
+        else:
+            self._reads += 1
+            try:
+                with open(rules_file, "r") as f:
+                    self._contents[rules_file] = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                self._contents[rules_file] = e
+        return self.__result(self._contents[rules_file])
+
+    def load_json(self, rules_file, strip_comments=False):
+        key = (rules_file, strip_comments)
+        if key not in self._json:
+            contents = self.read(rules_file)
+            try:
+                if strip_comments:
+                    lines = [line.strip() for line in contents.splitlines()]
+                    contents = "".join([line for line in lines if not line.startswith("//")])
+                self._json[key] = json.loads(contents)
+            except ValueError as e:
+                self._json[key] = e
+        return self.__result(self._json[key])
+
+    @staticmethod
+    def __result(value):
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def get_summary(self):
+        return "%d rule files read, %d reads shared" % (self._reads, self._hits)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+
+from .base_rule import BaseRule
+from .rule_data import RuleData
+from .check_snapshot import CheckSnapshot
+from .report_sink import JsonLinesReportSink
+
+
+class RuleEngine(object):
+    """
+    Check all rules with one walk of the module graph.
+    Each module and each of its dependencies is sent to the visit hooks of all rules,
+    then every rule reports with its check(). Rule files are loaded once by RuleData.
+    With a snapshot of the last run and a list of changes, only the affected modules are checked
+    by incremental rules, the other rules check all modules.
+    With a report file, violations are streamed as JSON Lines while checking runs.
+    """
+
+    def __init__(self, mgr, args):
+        self._mgr = mgr
+        self._args = args
+        self._rule_data = RuleData()
+        self._rules = []
+        self._costs = []
+        self._kept = []
+        self._visit_cost = 0
+        self._visited = 0
+        self._sink = None
+        if getattr(args, "report_jsonl", None):
+            self._sink = JsonLinesReportSink(args.report_jsonl)
+            self._sink.start(mgr.get_product_out_path())
+
+    def add_rule(self, rule_class):
+        start = time.perf_counter()
+        rule = rule_class(self._mgr, self._args, self._rule_data)
+        rule.set_report_sink(self._sink)
+        self._rules.append(rule)
+        self._costs.append(time.perf_counter() - start)
+
+    def get_rules(self):
+        return self._rules
+
+    def check(self):
+        snapshot = None
+        modules = None
+        affected_names = None
+        if getattr(self._args, "snapshot", None):
+            snapshot = CheckSnapshot(self._args.snapshot)
+            modules, affected_names = self.__get_affected_modules(snapshot)
+        elif getattr(self._args, "changed", None):
+            print("Warning: --changed needs --snapshot as baseline, check all modules")
+
+        # The report is closed even if a rule raises, it is not passed then
+        passed = False
+        try:
+            passed = self.__check_rules(snapshot, modules, affected_names)
+        finally:
+            if self._sink:
+                self._sink.close(passed)
+        return passed
+
+    def __check_rules(self, snapshot, modules, affected_names):
+        self.__visit_all(modules)
+
+        passed = True
+        for idx, r in enumerate(self._rules):
+            start = time.perf_counter()
+            r.log("Do %s rule checking now:" % r.RULE_NAME)
+            if self._sink:
+                self._sink.begin_rule(r.RULE_NAME)
+            rule_passed = r.check()
+            violations = r.get_violations()
+            if snapshot:
+                # Rules not checked incrementally have visited all modules, their result replaces the baseline
+                rule_affected = affected_names if r.INCREMENTAL else None
+                merged, kept = snapshot.merge(r.RULE_NAME, violations, rule_affected)
+                self._kept.append(kept)
+                if rule_affected is not None:
+                    rule_passed = len(merged) == 0
+                    violations = merged
+                    self.__report_kept(r, merged[:kept])
+            if not rule_passed:
+                passed = False
+                r.log("  Please refer to: \033[91m%s\x1b[0m" % r.get_help_url())
+            self._costs[idx] += time.perf_counter() - start
+            if self._sink:
+                self._sink.end_rule(r.RULE_NAME, rule_passed, len(violations), self._costs[idx], r.get_help_url())
+
+        if snapshot:
+            snapshot.save(self._mgr)
+        self.__print_summary()
+        return passed
+
+    def __report_kept(self, rule, kept):
+        # Violations of unaffected modules are not checked again, report them from the snapshot
+        for subject, info in kept:
+            if self._sink:
+                self._sink.violation(rule.RULE_NAME, "error", subject, info)
+            print("\033[91m[NOT ALLOWED]\x1b[0m: (kept from snapshot) %s" % info)
+
+    def __get_affected_modules(self, snapshot):
+        changed = getattr(self._args, "changed", None)
+        if not changed:
+            return None, None
+        if not snapshot.is_loaded():
+            print("No baseline in snapshot %s, check all modules" % self._args.snapshot)
+            return None, None
+
+        if changed == "snapshot":
+            entries = snapshot.get_changed_names(self._mgr)
+        else:
+            entries = CheckSnapshot.read_changed_list(changed)
+        changed_mods, names = CheckSnapshot.resolve(self._mgr, entries)
+        former_mods, former_names = CheckSnapshot.resolve(self._mgr, snapshot.get_former_neighbors(changed_mods))
+        names.update(former_names)
+        modules = self._mgr.get_affected_modules(changed_mods + former_mods)
+        names.update([mod["name"] for mod in modules])
+        print("Incremental checking: %d changed, %d of %d modules affected"
+              % (len(changed_mods), len(modules), len(self._mgr.get_all())))
+        return modules, names
+
+    def __visit_all(self, modules=None):
+        module_visitors = []
+        dep_visitors = []
+        for idx, r in enumerate(self._rules):
+            if type(r).visit_module is not BaseRule.visit_module:
+                module_visitors.append((idx, r))
+            if type(r).visit_dependency is not BaseRule.visit_dependency:
+                dep_visitors.append((idx, r))
+
+        all_modules = self._mgr.get_all()
+        partial = modules is not None
+        if not partial:
+            modules = all_modules
+        passes = [(modules, module_visitors, dep_visitors)]
+        if partial:
+            # Rules depending on the visiting order or on other modules still visit all modules
+            passes = [(modules, [v for v in module_visitors if v[1].INCREMENTAL],
+                       [v for v in dep_visitors if v[1].INCREMENTAL]),
+                      (all_modules, [v for v in module_visitors if not v[1].INCREMENTAL],
+                       [v for v in dep_visitors if not v[1].INCREMENTAL])]
+
+        start = time.perf_counter()
+        self._visited = 0
+        for mods, mod_visits, dep_visits in passes:
+            if not mod_visits and not dep_visits:
+                continue
+            if getattr(self._args, "verbose", False):
+                self.__visit_timed(mods, mod_visits, dep_visits)
+            else:
+                self.__visit(mods, mod_visits, dep_visits)
+            self._visited = max(self._visited, len(mods))
+        self._visit_cost = time.perf_counter() - start
+
+        for r in self._rules:
+            r.set_visited(partial and r.INCREMENTAL)
+
+    @staticmethod
+    def __visit(modules, module_visitors, dep_visitors):
+        module_visits = [r.visit_module for idx, r in module_visitors]
+        dep_visits = [r.visit_dependency for idx, r in dep_visitors]
+        for mod in modules:
+            for visit in module_visits:
+                visit(mod)
+            if not dep_visits:
+                continue
+            for dep in mod["deps"]:
+                for visit in dep_visits:
+                    visit(mod, dep)
+
+    def __visit_timed(self, modules, module_visitors, dep_visitors):
+        # Time each visit only with -v, the clock calls are as many as the visits
+        costs = self._costs
+        for mod in modules:
+            for idx, r in module_visitors:
+                start = time.perf_counter()
+                r.visit_module(mod)
+                costs[idx] += time.perf_counter() - start
+
+            if not dep_visitors:
+                continue
+            for dep in mod["deps"]:
+                for idx, r in dep_visitors:
+                    start = time.perf_counter()
+                    r.visit_dependency(mod, dep)
+                    costs[idx] += time.perf_counter() - start
+
+    def __print_summary(self):
+        print("Rules checking summary:")
+        for idx, r in enumerate(self._rules):
+            if self._kept:
+                print("    %-24s %6d violations %8.3fs, %d kept from snapshot"
+                      % (r.RULE_NAME, r.get_violation_count(), self._costs[idx], self._kept[idx]))
+            else:
+                print("    %-24s %6d violations %8.3fs" % (r.RULE_NAME, r.get_violation_count(), self._costs[idx]))
+        print("    Visiting %d modules: %.3fs%s" % (self._visited, self._visit_cost,
+                                                  "" if getattr(self._args, "verbose", False)
+                                                  else ", not included in the rule costs above (-v to time each rule)"))
+        print("    %s" % self._rule_data.get_summary())
+        if getattr(self._args, "verbose", False):
+            print("    %s" % self._mgr.get_module_index().get_summary())
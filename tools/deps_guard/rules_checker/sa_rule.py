@@ -24,46 +24,56 @@ from .base_rule import BaseRule
 class SaRule(BaseRule):
     RULE_NAME = "NO-Depends-On-SA"
 
-    def check(self):
-        return self.__check_depends_on_sa()
+    def __init__(self, mgr, args, rule_data=None):
+        super().__init__(mgr, args, rule_data)
+        self.__sa_without_shlib_type = []
+        self.__non_sa_with_sa_shlib_type = []
+        self.__depended_sa_mods = []
 
-    def __check_depends_on_sa(self):
+    def visit_module(self, mod):
         lists = self.get_white_lists()
 
-        passed = True
+        is_sa = False
+        if "sa_id" in mod and mod["sa_id"] > 0:
+            is_sa = True
+        # Collect non SA modules with shlib_type of value "sa"
+        if not is_sa and ("shlib_type" in mod and mod["shlib_type"] == "sa"):
+            self.__non_sa_with_sa_shlib_type.append(mod)
+
+        # Collect SA modules without shlib_type with value of "sa"
+        if is_sa and ("shlib_type" not in mod or mod["shlib_type"] != "sa"):
+            if mod["name"] not in lists:
+                self.__sa_without_shlib_type.append(mod)
 
-        sa_without_shlib_type = []
-        non_sa_with_sa_shlib_type = []
+        if not is_sa:
+            return
 
-        # Check if any napi modules has dependedBy
-        for mod in self.get_mgr().get_all():
-            is_sa = False
-            if "sa_id" in mod and mod["sa_id"] > 0:
-                is_sa = True
-            # Collect non SA modules with shlib_type of value "sa"
-            if not is_sa and ("shlib_type" in mod and mod["shlib_type"] == "sa"):
-                non_sa_with_sa_shlib_type.append(mod)
+        if len(mod["dependedBy"]) == 0:
+            return
 
-            # Collect SA modules without shlib_type with value of "sa"
-            if is_sa and ("shlib_type" not in mod or mod["shlib_type"] != "sa"):
-                if mod["name"] not in lists:
-                    sa_without_shlib_type.append(mod)
+        if mod["name"] in lists:
+            return
 
-            if not is_sa:
-                continue
+        # If sa module has version_script to specify exported symbols, it can be depended by others
+        if "version_script" in mod:
+            return
 
-            if len(mod["dependedBy"]) == 0:
-                continue
+        self.__depended_sa_mods.append(mod)
 
-            if mod["name"] in lists:
-                continue
+    def check(self):
+        return self.__check_depends_on_sa()
+
+    def __check_depends_on_sa(self):
+        self.visit_all()
+
+        passed = True
 
-            # If sa module has version_script to specify exported symbols, it can be depended by others
-            if "version_script" in mod:
-                continue
+        sa_without_shlib_type = self.__sa_without_shlib_type
+        non_sa_with_sa_shlib_type = self.__non_sa_with_sa_shlib_type
 
+        for mod in self.__depended_sa_mods:
             # Check if SA modules is depended by other modules
-            self.error("sa module %s depended by:" % mod["name"])
+            self.error("sa module %s depended by:" % mod["name"], mod["name"])
             for dep in mod["dependedBy"]:
                 caller = dep["caller"]
                 self.log("   module [%s] defined in [%s]" % (caller["name"], caller["labelPath"]))
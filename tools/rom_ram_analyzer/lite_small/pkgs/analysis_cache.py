@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file contains an on-disk cache of rom analysis between runs
+
+import os
+import glob
+import pickle
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+
+CACHE_VERSION = 3
+# 工具的代码所在的目录,代码改变(如升级工具)后不使用原有的缓存
+_CODE_DIRS = [os.path.dirname(os.path.abspath(__file__)),
+              os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")]
+
+
+def code_version() -> str:
+    sha = hashlib.sha256()
+    for d in _CODE_DIRS:
+        for file in sorted(glob.glob(os.path.join(d, "*.py"))):
+            with open(file, 'rb') as f:
+                sha.update(os.path.basename(file).encode("utf-8"))
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+class AnalysisCache:
+    """
+    rom_analysis在多次运行之间的缓存,按名字保存各部分的内容,如:
+    gn_index: GnIndex的快照,目录的mtime没有变化时不再读取目录项,文件的大小和mtime没有变化时不再读取内容
+    gn_info: 各个BUILD.gn的解析结果,只重新解析有变化或受到变化影响的BUILD.gn
+    缓存为pickle文件,只应加载本工具生成的缓存文件,工具的代码改变后缓存失效
+    第一次get或put时才加载缓存文件
+    """
+
+    def __init__(self, cache_file: Optional[str], project_path: str, load: bool = True):
+        """
+        :param cache_file: 缓存文件,为空时不使用缓存
+        :param project_path: 项目根路径,与缓存中的不同时不使用缓存
+        :param load: 是否加载已有的缓存,为False时重新建立缓存
+        """
+        self.cache_file = cache_file
+        self.project_path = project_path
+        self.__sections: Dict[str, Any] = dict()
+        self.__code_version = str()
+        self.__pending_load = bool(cache_file and load)
+
+    def __load(self) -> None:
+        if not self.__pending_load:
+            return
+        self.__pending_load = False
+        if not os.path.isfile(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'rb') as f:
+                root = pickle.load(f)
+            if root.get("version") != CACHE_VERSION or root.get("code_version") != self.__get_code_version() \
+                    or root.get("project_path") != self.project_path:
+                logging.info(f"cache {self.cache_file} is out of date, rebuild it")
+                return
+            self.__sections = root["sections"]
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError,
+                ValueError):
+            logging.warning(f"cache {self.cache_file} is corrupted, rebuild it")
+            return
+        logging.info(f"load cache from {self.cache_file}")
+
+    def get(self, name: str) -> Any:
+        self.__load()
+        return self.__sections.get(name)
+
+    def put(self, name: str, value: Any) -> None:
+        self.__load()
+        self.__sections[name] = value
+
+    def __get_code_version(self) -> str:
+        if not self.__code_version:
+            self.__code_version = code_version()
+        return self.__code_version
+
+    def save(self) -> None:
+        """
+        先写入临时文件再重命名,避免中断时留下不完整的缓存
+        """
+        if not self.cache_file:
+            return
+        root = {
+            "version": CACHE_VERSION,
+            "code_version": self.__get_code_version(),
+            "project_path": self.project_path,
+            "sections": self.__sections,
+        }
+        tmp_file = self.cache_file + ".tmp"
+        try:
+            with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'wb') as f:
+                pickle.dump(root, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+        except (OSError, pickle.PicklingError) as e:
+            logging.warning(f"save cache to {self.cache_file} failed: {e}")
+            return
+        logging.info(f"cache saved to {self.cache_file}")
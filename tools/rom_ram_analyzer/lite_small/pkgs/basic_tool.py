@@ -24,6 +24,11 @@ import glob
 from typing import Dict, Any, List, Callable, Text, Iterator
 import unittest
 
+if __name__ == '__main__':
+    from gn_paragraph import match_paragraph as match_gn_paragraph
+else:
+    from pkgs.gn_paragraph import match_paragraph as match_gn_paragraph
+
 
 def unit_adaptive(size: int) -> str:
     unit_list = ["Byte", "KB", "MB", "GB"]
@@ -103,11 +108,14 @@ class BasicTool:
         """
         匹配代码段，支持单行
         注意：ptrn中已经包含前面的空格，所以start_pattern中可以省略
+        使用默认的end_pattern时，由GnParagraphExtractor根据括号的匹配查找段落，支持嵌套，段落带有所在的行号
         :param content: 被匹配的字符串
         :param start_pattern: 模式的开头
         :param end_pattern: 模式的结尾
         :return: 匹配到的段落的迭代器
         """
+        if end_pattern == "\}":
+            return match_gn_paragraph(content, start_pattern)
         ptrn = r'^( *){s}(?#匹配开头).*?(?#中间非贪婪)\1(?#如果开头前面有空格,则结尾的前面应该有相同数量的空格)?{e}$(?#匹配结尾)'.format(
             s=start_pattern, e=end_pattern)
         ptrn = re.compile(ptrn, re.M | re.S)
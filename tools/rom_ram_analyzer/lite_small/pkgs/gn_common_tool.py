@@ -24,8 +24,10 @@ import collections
 from typing import List
 if __name__ == '__main__':
     from basic_tool import BasicTool
+    from gn_index import GnIndex
 else:
     from pkgs.basic_tool import BasicTool
+    from pkgs.gn_index import GnIndex
 
 
 class GnCommonTool:
@@ -74,7 +76,7 @@ class GnCommonTool:
     def find_variables_in_gn(cls, var_name_tuple: tuple, path: str, stop_tail: str = "home", use_cache: bool = False) -> \
             List[str]:
         """
-        同时查找多个gn变量的值
+        同时查找多个gn变量的值,path在已建立的GnIndex中时从内存中查找,否则使用grep
         var_name_tuple：变量名的tuple，变量名应是未经过处理后的，如：
         xxx
         "${xxx}"
@@ -98,13 +100,17 @@ class GnCommonTool:
         while (stop_tail in path) and not_found_count:
             for v in var_name_tuple:
                 pv = v.strip('"').lstrip("${").rstrip('}')
-                # 先直接grep出pv *= *\".*?\"的
-                # 然后排除含有$符的
-                # 再取第一个
-                # 最后只取引号内的
-                cmd = fr"grep -Ern '{pv} *= *\".*?\"' --include=*.gn* {path} | grep -Ev '\$' " \
-                      r"| head -n 1 | grep -E '\".*\"' -wo"
-                output = BasicTool.execute(cmd, lambda x: x.strip().strip('"'))
+                index = GnIndex.find(path)
+                if index:
+                    output = index.first_value(pv, path).strip().strip('"')
+                else:
+                    # 先直接grep出pv *= *\".*?\"的
+                    # 然后排除含有$符的
+                    # 再取第一个
+                    # 最后只取引号内的
+                    cmd = fr"grep -Ern '{pv} *= *\".*?\"' --include=*.gn* {path} | grep -Ev '\$' " \
+                          r"| head -n 1 | grep -E '\".*\"' -wo"
+                    output = BasicTool.execute(cmd, lambda x: x.strip().strip('"'))
                 # backup:end
                 if not output:
                     continue
@@ -146,8 +152,12 @@ class GnCommonTool:
         result = list()
         v = var_name.strip('"').lstrip("${").rstrip('}')
         while stop_tail in path:
-            cmd = fr"grep -Ern '^( *){v} *= *\".*?\"' --include=*.gn* {path}"
-            output = os.popen(cmd).readlines()
+            index = GnIndex.find(path)
+            if index:
+                output = index.assignment_lines(v, path, anchored=True)
+            else:
+                cmd = fr"grep -Ern '^( *){v} *= *\".*?\"' --include=*.gn* {path}"
+                output = os.popen(cmd).readlines()
             path = os.path.split(path)[0]
             if not output:
                 continue
@@ -21,12 +21,15 @@ import logging
 
 if __name__ == '__main__':
     from basic_tool import BasicTool
+    from gn_index import GnIndex
 else:
     from pkgs.basic_tool import BasicTool
+    from pkgs.gn_index import GnIndex
 
 
 class RomRamBaselineCollector:
     """collect baseline of rom and ram from bundle.json
+    bundle.json are listed and read from the GnIndex of oh_path if it has been built
     """
 
     @classmethod
@@ -36,27 +39,36 @@ class RomRamBaselineCollector:
             y = [item for item in x if item]
             return y
 
-        bundle_list = BasicTool.execute(
-            cmd=f"find {oh_path} -name bundle.json", post_processor=post_handler)
+        index = GnIndex.find(oh_path)
+        bundle_list = index.get_bundle_files(oh_path) if index else None
+        if bundle_list is None:
+            bundle_list = BasicTool.execute(
+                cmd=f"find {oh_path} -name bundle.json", post_processor=post_handler)
         rom_ram_baseline_dict: Dict[str, Dict] = dict()
         for bundle in bundle_list:
-            with open(bundle, 'r', encoding='utf-8') as f:
-                content: Dict[str, Any] = json.loads(f.read())
-                component_info = content.get("component")
-                if not component_info:
-                    logging.warning(f"{bundle} has no field of 'component'.")
-                    continue
-                component_name = component_info.get("name")
-                subsystem_name = component_info.get("subsystem")
-                rom_baseline = component_info.get("rom")
-                ram_baseline = component_info.get("ram")
-                if not (subsystem_name or rom_baseline or ram_baseline):
-                    logging.warning(
-                        f"subsystem=\"{subsystem_name}\", rom=\"{rom_baseline}\", ram=\"{ram_baseline}\" in {bundle}")
-                cls._put(rom_ram_baseline_dict, subsystem_name,
-                         component_name, rom_baseline, ram_baseline, bundle)
+            content: Dict[str, Any] = cls._read_bundle(index, bundle)
+            component_info = content.get("component")
+            if not component_info:
+                logging.warning(f"{bundle} has no field of 'component'.")
+                continue
+            component_name = component_info.get("name")
+            subsystem_name = component_info.get("subsystem")
+            rom_baseline = component_info.get("rom")
+            ram_baseline = component_info.get("ram")
+            if not (subsystem_name or rom_baseline or ram_baseline):
+                logging.warning(
+                    f"subsystem=\"{subsystem_name}\", rom=\"{rom_baseline}\", ram=\"{ram_baseline}\" in {bundle}")
+            cls._put(rom_ram_baseline_dict, subsystem_name,
+                     component_name, rom_baseline, ram_baseline, bundle)
         return rom_ram_baseline_dict
     
+    @classmethod
+    def _read_bundle(cls, index: GnIndex, bundle_path: str) -> Dict[str, Any]:
+        if index:
+            return index.read_bundle(bundle_path)
+        with open(bundle_path, 'r', encoding='utf-8') as f:
+            return json.loads(f.read())
+
     @classmethod
     def _put(cls, result_dict: Dict, subsystem_name: str, component_name: str, rom_size: str, ram_size: str,
              bundle_path:str) -> None:
@@ -17,7 +17,7 @@
 # products.
 
 
-__all__ = ["configs", "result_dict", "collector_config", "sub_com_dict"]
+__all__ = ["configs", "result_dict", "collector_config", "sub_com_dict", "analysis_cache", "prepare"]
 
 import os
 import sys
@@ -29,6 +29,8 @@ from typing import Any, Tuple, Dict, Text
 import preprocess
 from pkgs.simple_yaml_tool import SimpleYamlTool
 from pkgs.basic_tool import do_nothing, BasicTool
+from pkgs.gn_index import GnIndex
+from pkgs.analysis_cache import AnalysisCache
 from get_subsystem_component import SC
 from misc import TargetNameParser, SOPostHandler, APostHandler, DefaultPostHandler, LiteLibPostHandler, \
     LiteComponentPostHandler, UnittestPostHandler, HAPPostHandler, HapPackPostHandler, lite_lib_s2m_post_handler, \
@@ -53,6 +55,10 @@ def parse_args():
                         action="store_true", help="unit adaptive")
     parser.add_argument("-f", "--output_file", type=str, default="rom_analysis_result",
                         help="basename of output file, default: rom_analysis_result. eg: rom_analysis_result")
+    parser.add_argument("-r", "--rebuild_cache", action="store_true",
+                        help="ignore the cache of last run and rebuild it(-r) or not.")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="processes to parse BUILD.gn, default is the number of cpus, 1 to parse in this process")
     args = parser.parse_args()
     return args
 
@@ -72,18 +78,31 @@ recollect_gn = _args.recollect_gn
 baseline = _args.baseline
 unit_adapt = _args.unit_adaptive
 output_file = _args.output_file
+jobs = _args.jobs
 _recollect_sc = _args.recollect_sc
 _sc_json: Dict[Text, Text] = configs.get("subsystem_component")
 _sc_save = _sc_json.get("save")
 _target_type = configs["target_type"]
 _sc_output_path = _sc_json.get("filename")
-if _recollect_sc:
-    logging.info(
-        "satrt scanning subsystem_name and component via get_subsystem_comonent.py")
-    sub_com_dict: Dict = SC.run(project_path, _sc_output_path, _sc_save)
-else:
-    with open(_sc_output_path, 'r', encoding='utf-8') as f:
-        sub_com_dict = json.load(f)
+analysis_cache = AnalysisCache(configs.get("cache_file"), project_path, load=not _args.rebuild_cache)
+# 由prepare填充,processor持有的是同一个dict
+sub_com_dict: Dict = dict()
+
+
+def prepare() -> None:
+    """
+    扫描项目,在main中调用,导入本模块时不扫描项目
+    先用上次运行的快照建立GnIndex,之后对BUILD.gn和bundle.json的查找都使用该索引,再获取子系统和部件信息
+    """
+    GnIndex.get(project_path, analysis_cache.get("gn_index"))
+    if _recollect_sc:
+        logging.info(
+            "satrt scanning subsystem_name and component via get_subsystem_comonent.py")
+        sub_com_dict.update(SC.run(project_path, _sc_output_path, _sc_save))
+    else:
+        with open(_sc_output_path, 'r', encoding='utf-8') as f:
+            sub_com_dict.update(json.load(f))
+
 
 collector_config: Tuple[BaseProcessor] = (
     DefaultProcessor(project_path=project_path,    # 项目根路径
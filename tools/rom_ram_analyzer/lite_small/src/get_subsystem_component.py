@@ -23,12 +23,34 @@ import os
 import json
 import logging
 
+from pkgs.gn_index import GnIndex
+
 g_subsystem_path_error = list()  # subsystem path exist in subsystem_config.json
 # bundle.json path which cant get component path.
 g_component_path_empty = list()
 g_component_abs_path = list()  # destPath can't be absolute path.
 
 
+def find_bundle_files(path: str) -> list:
+    """
+    与find {path} -name bundle.json相同,path在已建立的GnIndex中时从索引中获取
+    """
+    index = GnIndex.find(path)
+    bundle_list = index.get_bundle_files(path) if index else None
+    if bundle_list is not None:
+        return bundle_list
+    cmd = 'find {} -name bundle.json'.format(path)
+    return [j.strip() for j in os.popen(cmd).readlines()]
+
+
+def read_bundle(bundle_path: str) -> dict:
+    index = GnIndex.find(bundle_path)
+    if index:
+        return index.read_bundle(bundle_path)
+    with open(bundle_path, 'rb') as bundle_file:
+        return json.load(bundle_file)
+
+
 def get_subsystem_components(ohos_path: str):
     subsystem_json_path = os.path.join(
         ohos_path, r"build/subsystem_config.json")
@@ -43,14 +65,11 @@ def get_subsystem_components(ohos_path: str):
         if not os.path.exists(subsystem_path):
             g_subsystem_path_error.append(subsystem_path)
             continue
-        cmd = 'find {} -name bundle.json'.format(subsystem_path)
-        bundle_json_list = os.popen(cmd).readlines()
+        bundle_json_list = find_bundle_files(subsystem_path)
         # get components
         component_list = []
-        for j in bundle_json_list:
-            bundle_path = j.strip()
-            with open(bundle_path, 'rb') as bundle_file:
-                bundle_json = json.load(bundle_file)
+        for bundle_path in bundle_json_list:
+            bundle_json = read_bundle(bundle_path)
             component_item = {}
             if 'segment' in bundle_json and 'destPath' in bundle_json["segment"]:
                 destpath = bundle_json["segment"]["destPath"]
@@ -81,7 +100,7 @@ def get_subsystem_components_modified(ohos_root) -> dict:
 def export_to_json(subsystem_item: dict, output_filename: str):
     subsystem_item_json = json.dumps(
         subsystem_item, indent=4, separators=(', ', ': '))
-    with os.fdopen(os.open(output_filename, os.O_WRONLY | os.O_CREAT, mode=0o640), 'w') as f:
+    with os.fdopen(os.open(output_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'w') as f:
         f.write(subsystem_item_json)
     logging.info("output path: {}".format(output_filename))
 
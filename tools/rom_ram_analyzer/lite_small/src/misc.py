@@ -28,10 +28,19 @@ import preprocess
 from pkgs.gn_common_tool import GnVariableParser
 from pkgs.simple_yaml_tool import SimpleYamlTool
 from pkgs.basic_tool import BasicTool
+from pkgs.gn_index import GnIndex
 
 
 _config = SimpleYamlTool.read_yaml("config.yaml")
 
+
+def handler_config() -> Dict:
+    """
+    查找BUILD.gn以及post handler处理时读取的配置,改变时BUILD.gn的解析结果也会改变
+    """
+    return {k: _config.get(k) for k in ("black_list", "default_prefix", "default_extension")}
+
+
 def extension_handler(paragraph: Text):
     return GnVariableParser.string_parser("output_extension", paragraph).strip('"')
 
@@ -51,8 +60,8 @@ def mod_handler(paragraph: Text):
 
 def gn_lineno_collect(match_pattern: str, project_path: str) -> DefaultDict[str, List[int]]:
     """
-    在整个项目路径下搜索有特定target类型的BUILD.gn
-    :param match_pattern: 进行grep的pattern，支持扩展的正则
+    在整个项目路径下搜索有特定target类型的BUILD.gn，在项目的GnIndex中查找，不再对整个项目执行grep
+    :param match_pattern: 进行查找的pattern，只能匹配target所在的行，eg：r"^( *)shared_library\(.*?\)"
     :param project_path: 项目路径（搜索路径）
     :return: {gn_file: [line_no_1, line_no_2, ..]}
     """
@@ -67,8 +76,8 @@ def gn_lineno_collect(match_pattern: str, project_path: str) -> DefaultDict[str,
             t = list(filter(lambda x: p not in x, t))
         return t
 
-    grep_list = BasicTool.grep_ern(match_pattern, path=project_path,
-                                   include="BUILD.gn", exclude=tuple(black_list), post_handler=handler)
+    grep_list = GnIndex.get(project_path).grep_calls(match_pattern, include="BUILD.gn",
+                                                     exclude=tuple(black_list), post_handler=handler)
     gn_line_dict: DefaultDict[str, List[int]] = defaultdict(list)
     for gl in grep_list:
         gn_file, line_no, _ = gl.split(":")
@@ -34,17 +34,19 @@ from typing import Dict, List, Tuple, Text
 import copy
 import preprocess
 from time import time
-from concurrent.futures import ThreadPoolExecutor, Future
 from threading import RLock
 import collections
 
 from config import result_dict, collector_config, configs, \
-    project_path, sub_com_dict, product_name, recollect_gn, baseline, unit_adapt, output_file
+    project_path, sub_com_dict, product_name, recollect_gn, baseline, unit_adapt, output_file, analysis_cache, jobs, prepare
 from pkgs.basic_tool import BasicTool, unit_adaptive
 from pkgs.gn_common_tool import GnCommonTool
 from pkgs.simple_excel_writer import SimpleExcelWriter
 from pkgs.rom_ram_baseline_collector import RomRamBaselineCollector
+from pkgs.gn_index import GnIndex
+from pkgs.path_trie import sub_com_trie
 from misc import gn_lineno_collect
+from template_processor import GnInfoProducer
 
 
 class RomAnalysisTool:
@@ -63,7 +65,7 @@ class RomAnalysisTool:
         logging.info("start analyzing...")
         rom_ram_baseline: Dict[str, Dict] = RomRamBaselineCollector.collect(
             project_path)
-        with os.fdopen(os.open("rom_ram_baseline.json", os.O_WRONLY | os.O_CREAT, mode=0o640), 'w',
+        with os.fdopen(os.open("rom_ram_baseline.json", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'w',
                        encoding='utf-8') as f:
             json.dump(rom_ram_baseline, f, indent=4)
         gn_info_file = configs["gn_info_file"]  # filename to save gn_info
@@ -81,7 +83,7 @@ class RomAnalysisTool:
             product_dict, query_order, gn_info, gn_info_file, rom_ram_baseline, rom_size_dict)
         if unit_adapt:
             cls._result_unit_adaptive(rom_size_dict)
-        with os.fdopen(os.open(output_file_name + ".json", os.O_WRONLY | os.O_CREAT, mode=0o640), 'w',
+        with os.fdopen(os.open(output_file_name + ".json", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'w',
                        encoding='utf-8') as f:
             json.dump(rom_size_dict, f, indent=4)
         cls._save_as_xls(rom_size_dict, product_info, baseline)
@@ -90,21 +92,18 @@ class RomAnalysisTool:
     @classmethod
     def collect_gn_info(cls):
         logging.info("start scanning BUILD.gn")
-        with ThreadPoolExecutor(max_workers=len(collector_config) + 1) as pool:
-            future_list: List[Future] = list()
-            for c in collector_config:
-                future_list.append(pool.submit(c))
-            for f in future_list:
-                f.result()
+        gn_info_cache = GnInfoProducer.run(collector_config, project_path, max_workers=jobs or None,
+                                           cache=analysis_cache.get("gn_info"))
+        analysis_cache.put("gn_info", gn_info_cache)
         gn_info_file = configs["gn_info_file"]
-        with os.fdopen(os.open(gn_info_file, os.O_WRONLY | os.O_CREAT, mode=0o640), 'w', encoding='utf-8') as f:
+        with os.fdopen(os.open(gn_info_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'w', encoding='utf-8') as f:
             json.dump(result_dict, f, indent=4)
     
     @classmethod
     def collect_product_info(cls, product_name: str):
         logging.info("start scanning compile products")
         product_dict: Dict[str, List[str]] = cls._find_files(product_name)
-        with os.fdopen(os.open(configs[product_name]["product_infofile"], os.O_WRONLY | os.O_CREAT, mode=0o640), 'w', encoding='utf-8') as f:
+        with os.fdopen(os.open(configs[product_name]["product_infofile"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'w', encoding='utf-8') as f:
             json.dump(product_dict, f, indent=4)
         return product_dict
 
@@ -218,7 +217,7 @@ class RomAnalysisTool:
     def _fuzzy_match(cls, file_name: str, filter_path_keyword: Tuple[str] = tuple()) -> Tuple[str, str, str]:
         """
         TODO 应当先遍历gn_info进行匹配
-        直接grep,利用出现次数最多的BUILD.gn去定位subsystem_name和component_name"""
+        在GnIndex中查找,利用出现次数最多的BUILD.gn去定位subsystem_name和component_name"""
         logging.info(f"fuzzy match: {file_name}")
         _, base_name = os.path.split(file_name)
         if base_name.startswith("lib"):
@@ -240,9 +239,8 @@ class RomAnalysisTool:
                 t = list(filter(lambda x: p not in x, t))
             return t
 
-        grep_result: List[str] = BasicTool.grep_ern(
+        grep_result: List[str] = GnIndex.get(project_path).grep_ern(
             base_name,
-            project_path,
             include="BUILD.gn",
             exclude=tuple(exclude_dir),
             post_handler=handler)
@@ -262,13 +260,14 @@ class RomAnalysisTool:
             gn = g.split(':')[0].replace(project_path, "").lstrip(os.sep)
             gn_dict[gn] += 1
         gn_file, _ = collections.Counter(gn_dict).most_common(1)[0]
-        for k, v in sub_com_dict.items():
-            if gn_file.startswith(k):
-                s = v.get("subsystem")
-                c = v.get("component")
-                logging.info(
-                    f"fuzzy match success: subsystem_name={s}, component_name={c}")
-                return gn_file, s, c
+        found = sub_com_trie(sub_com_dict).longest_match(gn_file)
+        if found:
+            _, v = found
+            s = v.get("subsystem")
+            c = v.get("component")
+            logging.info(
+                f"fuzzy match success: subsystem_name={s}, component_name={c}")
+            return gn_file, s, c
         logging.info(f"fuzzy match failed.")
         return str(), str(), str()
 
@@ -440,11 +439,17 @@ class RomAnalysisTool:
 
 
 def main():
+    prepare()
     if recollect_gn:
         RomAnalysisTool.collect_gn_info()
+    else:
+        # gn_index的快照会更新,上次的gn_info缓存与之不再对应
+        analysis_cache.put("gn_info", None)
     product_dict: Dict[str, List[str]
     ] = RomAnalysisTool.collect_product_info(product_name)
     RomAnalysisTool.analysis(product_name, product_dict, output_file)
+    analysis_cache.put("gn_index", GnIndex.get(project_path).snapshot())
+    analysis_cache.save()
 
 
 if __name__ == "__main__":
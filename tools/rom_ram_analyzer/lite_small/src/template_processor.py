@@ -16,15 +16,22 @@
 # This file contains some template processor to collection information 
 # from some gn's template in BUILD.gn
 
-from typing import Tuple, Union, Callable, Literal, Dict, Text
+from typing import Tuple, Union, Callable, Literal, Dict, Text, List, Sequence, Optional, Set, Iterator
 from abc import ABC, abstractmethod
 import os
+import json
+import hashlib
 import logging
+import multiprocessing
 from pprint import pprint
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 from pkgs.basic_tool import do_nothing, BasicTool
 from pkgs.gn_common_tool import GnCommonTool, GnVariableParser
-from misc import BasePostHandler, gn_lineno_collect
+from pkgs.gn_index import GnIndex
+from pkgs.path_trie import find_sub_com
+from misc import BasePostHandler, gn_lineno_collect, handler_config
 
 TYPE = Literal["str", "list"]
 
@@ -70,8 +77,7 @@ class BaseProcessor(ABC):
         self.result_dict = result_dict
         self.target_type = target_type
         self.match_pattern = match_pattern
-        self.gn_file_line_no_dict = gn_lineno_collect(
-            self.match_pattern, self.project_path)
+        self.__gn_file_line_no_dict = None
         self.sc_dict = sub_com_dict
         self.target_name_parser = target_name_parser
         self.other_info_handlers = other_info_handlers
@@ -80,6 +86,13 @@ class BaseProcessor(ABC):
         self.ud_post_handler = ud_post_handler
     
     
+    @property
+    def gn_file_line_no_dict(self) -> Dict[str, List[int]]:
+        # 第一次使用时才在GnIndex中查找,创建processor时不扫描项目
+        if self.__gn_file_line_no_dict is None:
+            self.__gn_file_line_no_dict = gn_lineno_collect(self.match_pattern, self.project_path)
+        return self.__gn_file_line_no_dict
+
     def __call__(self, *args, **kwargs):
         self.run()
     
@@ -87,6 +100,16 @@ class BaseProcessor(ABC):
     def run(self):
         ...
 
+    @abstractmethod
+    def process_file(self, gn_path: str, content: str, line_no_list: List[str]) -> None:
+        """
+        处理一个BUILD.gn中所有self.target_type类型的target
+        :param gn_path: BUILD.gn的路径
+        :param content: BUILD.gn的内容
+        :param line_no_list: 各个target所在的行号
+        """
+        ...
+
     def _append(self, key: str, unit: Dict) -> None:
         """
         将target的结果存储到最终的结果字典中
@@ -103,14 +126,7 @@ class BaseProcessor(ABC):
                 gn_path, self.project_path))
             return str(), str()
         gp = gn_path.replace(self.project_path, "").lstrip(os.sep)
-        alter_list = list()
-        for k, v in self.sc_dict.items():
-            if gp.startswith(k):
-                alter_list.append(k)
-        if not alter_list:
-            return str(), str()
-        alter_list.sort(key=lambda x: len(x), reverse=True)
-        return self.sc_dict[alter_list[0]].get("subsystem"), self.sc_dict[alter_list[0]].get("component")
+        return find_sub_com(self.sc_dict, gp)
 
 
 def _gn_var_process(project_path: str, gn_v: str, alt_v: str, gn_path: str, ifrom: str, efrom: str,
@@ -179,26 +195,34 @@ class DefaultProcessor(BaseProcessor):
 
     def run(self):
         for gn_path, line_no_list in self.gn_file_line_no_dict.items():
-            # 该路径下的主要的subsystem_name与component_name，如果target中没有指定，则取此值，如果指定了，则以target中的为准
-            _sub, _com = self._find_sc(gn_path)
             with open(gn_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                itr = BasicTool.match_paragraph(
-                    content, start_pattern=self.target_type)
-                for line_no, p in zip(line_no_list, itr):
-                    paragraph = p.group()
-                    target_name = self.target_name_parser(paragraph).strip('"')
-                    if not target_name:
-                        continue
-                    if GnCommonTool.contains_gn_variable(target_name, quote_processed=True):
-                        possible_name_list = GnCommonTool.find_values_of_variable(target_name, path=gn_path,
-                                                                                  stop_tail=self.project_path)
-                        for n in possible_name_list:
-                            self.helper(n, paragraph, gn_path,
-                                        line_no, _sub, _com)
-                    else:
-                        self.helper(target_name, paragraph,
-                                    gn_path, line_no, _sub, _com)
+            self.process_file(gn_path, content, line_no_list)
+
+    def process_file(self, gn_path: str, content: str, line_no_list: List[str]) -> None:
+        # 该路径下的主要的subsystem_name与component_name，如果target中没有指定，则取此值，如果指定了，则以target中的为准
+        _sub, _com = self._find_sc(gn_path)
+        itr = BasicTool.match_paragraph(
+            content, start_pattern=self.target_type)
+        # 按照段落开始的行号与gn_lineno_collect找到的target对应
+        line_no_set = set(line_no_list)
+        for p in itr:
+            line_no = str(p.start_line)
+            if line_no not in line_no_set:
+                continue
+            paragraph = p.group()
+            target_name = self.target_name_parser(paragraph).strip('"')
+            if not target_name:
+                continue
+            if GnCommonTool.contains_gn_variable(target_name, quote_processed=True):
+                possible_name_list = GnCommonTool.find_values_of_variable(target_name, path=gn_path,
+                                                                          stop_tail=self.project_path)
+                for n in possible_name_list:
+                    self.helper(n, paragraph, gn_path,
+                                line_no, _sub, _com)
+            else:
+                self.helper(target_name, paragraph,
+                            gn_path, line_no, _sub, _com)
 
 
 class StrResourceProcessor(DefaultProcessor):
@@ -278,5 +302,136 @@ class ListResourceProcessor(DefaultProcessor):
             self._append(key, result)
 
 
+# 子进程中的processor,由进程池的initializer设置
+_worker_processors: Sequence[BaseProcessor] = tuple()
+
+
+def _init_worker(processors: Sequence[BaseProcessor]) -> None:
+    global _worker_processors
+    _worker_processors = processors
+
+
+def _process_gn_file(task: Tuple[str, str, List[Tuple[int, List[str]]]]) -> \
+        Tuple[List[Tuple[int, Dict[str, Dict]]], Optional[Set[str]]]:
+    """
+    用各个processor处理一个BUILD.gn,结果保存在各自新的result_dict中返回
+    :return: (各个processor的结果, 查找变量时查找过的目录),BUILD.gn不在GnIndex中时,查找过的目录为None
+    """
+    gn_path, content, dispatch_list = task
+    index = GnIndex.find(gn_path)
+    if index:
+        index.start_recording()
+    result = list()
+    for i, line_no_list in dispatch_list:
+        processor = _worker_processors[i]
+        result_dict = processor.result_dict
+        processor.result_dict = {processor.target_type: dict()}
+        try:
+            processor.process_file(gn_path, content, line_no_list)
+            result.append((i, processor.result_dict))
+        finally:
+            processor.result_dict = result_dict
+    queried_dirs = index.stop_recording() if index else None
+    return result, queried_dirs
+
+
+class GnInfoProducer:
+    """
+    读取每个BUILD.gn一次,将其分发给所有包含该文件中target的processor,并在进程池中解析
+    BUILD.gn按照与grep相同的顺序处理,各个processor的结果按该顺序合并,与每个processor单独运行(run)的结果相同
+    传入上次运行的缓存时,只重新解析有变化的BUILD.gn,以及查找变量时查找过的目录中有gn文件变化的BUILD.gn
+    """
+
+    @classmethod
+    def run(cls, processors: Sequence[BaseProcessor], project_path: str, max_workers: int = None,
+            cache: Dict = None) -> Dict:
+        """
+        :param processors: 要运行的processor,结果保存在其result_dict中
+        :param project_path: 项目根路径
+        :param max_workers: 进程数,默认为cpu数量,为1或者不支持fork时在当前进程中处理
+        :param cache: 上次运行返回的缓存
+        :return: 本次运行的缓存,{"key": xxx, "files": {BUILD.gn: (分发的行号, 查找过的目录, 结果)}}
+        """
+        index = GnIndex.get(project_path)
+        dispatch_dict: Dict[str, List[Tuple[int, List[str]]]] = defaultdict(list)
+        for i, p in enumerate(processors):
+            for gn_path, line_no_list in p.gn_file_line_no_dict.items():
+                dispatch_dict[gn_path].append((i, line_no_list))
+        gn_list = [gn for gn in index.get_files() if gn in dispatch_dict]
+        # 不在索引中的BUILD.gn放在最后
+        indexed = set(gn_list)
+        gn_list.extend(gn for gn in dispatch_dict.keys() if gn not in indexed)
+
+        key = cls.__cache_key(processors)
+        cached_files = cache.get("files", dict()) if cache and cache.get("key") == key else dict()
+        changed_files = index.get_changed_files()
+        changed_dirs = cls.__changed_dirs(changed_files)
+        entries: Dict[str, Tuple] = dict()
+        for gn in gn_list:
+            entry = cached_files.get(gn)
+            if entry and gn in indexed and gn not in changed_files and entry[0] == dispatch_dict[gn] \
+                    and changed_dirs.isdisjoint(entry[1]):
+                entries[gn] = entry
+        tasks = [(gn, index.get_text(gn), dispatch_dict[gn]) for gn in gn_list if gn not in entries]
+        logging.info(f"dispatch {len(tasks)} BUILD.gn to {len(processors)} processors, "
+                     f"{len(entries)} BUILD.gn unchanged since last run")
+
+        # 子进程需要继承当前进程中的GnIndex,只使用fork启动子进程
+        workers = max_workers or os.cpu_count() or 1
+        if "fork" not in multiprocessing.get_all_start_methods():
+            workers = 1
+        if workers == 1 or len(tasks) <= 1:
+            _init_worker(processors)
+            outputs = map(_process_gn_file, tasks)
+            cls.__collect(tasks, outputs, entries)
+        else:
+            chunk_size = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                     initializer=_init_worker, initargs=(tuple(processors),)) as pool:
+                cls.__collect(tasks, pool.map(_process_gn_file, tasks, chunksize=chunk_size), entries)
+
+        new_files = dict()
+        for gn in gn_list:
+            entry = entries[gn]
+            for i, processor_result in entry[2]:
+                for target_type, units in processor_result.items():
+                    processors[i].result_dict.setdefault(target_type, dict()).update(units)
+            if entry[1] is not None:
+                new_files[gn] = entry
+        return {"key": key, "files": new_files}
+
+    @staticmethod
+    def __collect(tasks: List[Tuple], outputs: Iterator[Tuple], entries: Dict[str, Tuple]) -> None:
+        for (gn, _, dispatch_list), (result, queried_dirs) in zip(tasks, outputs):
+            entries[gn] = (dispatch_list, queried_dirs, result)
+
+    @staticmethod
+    def __cache_key(processors: Sequence[BaseProcessor]) -> str:
+        # processor的配置、post handler读取的配置以及sub_com_dict改变时,所有的缓存失效
+        def name_of(handler: Callable) -> str:
+            return getattr(handler, "__qualname__", type(handler).__qualname__)
+
+        sc_dicts = {id(p.sc_dict): p.sc_dict for p in processors}
+        config = [(type(p).__name__, p.project_path, p.target_type, p.match_pattern, p.resource_field,
+                   name_of(p.target_name_parser), name_of(p.unit_post_handler), name_of(p.ud_post_handler),
+                   {k: name_of(v) for k, v in p.other_info_handlers.items()}) for p in processors]
+        content = json.dumps([config, handler_config(), list(sc_dicts.values())], sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def __changed_dirs(changed_files: Set[str]) -> Set[str]:
+        # 有gn文件变化的目录及其所有的上级目录
+        changed_dirs = set()
+        for f in changed_files:
+            d = os.path.dirname(f)
+            while d not in changed_dirs:
+                changed_dirs.add(d)
+                parent = os.path.dirname(d)
+                if parent == d:
+                    break
+                d = parent
+        return changed_dirs
+
+
 if __name__ == '__main__':
     ...
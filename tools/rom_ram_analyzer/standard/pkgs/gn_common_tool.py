@@ -20,8 +20,12 @@ from typing import List, Tuple
 
 if __name__ == '__main__':
     from basic_tool import BasicTool
+    from gn_index import GnIndex
+    from path_trie import PathTrie
 else:
     from pkgs.basic_tool import BasicTool
+    from pkgs.gn_index import GnIndex
+    from pkgs.path_trie import PathTrie
 
 
 class GnCommonTool:
@@ -58,7 +62,7 @@ class GnCommonTool:
     @classmethod
     def find_variables_in_gn(cls, var_name_tuple: tuple, path: str, stop_tail: str = "home") -> tuple:
         """
-        同时查找多个gn变量的值
+        同时查找多个gn变量的值,path在已建立的GnIndex中时从内存中查找,否则使用grep
         var_name_tuple：变量名的tuple，变量名应是未经过处理后的，如：
         xxx
         "${xxx}"
@@ -75,10 +79,15 @@ class GnCommonTool:
                 not_found_count -= 1
             var_val_dict[var] = val
         while not path.endswith(stop_tail) and not_found_count != 0:
+            index = GnIndex.find(path)
             for v in var_name_tuple:
-                cmd = r"grep -Ern '^( *){} *= *\".*?\"' --include=*.gn* {}| grep -Ev '\$' | head -n 1 | grep -E '\".*\"' -wo".format(
-                    v.strip('"').lstrip("${").rstrip('}'), path)
-                output = os.popen(cmd).read().strip().strip('"')
+                pv = v.strip('"').lstrip("${").rstrip('}')
+                if index:
+                    output = index.first_value(pv, path, anchored=True).strip().strip('"')
+                else:
+                    cmd = r"grep -Ern '^( *){} *= *\".*?\"' --include=*.gn* {}| grep -Ev '\$' | head -n 1 | grep -E '\".*\"' -wo".format(
+                        pv, path)
+                    output = os.popen(cmd).read().strip().strip('"')
                 if len(output) != 0:
                     not_found_count -= 1
                     var_val_dict[v] = output
@@ -91,6 +100,7 @@ class GnCommonTool:
         """
         查找gn_file对应的part_name和subsystem
         如果在gn中找不到，就到bundle.json中去找
+        gn_file在已建立的GnIndex中时，不再对gn_file执行grep
         """
         part_var_flag = False  # 标识这个变量从gn中取出的原始值是不是变量
         subsystem_var_flag = False
@@ -101,8 +111,15 @@ class GnCommonTool:
         part_cmd = meta_grep_pattern.format(part_name_pattern, gn_file)
         subsystem_cmd = meta_grep_pattern.format(subsystem_pattern, gn_file)
 
+        index = GnIndex.find(gn_file)
+        if index:
+            part = index.get_declaration(gn_file, "part_name")
+            subsystem = index.get_declaration(gn_file, "subsystem_name")
+        else:
+            part = os.popen(part_cmd).read()
+            subsystem = os.popen(subsystem_cmd).read()
         part_name, subsystem_name = cls._parse_part_subsystem(part_var_flag, subsystem_var_flag,
-                                                              var_list, part_cmd, subsystem_cmd, gn_file, project_path)
+                                                              var_list, part, subsystem, gn_file, project_path)
         if part_name and subsystem_name:
             return part_name, subsystem_name
         # 如果有一个没有找到，就要一层层去找bundle.json文件
@@ -114,44 +131,78 @@ class GnCommonTool:
             subsystem_name = t_subsystem_name
         return part_name, subsystem_name
 
+    __bundle_trie_dict = dict()
+    __bundle_mem_dict = dict()
+
+    @classmethod
+    def __get_bundle_trie(cls, index: GnIndex) -> PathTrie:
+        """
+        由index中的bundle.json建立前缀树,key为bundle.json所在目录相对于项目根路径的路径
+        与一层层往上查找的实现一致,项目根路径下的bundle.json不在其中
+        """
+        trie = cls.__bundle_trie_dict.get(index.project_path)
+        if trie is None:
+            trie = PathTrie()
+            for bundle_path in index.get_bundle_files():
+                bundle_dir = os.path.dirname(bundle_path)
+                if bundle_dir != index.project_path:
+                    trie.insert(os.path.relpath(bundle_dir, index.project_path), bundle_path)
+            cls.__bundle_trie_dict[index.project_path] = trie
+        return trie
+
+    @classmethod
+    def __find_bundle(cls, gnpath: str, stop_tail: str) -> str:
+        index = GnIndex.find(gnpath)
+        if index and index.project_path == stop_tail:
+            found = cls.__get_bundle_trie(index).longest_match(os.path.relpath(gnpath, stop_tail))
+            return found[1] if found else None
+        while not gnpath.endswith(stop_tail):
+            bundle_path = os.path.join(gnpath, "bundle.json")
+            if os.path.isfile(bundle_path):
+                return bundle_path
+            gnpath = os.path.split(gnpath)[0]
+        return None
+
     @classmethod
     def __find_part_subsystem_from_bundle(cls, gnpath: str, stop_tail: str = "home") -> tuple:
         """
         根据BUILD.gn的全路径，一层层往上面查找bundle.json文件，
         并从bundle.json中查找part_name和subsystem
+        gnpath在已建立的GnIndex中时，从bundle.json的前缀树中查找最近的bundle.json
         """
-        filename = "bundle.json"
         part_name = None
         subsystem_name = None
         if stop_tail not in gnpath:
             return part_name, subsystem_name
         if os.path.isfile(gnpath):
             gnpath = os.path.split(gnpath)[0]
-        while not gnpath.endswith(stop_tail):
-            bundle_path = os.path.join(gnpath, filename)
-            if not os.path.isfile(bundle_path):  # 如果该文件不在该目录下
-                gnpath = os.path.split(gnpath)[0]
-                continue
-            with open(bundle_path, 'r', encoding='utf-8') as f:
-                content = json.load(f)
-                try:
-                    part_name = content["component"]["name"]
-                    subsystem_name = content["component"]["subsystem"]
-                except KeyError:
-                    ...
-                finally:
-                    break
+        bundle_path = cls.__find_bundle(gnpath, stop_tail)
+        if bundle_path is None:
+            return part_name, subsystem_name
+        if bundle_path in cls.__bundle_mem_dict:
+            return cls.__bundle_mem_dict[bundle_path]
+        with open(bundle_path, 'r', encoding='utf-8') as f:
+            content = json.load(f)
+            try:
+                part_name = content["component"]["name"]
+                subsystem_name = content["component"]["subsystem"]
+            except KeyError:
+                ...
         part_name = None if (part_name is not None and len(
             part_name) == 0) else part_name
         subsystem_name = None if (subsystem_name is not None and len(
             subsystem_name) == 0) else subsystem_name
+        cls.__bundle_mem_dict[bundle_path] = (part_name, subsystem_name)
         return part_name, subsystem_name
 
     @classmethod
-    def _parse_part_subsystem(cls, part_var_flag: bool, subsystem_var_flag: bool, var_list: List[str], part_cmd: str,
-                              subsystem_cmd: str, gn_file: str, project_path: str) -> Tuple[str, str]:
+    def _parse_part_subsystem(cls, part_var_flag: bool, subsystem_var_flag: bool, var_list: List[str], part: str,
+                              subsystem: str, gn_file: str, project_path: str) -> Tuple[str, str]:
+        """
+        part和subsystem为gn_file中第一次出现part_name和subsystem_name的行
+        """
         part_name = subsystem_name = None
-        part = os.popen(part_cmd).read().strip()
+        part = part.strip()
         if len(part) != 0:
             part = part.split('=')[-1].strip()
             if GnCommonTool.is_gn_variable(part):
@@ -161,7 +212,7 @@ class GnCommonTool:
                 part_name = part.strip('"')
                 if len(part_name) == 0:
                     part_name = None
-        subsystem = os.popen(subsystem_cmd).read().strip()
+        subsystem = subsystem.strip()
         if len(subsystem) != 0:  # 这里是只是看有没有grep到关键字
             subsystem = subsystem.split('=')[-1].strip()
             if GnCommonTool.is_gn_variable(subsystem):
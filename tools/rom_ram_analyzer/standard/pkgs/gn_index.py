@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file contains an in-memory index of gn files to replace the recursive grep on the whole project
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from fnmatch import fnmatch
+import json
+from time import time, time_ns
+from typing import Dict, List, Tuple, Callable, Any, Iterator, Optional, Set
+
+GN_FILE_PATTERN = "*.gn*"
+BUNDLE_FILE_NAME = "bundle.json"
+
+# 目录项的类型
+_DIR = "d"
+_GN = "g"
+_BUNDLE = "b"
+# 文件系统的时间戳精度可能较低,mtime晚于遍历开始前2s的目录和文件不做缓存
+_RACY_NS = 2 * 10 ** 9
+
+_CALL_PATTERN = re.compile(r"^ *\w+ *\(")
+_ASSIGN_PATTERN = re.compile(r"= *\"")
+_PLAIN_VARIABLE_PATTERN = re.compile(r"[\w.\-/]*")
+_QUOTED_PATTERN = re.compile(r"\".*\"")
+# 与GnCommonTool.find_part_subsystem中grep的模式一致
+DECLARATION_PATTERNS = {
+    "part_name": re.compile(r"part_name *=\s*\S*"),
+    "subsystem_name": re.compile(r"subsystem_name *=\s*\S*"),
+}
+
+
+def _fingerprint(path: str, follow_symlinks: bool = True) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path, follow_symlinks=follow_symlinks)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _read_gn_text(path: str) -> str:
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        return f.read()
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class GnFile:
+    """
+    单个gn文件的分词结果,行号从1开始
+    calls: 模板调用所在的行,如shared_library("xxx") {
+    assigns: 可能是字符串变量赋值的行,如xxx = "yyy"
+    declarations: 第一次出现part_name、subsystem_name的行
+    快照中只保存分词结果和内容的摘要,不保存内容,需要内容时再读取文件
+    """
+    __slots__ = ("path", "_content", "digest", "calls", "assigns", "declarations")
+
+    def __init__(self, path: str, content: str):
+        self.path = path
+        self.__tokenize(content)
+
+    def __tokenize(self, content: str) -> None:
+        self._content = content
+        self.digest = _digest(content)
+        self.calls: List[Tuple[int, str]] = list()
+        self.assigns: List[Tuple[int, str]] = list()
+        self.declarations: Dict[str, str] = dict()
+        for line_no, line in self.lines():
+            if _CALL_PATTERN.match(line):
+                self.calls.append((line_no, line))
+            if _ASSIGN_PATTERN.search(line):
+                self.assigns.append((line_no, line))
+            for name, pattern in DECLARATION_PATTERNS.items():
+                if name not in self.declarations and pattern.search(line):
+                    self.declarations[name] = line
+
+    @property
+    def content(self) -> str:
+        if self._content is None:
+            content = _read_gn_text(self.path)
+            if _digest(content) != self.digest:
+                # 大小和mtime没有变化但内容变化了,以读取到的内容为准
+                logging.warning(f"{self.path} changed without changing its size and mtime, tokenize it again")
+                self.__tokenize(content)
+            self._content = content
+        return self._content
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__ if name != "_content"}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._content = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def get_text(self) -> str:
+        # 与open(path, 'r')读取的内容相同,换行符统一为\n
+        return self.content.replace("\r\n", "\n").replace("\r", "\n")
+
+    def lines(self) -> Iterator[Tuple[int, str]]:
+        # 与grep相同,文件末尾的换行符之后没有新的一行
+        lines = self.content.split("\n")
+        if not lines[-1]:
+            lines.pop()
+        return enumerate(lines, 1)
+
+
+class GnIndex:
+    """
+    项目中所有gn文件(*.gn*)的内存索引,只遍历并读取一次目录树,代替对整个项目的grep -rn
+    遍历时同时记录所有的bundle.json,代替find -name bundle.json
+    遍历顺序与grep -r相同(目录项的读取顺序,深度优先,不跟随符号链接),因此查询结果的顺序与grep一致
+    建立时可以传入上次运行的快照(snapshot):mtime没有变化的目录不再读取目录项,大小和mtime没有变化的文件不再读取内容
+    """
+    __indexes: Dict[str, "GnIndex"] = dict()
+    __lock = threading.Lock()
+
+    def __init__(self, project_path: str, snapshot: Optional[Dict[str, Dict]] = None):
+        self.project_path = os.path.abspath(os.path.expanduser(project_path))
+        self.__files: List[GnFile] = list()
+        self.__dir_ranges: Dict[str, Tuple[int, int]] = dict()
+        self.__file_dict: Dict[str, GnFile] = dict()
+        self.__bundle_files: List[str] = list()
+        self.__included: Dict[Tuple, List[GnFile]] = dict()
+        self.__assign_mem_dict: Dict[Tuple, List[str]] = dict()
+        self.__mem_lock = threading.Lock()
+        self.__queried_dirs: Optional[Set[str]] = None
+        self.__old_snapshot: Dict[str, Dict] = snapshot or dict()
+        self.__snapshot: Dict[str, Dict] = {"dirs": dict(), "files": dict(), "bundles": dict()}
+        self.__changed_files: Set[str] = set()
+        # 在遍历前不久修改过的目录和文件,之后的修改可能不改变mtime,不记录其mtime,下次运行时重新读取
+        self.__racy_limit = time_ns() - _RACY_NS
+        start = time()
+        self.__walk(self.project_path)
+        old_files = self.__old_snapshot.get("files", dict())
+        self.__changed_files.update(p for p in old_files.keys() if p not in self.__file_dict)
+        # 之后只会用到快照中的bundle.json
+        self.__old_snapshot = {"bundles": self.__old_snapshot.get("bundles", dict())}
+        logging.info(f"gn index: {len(self.__files)} gn files of {self.project_path} indexed in "
+                     f"{time() - start:.2f}s, {len(self.__changed_files)} changed since last run")
+
+    @classmethod
+    def get(cls, project_path: str, snapshot: Optional[Dict[str, Dict]] = None) -> "GnIndex":
+        """
+        获取project_path的索引,第一次调用时建立
+        :param snapshot: 上次运行时索引的快照(GnIndex.snapshot),只在第一次调用时使用
+        """
+        project_path = os.path.abspath(os.path.expanduser(project_path))
+        with cls.__lock:
+            index = cls.__indexes.get(project_path)
+            if index is None:
+                index = GnIndex(project_path, snapshot)
+                cls.__indexes[project_path] = index
+        return index
+
+    @classmethod
+    def find(cls, path: str) -> Optional["GnIndex"]:
+        """
+        查找已经建立的、包含path的索引,没有则返回None
+        path为目录或文件,符号链接下的路径不在索引中
+        """
+        path = os.path.abspath(path)
+        with cls.__lock:
+            for index in cls.__indexes.values():
+                if index.contains(path):
+                    return index
+        return None
+
+    def contains(self, path: str) -> bool:
+        return path in self.__dir_ranges or os.path.dirname(path) in self.__dir_ranges
+
+    def __walk(self, top: str) -> None:
+        start = len(self.__files)
+        for name, kind in self.__list_dir(top):
+            path = os.path.join(top, name)
+            if kind == _DIR:
+                self.__walk(path)
+            elif kind == _BUNDLE:
+                self.__bundle_files.append(path)
+            else:
+                gn_file = self.__load_gn_file(path)
+                if gn_file is None:
+                    continue
+                self.__files.append(gn_file)
+                self.__file_dict[path] = gn_file
+        self.__dir_ranges[top] = (start, len(self.__files))
+
+    def __list_dir(self, top: str) -> List[Tuple[str, str]]:
+        # 目录中增加、删除、重命名目录项时,目录的mtime会改变
+        try:
+            mtime = os.stat(top).st_mtime_ns
+        except OSError:
+            mtime = None
+        old = self.__old_snapshot.get("dirs", dict()).get(top)
+        if mtime is not None and old and old[0] == mtime:
+            entries = old[1]
+        else:
+            entries = self.__scan_dir(top)
+        self.__snapshot["dirs"][top] = (self.__stable(mtime), entries)
+        return entries
+
+    @staticmethod
+    def __scan_dir(top: str) -> List[Tuple[str, str]]:
+        # 只保留目录、gn文件和bundle.json
+        try:
+            with os.scandir(top) as it:
+                entries = list(it)
+        except OSError:
+            return list()
+        result = list()
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                # 与fnmatch(entry.name, GN_FILE_PATTERN)相同
+                is_gn = not is_dir and ".gn" in entry.name and entry.is_file(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                result.append((entry.name, _DIR))
+            elif entry.name == BUNDLE_FILE_NAME:
+                # 与os.path.isfile相同,跟随符号链接
+                if os.path.isfile(entry.path):
+                    result.append((entry.name, _BUNDLE))
+            elif is_gn:
+                result.append((entry.name, _GN))
+        return result
+
+    def __load_gn_file(self, path: str) -> Optional[GnFile]:
+        fingerprint = _fingerprint(path, follow_symlinks=False)
+        old = self.__old_snapshot.get("files", dict()).get(path)
+        if fingerprint is not None and old and old[0] == fingerprint:
+            gn_file = old[1]
+        else:
+            try:
+                content = _read_gn_text(path)
+            except OSError:
+                return None
+            gn_file = GnFile(path, content)
+            self.__changed_files.add(path)
+        self.__snapshot["files"][path] = (self.__stable_fingerprint(fingerprint), gn_file)
+        return gn_file
+
+    def __stable(self, mtime: Optional[int]) -> Optional[int]:
+        return mtime if mtime is not None and mtime < self.__racy_limit else None
+
+    def __stable_fingerprint(self, fingerprint: Optional[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+        return fingerprint if fingerprint is not None and self.__stable(fingerprint[1]) is not None else None
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        索引的快照,用于下次运行时建立索引,包括:
+        dirs: {目录: (mtime, [(目录项名, 类型)])}
+        files: {gn文件: ((大小, mtime), GnFile)},GnFile被pickle时不包含文件内容
+        bundles: {本次读取过的bundle.json: ((大小, mtime), 内容)}
+        """
+        return self.__snapshot
+
+    def get_changed_files(self) -> Set[str]:
+        """
+        与快照相比,内容有变化、新增和删除的gn文件,没有快照时为所有的gn文件
+        """
+        return self.__changed_files
+
+    def start_recording(self) -> None:
+        """
+        开始记录assignment_lines、first_value查找过的目录,用于判断查找的结果是否受到gn文件变化的影响
+        """
+        self.__queried_dirs = set()
+
+    def stop_recording(self) -> Set[str]:
+        queried_dirs = self.__queried_dirs or set()
+        self.__queried_dirs = None
+        return queried_dirs
+
+    def __subtree(self, path: str) -> List[GnFile]:
+        path = os.path.abspath(path)
+        if path not in self.__dir_ranges:
+            return list()
+        start, end = self.__dir_ranges[path]
+        return self.__files[start:end]
+
+    def __included_files(self, include: str, exclude: tuple) -> List[GnFile]:
+        # 与grep的--include、--exclude-dir一致:分别匹配文件名和project_path下各级目录名
+        key = (include, exclude)
+        with self.__mem_lock:
+            files = self.__included.get(key)
+        if files is not None:
+            return files
+        files = list()
+        excluded_dirs: Dict[str, bool] = dict()
+        for gn_file in self.__files:
+            dir_name, file_name = os.path.split(gn_file.path)
+            if include and not fnmatch(file_name, include):
+                continue
+            if exclude:
+                excluded = excluded_dirs.get(dir_name)
+                if excluded is None:
+                    parts = os.path.relpath(dir_name, self.project_path).split(os.sep)
+                    excluded = any(fnmatch(p, e) for p in parts if p != os.curdir for e in exclude)
+                    excluded_dirs[dir_name] = excluded
+                if excluded:
+                    continue
+            files.append(gn_file)
+        with self.__mem_lock:
+            self.__included[key] = files
+        return files
+
+    @staticmethod
+    def __format(lines: List[str]) -> str:
+        return "".join(f"{line}\n" for line in lines)
+
+    def grep_ern(self, pattern: str, include: str = str(), exclude: tuple = tuple(),
+                 post_handler: Callable[[str], Any] = None) -> Any:
+        """
+        在内存中执行与BasicTool.grep_ern相同的查找,输出格式与grep -Ern相同:{file}:{line_no}:{line}
+        pattern按python的正则表达式处理,无法编译时退回到grep
+        :param pattern: 查找的模式
+        :param include: 要查找的文件名,如BUILD.gn,为空时查找所有gn文件
+        :param exclude: 不查找project_path下的这些目录
+        :param post_handler: 对查找结果进行后处理
+        :return: post_handler处理之后的结果
+        """
+        try:
+            regex = re.compile(pattern, re.M)
+        except re.error:
+            return self.__grep(pattern, include, exclude, post_handler)
+        result = list()
+        for gn_file in self.__included_files(include, exclude):
+            # 先对整个文件进行匹配,只有匹配到时才逐行查找
+            if not regex.search(gn_file.content):
+                continue
+            result.extend(f"{gn_file.path}:{line_no}:{line}"
+                          for line_no, line in gn_file.lines() if regex.search(line))
+        output = self.__format(result)
+        if post_handler:
+            output = post_handler(output)
+        return output
+
+    def grep_calls(self, pattern: str, include: str = str(), exclude: tuple = tuple(),
+                   post_handler: Callable[[str], Any] = None) -> Any:
+        """
+        与grep_ern相同,但只在模板调用所在的行中查找,pattern只能匹配模板调用的行,如r"^( *)shared_library\(.*?\)"
+        """
+        try:
+            regex = re.compile(pattern)
+        except re.error:
+            return self.__grep(pattern, include, exclude, post_handler)
+        result = list()
+        for gn_file in self.__included_files(include, exclude):
+            result.extend(f"{gn_file.path}:{line_no}:{line}"
+                          for line_no, line in gn_file.calls if regex.search(line))
+        output = self.__format(result)
+        if post_handler:
+            output = post_handler(output)
+        return output
+
+    def assignment_lines(self, var_name: str, path: str, anchored: bool = False) -> List[str]:
+        """
+        查找path目录(含子目录)下所有gn文件中var_name的字符串赋值,结果与以下命令的输出相同:
+        grep -Ern '{var_name} *= *\".*?\"' --include=*.gn* {path}
+        anchored为True时,模式为'^( *){var_name} *= *\".*?\"'
+        :return: {file}:{line_no}:{line}的列表,不可修改
+        """
+        path = os.path.abspath(path)
+        if self.__queried_dirs is not None:
+            self.__queried_dirs.add(path)
+        key = (var_name, path, anchored)
+        with self.__mem_lock:
+            result = self.__assign_mem_dict.get(key)
+        if result is not None:
+            return result
+        pattern = r"{} *= *\".*?\"".format(var_name)
+        if anchored:
+            pattern = r"^( *)" + pattern
+        regex = re.compile(pattern)
+        # 变量名是普通字符时,匹配到的行一定是赋值行
+        plain = _PLAIN_VARIABLE_PATTERN.fullmatch(var_name) is not None
+        result = list()
+        for gn_file in self.__subtree(path):
+            lines = gn_file.assigns if plain else gn_file.lines()
+            result.extend(f"{gn_file.path}:{line_no}:{line}"
+                          for line_no, line in lines if regex.search(line))
+        with self.__mem_lock:
+            self.__assign_mem_dict[key] = result
+        return result
+
+    def first_value(self, var_name: str, path: str, anchored: bool = False) -> str:
+        """
+        查找path下var_name第一个不含$的赋值,并取出引号及其中的内容,结果与以下命令的输出相同:
+        grep -Ern '{var_name} *= *\".*?\"' --include=*.gn* {path} | grep -Ev '\$' | head -n 1 | grep -E '\".*\"' -wo
+        """
+        for line in self.assignment_lines(var_name, path, anchored):
+            if "$" in line:
+                continue
+            match = _QUOTED_PATTERN.search(line)
+            return match.group() if match else str()
+        return str()
+
+    def get_declaration(self, gn_file: str, name: str) -> str:
+        """
+        获取gn_file中第一次出现name(part_name或subsystem_name)的行,与grep -E '{name} *=\s*\S*' {gn_file} | head -n 1相同
+        """
+        indexed = self.__file_dict.get(os.path.abspath(gn_file))
+        if indexed:
+            return indexed.declarations.get(name, str())
+        if not os.path.isfile(gn_file):
+            return str()
+        return GnFile(gn_file, _read_gn_text(gn_file)).declarations.get(name, str())
+
+    def __grep(self, pattern: str, include: str, exclude: tuple, post_handler: Callable[[str], Any]) -> Any:
+        cmd = f"grep -Ern '{pattern}' '{self.project_path}'"
+        if include:
+            cmd += f" --include='{include}'"
+        for e in exclude:
+            cmd += f" --exclude-dir='{e}'"
+        output = os.popen(cmd).read()
+        if post_handler:
+            output = post_handler(output)
+        return output
+
+    def get_file_count(self) -> int:
+        return len(self.__files)
+
+    def get_files(self) -> List[str]:
+        """
+        所有gn文件的路径,顺序与grep -r的输出相同
+        """
+        return [gn_file.path for gn_file in self.__files]
+
+    def get_bundle_files(self, path: str = None) -> Optional[List[str]]:
+        """
+        path目录(含子目录)下所有bundle.json的路径,顺序与find {path} -name bundle.json的输出相同,不包括符号链接的目录下的
+        :param path: 为空时返回项目中所有的bundle.json,不是索引中的目录时返回None
+        """
+        if path is None:
+            return list(self.__bundle_files)
+        path = path.rstrip(os.sep)
+        if path not in self.__dir_ranges:
+            return None
+        prefix = path + os.sep
+        return [b for b in self.__bundle_files if b.startswith(prefix)]
+
+    def read_bundle(self, bundle_path: str) -> Any:
+        """
+        读取bundle.json,与json.load相同,大小和mtime与快照中的相同时使用快照中的内容,返回值不可修改
+        """
+        fingerprint = _fingerprint(bundle_path)
+        old = self.__old_snapshot.get("bundles", dict()).get(bundle_path)
+        if fingerprint is not None and old and old[0] == fingerprint:
+            content = old[1]
+        else:
+            with open(bundle_path, 'rb') as f:
+                content = json.load(f)
+        with self.__mem_lock:
+            self.__snapshot["bundles"][bundle_path] = (self.__stable_fingerprint(fingerprint), content)
+        return content
+
+    def get_text(self, gn_file: str) -> str:
+        """
+        gn_file的内容,与open(gn_file, 'r', encoding='utf-8').read()相同,不在索引中时读取文件
+        """
+        indexed = self.__file_dict.get(os.path.abspath(gn_file))
+        if indexed:
+            return indexed.get_text()
+        with open(gn_file, 'r', encoding='utf-8') as f:
+            return f.read()
+
+
+def _benchmark(project_path: str, patterns: List[str], exclude: tuple) -> None:
+    """
+    对比grep与GnIndex:依次查找各个模式,统计grep的调用次数、耗时以及结果是否一致
+    """
+    grep_count = 0
+    origin_popen = os.popen
+
+    def counted_popen(cmd: str, *args, **kwargs):
+        nonlocal grep_count
+        if cmd.lstrip().startswith("grep"):
+            grep_count += 1
+        return origin_popen(cmd, *args, **kwargs)
+
+    os.popen = counted_popen
+    try:
+        start = time()
+        grep_result = list()
+        for p in patterns:
+            cmd = f"grep -Ern '{p}' '{os.path.abspath(project_path)}' --include='BUILD.gn'"
+            for e in exclude:
+                cmd += f" --exclude-dir='{e}'"
+            grep_result.append(os.popen(cmd).read())
+        grep_cost = time() - start
+        grep_invocations = grep_count
+
+        grep_count = 0
+        start = time()
+        index = GnIndex.get(project_path)
+        index_result = [index.grep_ern(p, include="BUILD.gn", exclude=exclude) for p in patterns]
+        index_cost = time() - start
+        index_invocations = grep_count
+    finally:
+        os.popen = origin_popen
+
+    mismatch = [p for p, a, b in zip(patterns, grep_result, index_result) if a != b]
+    print(f"grep:    {len(patterns)} patterns, {grep_invocations} grep invocations, {grep_cost:.3f}s")
+    print(f"GnIndex: {len(patterns)} patterns, {index_invocations} grep invocations, {index_cost:.3f}s, "
+          f"{index.get_file_count()} gn files indexed")
+    print(f"mismatch: {len(mismatch)}")
+    for p in mismatch:
+        print(f"    {p}")
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 3:
+        print(f"usage: {sys.argv[0]} project_path pattern [pattern ...]")
+        sys.exit(1)
+    _benchmark(sys.argv[1], sys.argv[2:], (".repo", ".ccache", "doc", "build"))
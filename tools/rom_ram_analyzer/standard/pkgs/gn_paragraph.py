@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file contains a brace-aware extractor of target paragraphs in BUILD.gn
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, Iterator, Optional
+
+# 字符串、注释以及括号,字符串和注释中的括号不参与匹配
+_TOKEN_PATTERN = re.compile(r'"(?:\\.|[^"\\\n])*"|#[^\n]*|[{}()\[\]]')
+_PAIRS = {"}": "{", ")": "(", "]": "["}
+_BLANK_PATTERN = re.compile(r"(?:\s|#[^\n]*)*")
+
+
+class GnParagraph:
+    """
+    BUILD.gn中的一个段落,如shared_library("xxx") {...},接口与re.Match相同(group、start、end、span)
+    start_line、end_line为段落开始和结束的行号,从1开始
+    """
+    __slots__ = ("string", "start_pos", "end_pos", "start_line", "end_line")
+
+    def __init__(self, string: str, start_pos: int, end_pos: int, start_line: int, end_line: int):
+        self.string = string
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+        self.start_line = start_line
+        self.end_line = end_line
+
+    def group(self, index: int = 0) -> str:
+        if index != 0:
+            raise IndexError("no such group")
+        return self.string[self.start_pos:self.end_pos]
+
+    def start(self) -> int:
+        return self.start_pos
+
+    def end(self) -> int:
+        return self.end_pos
+
+    def span(self) -> tuple:
+        return self.start_pos, self.end_pos
+
+
+class GnParagraphExtractor:
+    """
+    对BUILD.gn的内容进行一次分词,匹配所有的括号,之后按照模式查找段落
+    段落从模式所在行的行首开始,到调用的")"结束,如果其后是"{",则到与之匹配的"}"结束,支持嵌套和单行
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.__pairs: Dict[int, int] = dict()
+        self.__opens: List[int] = list()
+        self.__line_ends: List[int] = [m.start() for m in re.finditer("\n", content)]
+        self.__tokenize()
+
+    def __tokenize(self) -> None:
+        stack: List[int] = list()
+        content = self.content
+        for m in _TOKEN_PATTERN.finditer(content):
+            c = m.group()
+            pos = m.start()
+            if c in "{([":
+                stack.append(pos)
+                if c == "(":
+                    self.__opens.append(pos)
+            elif c in _PAIRS:
+                # 不匹配的括号忽略,直到找到与之对应的左括号
+                while stack and content[stack[-1]] != _PAIRS[c]:
+                    stack.pop()
+                if stack:
+                    self.__pairs[stack.pop()] = pos
+
+    def line_of(self, pos: int) -> int:
+        return bisect_right(self.__line_ends, pos - 1) + 1
+
+    def __paragraph_end(self, pos: int) -> int:
+        # pos之后第一个"("为调用的参数,没有与之匹配的括号时段落到内容的结尾
+        i = bisect_right(self.__opens, pos - 1)
+        if i == len(self.__opens):
+            return len(self.content)
+        close = self.__pairs.get(self.__opens[i])
+        if close is None:
+            return len(self.content)
+        block = _BLANK_PATTERN.match(self.content, close + 1).end()
+        if block < len(self.content) and self.content[block] == "{":
+            close = self.__pairs.get(block)
+            if close is None:
+                return len(self.content)
+        return close + 1
+
+    def iter_paragraphs(self, start_pattern: str) -> Iterator[GnParagraph]:
+        """
+        查找所有以start_pattern开头的段落,start_pattern之后不能紧跟单词字符,如shared_library不会匹配shared_library_xxx
+        start_pattern之后应为"(",或者start_pattern中包含"(",否则不是调用,如shared_library = xxx
+        :param start_pattern: 段落开头的模式,前面的空格可以省略
+        :return: 段落的迭代器,按照开始的位置排序
+        """
+        ptrn = re.compile(r"^( *)(?:{})(?!\w)".format(start_pattern), re.M)
+        for m in ptrn.finditer(self.content):
+            call = _BLANK_PATTERN.match(self.content, m.end()).end()
+            if "(" not in m.group() and not self.content.startswith("(", call):
+                continue
+            start = m.start()
+            end = self.__paragraph_end(m.end(1))
+            yield GnParagraph(self.content, start, end, self.line_of(start), self.line_of(end - 1))
+
+
+# 同一个BUILD.gn的内容会依次交给各个processor,只对其分词一次
+_last_extractor: Optional[GnParagraphExtractor] = None
+
+
+def match_paragraph(content: str, start_pattern: str) -> Iterator[GnParagraph]:
+    global _last_extractor
+    extractor = _last_extractor
+    if extractor is None or extractor.content is not content:
+        extractor = GnParagraphExtractor(content)
+        _last_extractor = extractor
+    return extractor.iter_paragraphs(start_pattern)
+
+
+def _regex_match_paragraph(content: str, start_pattern: str, end_pattern: str = r"\}") -> Iterator[re.Match]:
+    # 原有的基于正则表达式的实现,用于对比
+    ptrn = r'^( *){s}.*?\1?{e}$'.format(s=start_pattern, e=end_pattern)
+    return re.finditer(re.compile(ptrn, re.M | re.S), content)
+
+
+def _benchmark(files: List[str], patterns: List[str], repeat: int = 3) -> None:
+    """
+    对比正则表达式与GnParagraphExtractor的耗时,以及两者找到的段落的差异
+    """
+    from time import time
+
+    contents = list()
+    for f in files:
+        with open(f, 'r', encoding='utf-8', errors='replace') as fp:
+            contents.append(fp.read())
+
+    def run(func) -> tuple:
+        result = list()
+        start = time()
+        for _ in range(repeat):
+            result = [[m.group() for p in patterns for m in func(c, p)] for c in contents]
+        return (time() - start) / repeat, result
+
+    regex_cost, regex_result = run(_regex_match_paragraph)
+    extractor_cost, extractor_result = run(match_paragraph)
+    diff = [f for f, a, b in zip(files, regex_result, extractor_result) if a != b]
+    print(f"{len(files)} files, {sum(len(c) for c in contents)} bytes, {len(patterns)} patterns")
+    print(f"regex:     {regex_cost:.3f}s, {sum(len(r) for r in regex_result)} paragraphs")
+    print(f"extractor: {extractor_cost:.3f}s, {sum(len(r) for r in extractor_result)} paragraphs")
+    print(f"files with different paragraphs: {len(diff)}")
+    for f in diff[:20]:
+        print(f"    {f}")
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+
+    if len(sys.argv) < 2:
+        print(f"usage: {sys.argv[0]} path [pattern ...]")
+        sys.exit(1)
+    gn_files = list()
+    if os.path.isfile(sys.argv[1]):
+        gn_files.append(sys.argv[1])
+    for root, _, names in os.walk(sys.argv[1]):
+        gn_files.extend(os.path.join(root, n) for n in names if n == "BUILD.gn")
+    _benchmark(gn_files, sys.argv[2:] or ["shared_library", "static_library", "executable", "ohos_shared_library",
+                                          "ohos_executable", "ohos_sa_profile", "ohos_prebuilt_etc"])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file contains a prefix tree of paths to find the subsystem and component of a path
+
+import os
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("children", "key", "value")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = dict()
+        self.key: Optional[str] = None
+        self.value: Any = None
+
+
+class PathTrie:
+    """
+    按路径的各级目录建立的前缀树,查找最长前缀的代价只与路径的深度有关,与前缀的数量无关
+    前缀按目录匹配:a/b是a/b/c的前缀,但不是a/bc的前缀
+    """
+
+    def __init__(self):
+        self.__root = _Node()
+        self.__size = 0
+
+    @staticmethod
+    def split(path: str) -> List[str]:
+        return [p for p in path.replace(os.sep, "/").split("/") if p and p != "."]
+
+    def insert(self, path: str, value: Any) -> bool:
+        """
+        插入前缀path,path已经存在时保留原有的值
+        :return: 是否插入成功
+        """
+        node = self.__root
+        for p in self.split(path):
+            child = node.children.get(p)
+            if child is None:
+                child = _Node()
+                node.children[p] = child
+            node = child
+        if node.key is not None:
+            return False
+        node.key = path
+        node.value = value
+        self.__size += 1
+        return True
+
+    def longest_match(self, path: str) -> Optional[Tuple[str, Any]]:
+        """
+        查找path的最长前缀
+        :return: (插入时的前缀, 值),没有前缀时返回None
+        """
+        node = self.__root
+        found = node if node.key is not None else None
+        for p in self.split(path):
+            node = node.children.get(p)
+            if node is None:
+                break
+            if node.key is not None:
+                found = node
+        if found is None:
+            return None
+        return found.key, found.value
+
+    def __len__(self) -> int:
+        return self.__size
+
+
+def build_sub_com_trie(sub_com_dict: Dict[str, Dict[str, str]]) -> PathTrie:
+    """
+    由get_subsystem_component.py的结果建立前缀树,key为部件的路径,值为{"subsystem": xxx, "component": xxx}
+    多个key指向同一个目录时(如a/b和a/b/),与原有的实现相同,取最长的key
+    """
+    trie = PathTrie()
+    for k in sorted(sub_com_dict.keys(), key=lambda x: len(x), reverse=True):
+        trie.insert(k, sub_com_dict[k])
+    return trie
+
+
+# 同一个sub_com_dict会被多次查找,只对其建立一次前缀树
+_last_sub_com: Tuple[Optional[Dict], Optional[PathTrie]] = (None, None)
+
+
+def sub_com_trie(sub_com_dict: Dict[str, Dict[str, str]]) -> PathTrie:
+    global _last_sub_com
+    last_dict, trie = _last_sub_com
+    if last_dict is not sub_com_dict or trie is None:
+        trie = build_sub_com_trie(sub_com_dict)
+        _last_sub_com = (sub_com_dict, trie)
+    return trie
+
+
+def find_sub_com(sub_com_dict: Dict[str, Dict[str, str]], rel_path: str) -> Tuple[str, str]:
+    """
+    查找相对于项目根路径的rel_path所属的子系统和部件
+    :return: (subsystem, component),找不到时都为空字符串
+    """
+    found = sub_com_trie(sub_com_dict).longest_match(rel_path)
+    if found is None:
+        return str(), str()
+    _, v = found
+    return v.get("subsystem"), v.get("component")
@@ -27,6 +27,8 @@ import subprocess
 from pkgs.rom_ram_baseline_collector import RomRamBaselineCollector
 from pkgs.basic_tool import BasicTool, unit_adaptive
 from pkgs.gn_common_tool import GnCommonTool, GnVariableParser
+from pkgs.gn_index import GnIndex
+from pkgs.analysis_cache import AnalysisCache
 from pkgs.simple_excel_writer import SimpleExcelWriter
 
 debug = bool(sys.gettrace())
@@ -46,9 +48,8 @@ class PreCollector:
     
     def collect_sa_profile(self):
         grep_kw = r"ohos_sa_profile"
-        grep_cmd = f"grep -rn '{grep_kw}' --include=BUILD.gn {self.project_path}"
-        content = BasicTool.execute(
-            grep_cmd, post_processor=lambda x: x.split('\n'))
+        content = GnIndex.get(self.project_path).grep_ern(
+            grep_kw, include="BUILD.gn", post_handler=lambda x: x.split('\n'))
         for item in content:
             if not item or not item.split(':')[2].startswith("ohos_sa_profile"):
                 continue
@@ -79,18 +80,23 @@ class RomAnalyzer:
     @classmethod
     def analysis(cls, system_module_info_json: Text, product_dirs: List[str],
                  project_path: Text, product_name: Text, output_file: Text, output_execel: bool, add_baseline: bool,
-                 unit_adapt: bool):
+                 unit_adapt: bool, cache_file: Text = None, rebuild_cache: bool = False):
         """
         system_module_info_json: json文件
         product_dirs：要处理的产物的路径列表如["vendor", "system/"]
         project_path: 项目根路径
         product_name: eg，rk3568
         output_file: basename of output file
+        cache_file: 缓存文件,为空时不使用缓存
+        rebuild_cache: 不加载已有的缓存,重新建立
         """
         project_path = BasicTool.get_abs_path(project_path)
+        analysis_cache = AnalysisCache(cache_file, project_path, load=not rebuild_cache)
+        # 之后PreCollector也会用到GnIndex,先建立索引,bundle.json从索引中获取
+        GnIndex.get(project_path, analysis_cache.get("gn_index"))
         rom_baseline_dict: Dict[str, Any] = RomRamBaselineCollector.collect(
             project_path)
-        with os.fdopen(os.open("rom_ram_baseline.json", os.O_WRONLY | os.O_CREAT, mode=0o640), 'w', encoding='utf-8') as f:
+        with os.fdopen(os.open("rom_ram_baseline.json", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'w', encoding='utf-8') as f:
             json.dump(rom_baseline_dict, f, indent=4)
         phone_dir = os.path.join(
             project_path, "out", product_name, "packages", "phone")
@@ -122,10 +128,12 @@ class RomAnalyzer:
             os.makedirs(output_dir, exist_ok=True)
         if unit_adapt:
             cls.result_unit_adaptive(result_dict)
-        with os.fdopen(os.open(output_file + ".json", os.O_WRONLY | os.O_CREAT, mode=0o640), 'w', encoding='utf-8') as f:
+        with os.fdopen(os.open(output_file + ".json", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), 'w', encoding='utf-8') as f:
             f.write(json.dumps(result_dict, indent=4))
         if output_execel:
             cls.__save_result_as_excel(result_dict, output_file, add_baseline)
+        analysis_cache.put("gn_index", GnIndex.get(project_path).snapshot())
+        analysis_cache.save()
     
     @classmethod
     def result_unit_adaptive(self, result_dict: Dict[str, Dict]) -> None:
@@ -323,6 +331,11 @@ def get_args():
                         action="store_true", help="unit adaptive")
     parser.add_argument("-e", "--excel", type=bool, default=False,
                         help="if output result as excel, default: False. eg: -e True")
+    parser.add_argument("-c", "--cache_file", type=str, default="rom_analysis_cache.pkl",
+                        help="file to cache the scan of project between runs, default: rom_analysis_cache.pkl. "
+                             "eg: -c \"\" to disable the cache")
+    parser.add_argument("-r", "--rebuild_cache", action="store_true",
+                        help="ignore the existing cache file and rebuild it")
     args = parser.parse_args()
     return args
 
@@ -338,4 +351,5 @@ if __name__ == '__main__':
     baseline_path = args.baseline
     unit_adaptiv = args.unit_adaptive
     RomAnalyzer.analysis(module_info_json, product_dirs,
-                         project_origin_path, product, output_file_name, output_excel, baseline_path, unit_adaptiv)
+                         project_origin_path, product, output_file_name, output_excel, baseline_path, unit_adaptiv,
+                         args.cache_file, args.rebuild_cache)
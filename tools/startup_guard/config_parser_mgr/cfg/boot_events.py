@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import re
+import json
+import math
+
+from .boot_simulator import PHASE_PRIORITY_LIMIT
+
+CHUNK_SIZE = 1024 * 1024
+
+_SEPARATORS_PATTERN = re.compile(r"[\s,]*")
+_TRACE_EVENTS_PATTERN = re.compile(r'"traceEvents"\s*:\s*\[')
+
+
+def _create_arg_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load a boot event trace and report statistics by boot phase.')
+    parser.add_argument('-i', '--input',
+                        help='input config files base directory example "out/rk3568" ', required=True)
+    parser.add_argument('-c', '--target_cpu',
+                        help='target_cpu cpu type', required=False, default="arm64")
+    parser.add_argument('-b', '--bootevent',
+                        help='input bootevent file from system', required=True)
+    return parser
+
+
+class BootEventStream(object):
+    """
+    Iterate the events of a boot event file without loading the whole file.
+    The file is a JSON array of events, or a trace object with the array in "traceEvents".
+    Complete events carry "ts" and "dur", begin and end events ("ph" B and E) of the same
+    thread are paired into one event. Only the current chunk and one event are kept in memory.
+    """
+
+    def __init__(self, file_name, chunk_size=CHUNK_SIZE):
+        self._file_name = file_name
+        self._chunk_size = chunk_size
+        self._open_spans = {}
+
+    def __iter__(self):
+        for event in self.__iter_raw():
+            event = self.__pair(event)
+            if event:
+                yield event
+
+    def __pair(self, event):
+        phase = event.get("ph")
+        if phase == "B":
+            self._open_spans.setdefault((event.get("pid"), event.get("tid")), []).append(event)
+            return None
+        if phase != "E":
+            return event
+        spans = self._open_spans.get((event.get("pid"), event.get("tid")))
+        if not spans:
+            return None
+        begin = spans.pop()
+        try:
+            return {"name": begin.get("name"), "ts": begin["ts"], "dur": event["ts"] - begin["ts"]}
+        except (KeyError, TypeError):
+            return None
+
+    def __iter_raw(self):
+        decoder = json.JSONDecoder()
+        with open(self._file_name, encoding="utf-8") as f:
+            buf = ""
+            pos = 0
+            eof = False
+            started = False
+            while True:
+                pos = _SEPARATORS_PATTERN.match(buf, pos).end()
+                if pos < len(buf):
+                    try:
+                        if not started:
+                            pos = self.__find_array(buf, pos)
+                            started = True
+                            continue
+                        if buf[pos] == "]":
+                            return
+                        event, end = decoder.raw_decode(buf, pos)
+                        # A value ending with the buffer may be cut, decode it again with more data
+                        if end < len(buf) or eof:
+                            pos = end
+                            if isinstance(event, dict):
+                                yield event
+                            continue
+                    except ValueError:
+                        if eof:
+                            raise
+                if eof:
+                    if started:
+                        raise ValueError("unterminated event array")
+                    return
+                chunk = f.read(self._chunk_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+
+    @staticmethod
+    def __find_array(buf, pos):
+        if buf[pos] == "[":
+            return pos + 1
+        if buf[pos] != "{":
+            raise ValueError("boot events are not an array")
+        match = _TRACE_EVENTS_PATTERN.search(buf, pos)
+        if not match:
+            # Keep reading until the array is found
+            raise ValueError("no traceEvents in boot event file")
+        return match.end()
+
+
+def percentile(values, percent):
+    # Nearest rank of sorted values
+    if not values:
+        return 0
+    rank = int(math.ceil(percent / 100.0 * len(values)))
+    return values[max(rank, 1) - 1]
+
+
+class BootPhaseStats(object):
+    """
+    Durations of jobs and services with boot events, grouped by the boot phase they started in.
+    A job or service belongs to the last phase started before it, by the "ts" of boot events.
+    """
+
+    NO_TIMESTAMP = "no timestamp"
+    BEFORE_PHASES = "before phases"
+
+    def __init__(self, parser):
+        self._parser = parser
+        self._phases = []
+        self._items = {}
+        self.__build()
+
+    def __build(self):
+        parser = self._parser
+        phase_names = set([name for name in parser._jobs.keys() if parser.get_job_priority(name) < PHASE_PRIORITY_LIMIT])
+        phases = [(parser._jobs[name]["startTime"], name) for name in phase_names
+                  if parser._jobs[name].get("startTime") is not None]
+        phases.sort()
+        self._phases = phases
+
+        # Phases are the boundaries, not items of them
+        items = [job for name, job in parser._jobs.items() if name not in phase_names]
+        items.extend(parser._services.values())
+        for item in items:
+            start = item.get("startTime")
+            if start is None:
+                if not item.get("executionTime"):
+                    continue
+                phase = self.NO_TIMESTAMP
+            else:
+                phase = self.__get_phase(start)
+            self._items.setdefault(phase, []).append(item.get("executionTime") or 0)
+
+    def __get_phase(self, start):
+        phase = self.BEFORE_PHASES
+        for phase_start, name in self._phases:
+            if phase_start > start:
+                break
+            phase = name
+        return phase
+
+    def get_phase_stats(self):
+        # [{phase, start, count, sum, p50, p95}] in phase order
+        res = []
+        starts = dict([(name, start) for start, name in self._phases])
+        names = [self.BEFORE_PHASES] + [name for _, name in self._phases] + [self.NO_TIMESTAMP]
+        for name in names:
+            durations = sorted(self._items.get(name, []))
+            if not durations and name not in starts:
+                continue
+            res.append({
+                "phase": name,
+                "start": starts.get(name),
+                "count": len(durations),
+                "sum": sum(durations),
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95)
+            })
+        return res
+
+    def report(self):
+        print("Boot phase statistics:")
+        print("    %-28s %14s %8s %14s %12s %12s" % ("phase", "start", "items", "sum", "p50", "p95"))
+        for stats in self.get_phase_stats():
+            start = "-" if stats["start"] is None else "%.3f" % stats["start"]
+            print("    %-28s %14s %8d %14.3f %12.3f %12.3f" % (stats["phase"], start, stats["count"],
+                                                              stats["sum"], stats["p50"], stats["p95"]))
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../.."))
+    from config_parser_mgr.cfg.config_parser import startup_config_collect
+
+    args_parser = _create_arg_parser()
+    options = args_parser.parse_args()
+    cfg_parser = startup_config_collect(options.input, options.target_cpu)
+    cfg_parser.load_boot_event_file(options.bootevent)
+    BootPhaseStats(cfg_parser).report()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import heapq
+
+# Jobs with a priority lower than this are the boot phases run one after another
+PHASE_PRIORITY_LIMIT = 100
+
+# Phases after which init starts the services of each start mode
+BOOT_SERVICES_PHASE = "init"
+NORMAL_SERVICES_PHASE = "post-init"
+
+
+def _create_arg_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Simulate init boot and find the critical path from boot events.')
+    parser.add_argument('-i', '--input',
+                        help='input config files base directory example "out/rk3568" ', required=True)
+    parser.add_argument('-c', '--target_cpu',
+                        help='target_cpu cpu type', required=False, default="arm64")
+    parser.add_argument('-b', '--bootevent',
+                        help='input bootevent file from system', required=True)
+    parser.add_argument('-t', '--top', type=int, default=10,
+                        help='number of slowest items on the critical path to report', required=False)
+    return parser
+
+
+class BootNode(dict):
+    def __init__(self, kind, name, duration):
+        self["kind"] = kind
+        self["name"] = name
+        self["duration"] = duration
+        self["preds"] = []    # (node key, cmd or reason that starts this node)
+
+    def __str__(self):
+        return "%s '%s'" % (self["kind"], self["name"])
+
+
+class BootSimulator(object):
+    """
+    Simulate init boot on the jobs and services of a ConfigParser.
+    Jobs and services are nodes of a graph weighted by the executionTime of boot events:
+      boot phases (pre-init ... boot) run one after another in the order of their priority,
+      "trigger job" and "start service" cmds start a node when their job finishes,
+      boot and normal services are started after the init and post-init phases,
+      on-boot jobs of services run after the boot phase.
+    A node starts when its first trigger finishes, so the start time of each node is the
+    shortest weighted path from the first phase, and the boot time is the latest finish time.
+    The critical path is the chain of triggers that leads to the latest finished node.
+    Units of times are the units of the boot event file.
+    """
+
+    def __init__(self, parser):
+        self._parser = parser
+        self._nodes = {}
+        self._roots = []
+        self._phases = []
+        self._start = {}
+        self._via = {}
+        self._edges = 0
+        self.__build()
+        self.__simulate()
+
+    @staticmethod
+    def job_key(name):
+        return "job:" + name
+
+    @staticmethod
+    def service_key(name):
+        return "service:" + name
+
+    def __add_edge(self, pred, succ, via):
+        if pred not in self._nodes or succ not in self._nodes:
+            return
+        self._nodes[succ]["preds"].append((pred, via))
+        self._edges += 1
+
+    def __build(self):
+        parser = self._parser
+        for name, job in parser._jobs.items():
+            self._nodes[self.job_key(name)] = BootNode("job", name, job.get("executionTime") or 0)
+        for name, service in parser._services.items():
+            duration = service.get("executionTime") or 0
+            # on-start job runs before the service process is created
+            start_job = parser._jobs.get(service.get("start_job"))
+            if start_job:
+                duration += start_job.get("executionTime") or 0
+            self._nodes[self.service_key(name)] = BootNode("service", name, duration)
+
+        phases = [name for name in parser._jobs.keys() if parser.get_job_priority(name) < PHASE_PRIORITY_LIMIT]
+        phases.sort(key=parser.get_job_priority)
+        phase_set = set(phases)
+        self._phases = phases
+        if phases:
+            self._roots.append(self.job_key(phases[0]))
+        for idx in range(1, len(phases)):
+            self.__add_edge(self.job_key(phases[idx - 1]), self.job_key(phases[idx]), "boot phase")
+
+        jobs_by_id = {}
+        for job in parser._jobs.values():
+            jobs_by_id[job.get("jobId")] = job
+        for cmd in parser._cmds:
+            job = jobs_by_id.get(cmd.get("jobId"))
+            if not job or not cmd["content"]:
+                continue
+            target = cmd["content"].split()[0]
+            if cmd["name"] == "start":
+                self.__add_edge(self.job_key(job["name"]), self.service_key(target), cmd)
+            elif cmd["name"] == "trigger" and target not in phase_set:
+                # Triggered phases are queued and run in the order of their priority
+                self.__add_edge(self.job_key(job["name"]), self.job_key(target), cmd)
+
+        for name, service in parser._services.items():
+            if service.get("boot_job"):
+                self.__add_edge(self.job_key("boot"), self.job_key(service["boot_job"]), "on-boot of %s" % name)
+            if service.get("on_demand") or service.get("disabled"):
+                continue
+            if service.get("start_mode") == "boot":
+                phase = BOOT_SERVICES_PHASE
+            elif service.get("start_mode") == "normal":
+                phase = NORMAL_SERVICES_PHASE
+            else:
+                continue
+            key = self.service_key(name)
+            if self.job_key(phase) in self._nodes:
+                self.__add_edge(self.job_key(phase), key, "start-mode %s" % service.get("start_mode"))
+            elif not phases:
+                self._roots.append(key)
+
+    def __simulate(self):
+        succs = {}
+        for key, node in self._nodes.items():
+            for pred, via in node["preds"]:
+                succs.setdefault(pred, []).append((key, via))
+
+        # Dijkstra on node weights, the first trigger of a node starts it
+        heap = []
+        for key in self._roots:
+            self._start[key] = 0
+            self._via[key] = (None, "root")
+            heapq.heappush(heap, (0, key))
+        done = set()
+        while heap:
+            start, key = heapq.heappop(heap)
+            if key in done:
+                continue
+            done.add(key)
+            finish = start + self._nodes[key]["duration"]
+            for succ, via in succs.get(key, ()):
+                if succ in done or (succ in self._start and self._start[succ] <= finish):
+                    continue
+                self._start[succ] = finish
+                self._via[succ] = (key, via)
+                heapq.heappush(heap, (finish, succ))
+
+    def get_node(self, key):
+        return self._nodes.get(key)
+
+    def get_start_time(self, key):
+        return self._start.get(key)
+
+    def get_finish_time(self, key):
+        if key not in self._start:
+            return None
+        return self._start[key] + self._nodes[key]["duration"]
+
+    def get_phases(self):
+        return self._phases
+
+    def get_trigger(self, key):
+        # (node key, cmd or reason) that started the node first
+        return self._via.get(key)
+
+    def get_reached(self):
+        return list(self._start.keys())
+
+    def get_unreached(self):
+        # Jobs of conditions that are never triggered and services never started at boot
+        return [key for key in self._nodes.keys() if key not in self._start]
+
+    def get_boot_time(self):
+        finish = [self.get_finish_time(key) for key in self._start.keys()]
+        if not finish:
+            return 0
+        return max(finish)
+
+    def get_critical_path(self):
+        # [(node key, start time, cmd or reason that started it)] from the first phase to the last finished node
+        if not self._start:
+            return []
+        last = max(self._start.keys(), key=lambda k: (self.get_finish_time(k), k))
+        path = []
+        key = last
+        while key is not None:
+            pred, via = self._via[key]
+            path.append((key, self._start[key], via))
+            key = pred
+        path.reverse()
+        return path
+
+    def format_via(self, via):
+        if not isinstance(via, dict):
+            return via
+        file_name = self._parser.get_file_name(via.get("fileId")) or ""
+        return "cmd \"%s %s\" in %s" % (via["name"], via["content"], file_name)
+
+    def report(self, top=10):
+        path = self.get_critical_path()
+        print("Boot critical path simulation:")
+        print("    %d jobs and services, %d triggers, %d reached at boot, %d never started"
+              % (len(self._nodes), self._edges, len(self._start), len(self.get_unreached())))
+        print("    Estimated boot time: %.3f" % self.get_boot_time())
+        print("    Critical path:")
+        for key, start, via in path:
+            print("        %12.3f %12.3f  %-40s %s" % (start, self._nodes[key]["duration"], self._nodes[key],
+                                                    self.format_via(via)))
+
+        slowest = sorted(path, key=lambda item: self._nodes[item[0]]["duration"], reverse=True)[:top]
+        print("    Slowest on critical path:")
+        for key, _, via in slowest:
+            node = self._nodes[key]
+            print("        %12.3f  %-40s %s" % (node["duration"], node, self.format_via(via)))
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../.."))
+    from config_parser_mgr.cfg.config_parser import startup_config_collect
+
+    args_parser = _create_arg_parser()
+    options = args_parser.parse_args()
+    cfg_parser = startup_config_collect(options.input, options.target_cpu)
+    cfg_parser.load_boot_event_file(options.bootevent)
+    BootSimulator(cfg_parser).report(options.top)
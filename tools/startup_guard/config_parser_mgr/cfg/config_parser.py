@@ -19,6 +19,13 @@
 import os
 import json
 import pprint
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .boot_events import BootEventStream
+
+# Prefixes tried for imports not starting with one of them
+IMPORT_PREFIXES = ["/system", "/chip_prod", "/sys_prod", "/vendor"]
 
 
 def _create_arg_parser():
@@ -163,6 +170,7 @@ class ServiceParser(ItemParser):
         self["permission"] = ""
         self["permission_acls"] = ""
         self["fileId"] = -1
+        self["executionTime"] = 0
 
     def create(self, json_node, parent=None, fileId=None):
         if not isinstance(json_node, dict):
@@ -311,8 +319,16 @@ class ServiceFileParser(ItemParser):
 
 
 class ConfigParser():
-    def __init__(self, path):
+    def __init__(self, path, workers=0, cache=None):
         self._path = path
+        self._cache = cache
+        if not workers:
+            workers = min(8, os.cpu_count() or 1)
+        self._workers = workers
+        self._parsed = {}
+        self._merged = set()
+        self._exists_cache = {}
+        self._load_stats = {"requests": 0, "parses": 0, "stats": 0, "stat_hits": 0}
         self._jobs = {}
         self._files = {}
         self._cmds = []
@@ -324,27 +340,106 @@ class ConfigParser():
         self._service_id = 0
         self._selinux = ""
         self._plug_in = []
+        # Secondary indexes filled while loading
+        self._cmds_by_name = {}
+        self._file_names = {}
 
     def load_config(self, file_name):
-        path = self._path + file_name
-        if not os.path.exists(path):
-            print("Warning, invalid config file %s" % path)
-            return
-        with open(path, encoding='utf-8') as content:
-            try:
+        self.load_configs([file_name])
+
+    def load_configs(self, file_names):
+        # Parse all files and their imports once in parallel, then merge them in the order of file_names
+        self._parse_configs(file_names)
+        for file_name in file_names:
+            self._merge_config(file_name)
+
+    def __getstate__(self):
+        # The file cache is saved with the parser, not in it
+        state = self.__dict__.copy()
+        state["_cache"] = None
+        return state
+
+    def get_load_summary(self):
+        stats = self._load_stats
+        return "Config files: %d loaded, %d parses and %d path checks avoided" % (
+            stats["parses"], max(0, stats["requests"] - stats["parses"]), stats["stat_hits"])
+
+    def _path_exists(self, path):
+        if path in self._exists_cache:
+            self._load_stats["stat_hits"] += 1
+        else:
+            self._load_stats["stats"] += 1
+            self._exists_cache[path] = os.path.exists(path)
+            if self._cache:
+                self._cache.watch(path)
+        return self._exists_cache[path]
+
+    def _read_config(self, file_name):
+        # Run by workers, the only shared state is the result and the cache
+        if self._cache:
+            root = self._cache.get(self._path + file_name)
+            if root is not None:
+                return root
+        try:
+            with open(self._path + file_name, encoding='utf-8') as content:
                 root = json.load(content)
-                file_id = self.add_file(file_name)
-                if not isinstance(root, dict):
-                    raise Exception("root type error")
-                if (root.__contains__("services")):
-                    self._load_services(root["services"], file_id)
-                if (root.__contains__("jobs")):
-                    self._load_jobs(root["jobs"], file_id)
-                if (root.__contains__("import")):
-                    self._load_import(root["import"])
-                    pass
-            except:
-                pass
+        except:
+            return None
+        if self._cache:
+            self._cache.put(self._path + file_name, root)
+        return root
+
+    def _parse_configs(self, file_names):
+        pending = []
+        for file_name in file_names:
+            if file_name not in self._parsed and file_name not in pending:
+                pending.append(file_name)
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            while pending:
+                readable = []
+                for file_name in pending:
+                    if self._path_exists(self._path + file_name):
+                        readable.append(file_name)
+                    else:
+                        print("Warning, invalid config file %s" % (self._path + file_name))
+                        self._parsed[file_name] = None
+                for file_name, root in zip(readable, pool.map(self._read_config, readable)):
+                    self._parsed[file_name] = root
+                self._load_stats["parses"] += len(readable)
+
+                # Imports of this level are parsed in the next one
+                next_pending = []
+                for file_name in readable:
+                    root = self._parsed[file_name]
+                    if not isinstance(root, dict) or not isinstance(root.get("import"), list):
+                        continue
+                    for import_name in self._resolve_import(root["import"]):
+                        if import_name not in self._parsed and import_name not in next_pending:
+                            next_pending.append(import_name)
+                pending = next_pending
+
+    def _merge_config(self, file_name):
+        self._load_stats["requests"] += 1
+        if file_name in self._merged:
+            return
+        self._merged.add(file_name)
+        root = self._parsed.get(file_name)
+        # Merged roots are not needed any more
+        self._parsed[file_name] = None
+        if root is None:
+            return
+        try:
+            file_id = self.add_file(file_name)
+            if not isinstance(root, dict):
+                raise Exception("root type error")
+            if (root.__contains__("services")):
+                self._load_services(root["services"], file_id)
+            if (root.__contains__("jobs")):
+                self._load_jobs(root["jobs"], file_id)
+            if (root.__contains__("import")):
+                self._load_import(root["import"])
+        except:
+            pass
 
     def add_file(self, file_name):
         if self._files.get(file_name):
@@ -354,6 +449,7 @@ class ConfigParser():
             "fileId" : self._file_id,
             "file_name" : file_name
         }
+        self._file_names[self._file_id] = file_name
         return self._files[file_name].get("fileId")
 
     def add_job(self, item, service, file_id):
@@ -368,6 +464,7 @@ class ConfigParser():
         parser = CmdParser(self)
         parser.create(item, job, file_id)
         self._cmds.append(parser)
+        self._cmds_by_name.setdefault(parser["name"], []).append(parser)
 
     def add_service(self, item, file_id):
         if self._services.get(item.get("name")):
@@ -387,6 +484,12 @@ class ConfigParser():
         parser.create(item, service)
         self._service_files[parser.get_name()] = parser
 
+    def get_cmds_by_name(self, name):
+        return self._cmds_by_name.get(name, [])
+
+    def get_file_name(self, file_id):
+        return self._file_names.get(file_id)
+
     def get_job_id(self):
         self._job_id = self._job_id + 1
         return self._job_id
@@ -426,8 +529,10 @@ class ConfigParser():
             "sys_prod/etc/init",
             "vendor/etc/init",
         ]
+        file_names = []
         for file_name in config_paths:
-            self._scan_config_file(file_name)
+            file_names.extend(self._scan_config_file(file_name))
+        self.load_configs(file_names)
 
     def get_job_priority(self, job_name):
         job_priority = {
@@ -452,17 +557,22 @@ class ConfigParser():
         if not os.path.exists(boot_event_file):
             print("Warning, invalid config file %s" % boot_event_file)
             return
-        with open(boot_event_file, encoding='utf-8') as content:
-            try:
-                root = json.load(content)
-                for item in root:
-                    self._load_boot_event(item)
-            except:
-                pass
-        pass
+        # Events are streamed, large traces are never loaded as a whole
+        start = time.time()
+        stats = {"events": 0, "jobs": 0, "services": 0}
+        try:
+            for event in BootEventStream(boot_event_file):
+                stats["events"] += 1
+                self._load_boot_event(event, stats)
+        except (OSError, ValueError) as e:
+            print("Warning, invalid boot event file %s: %s" % (boot_event_file, str(e)))
+        print("Boot events: %d read, %d job and %d service events matched in %.3fs"
+              % (stats["events"], stats["jobs"], stats["services"], time.time() - start))
 
     def load_selinux_config(self, file_name):
         path = os.path.join(self._path, file_name)
+        if self._cache:
+            self._cache.watch(path)
         if not os.path.exists(path):
             print("Error, invalid selinux config path %s" % path)
             return
@@ -498,21 +608,33 @@ class ConfigParser():
             self.add_job(item, None, file_id)
         return
 
-    def _load_import(self, import_node):
-        if not isinstance(import_node, list):
-            raise Exception("import_node type error")
-        start_with = ["/system", "/chip_prod", "/sys_prod", "/vendor"]
+    def _resolve_import(self, import_node):
+        # Imports starting with a prefix are files in the images, the others are tried with all prefixes
+        res = []
         for file in import_node:
+            if not isinstance(file, str):
+                continue
             found = False
-            for start in start_with:
+            for start in IMPORT_PREFIXES:
                 if file.startswith(start):
                     found = True
                     break
-            if found :
-                self.load_config(self._path + file)
+            if found:
+                candidates = [file]
             else:
-                for start in start_with:
-                    self.load_config(self._path + start + file, file)
+                candidates = [start + file for start in IMPORT_PREFIXES]
+            for candidate in candidates:
+                if self._path_exists(self._path + candidate):
+                    res.append(candidate)
+        return res
+
+    def _load_import(self, import_node):
+        if not isinstance(import_node, list):
+            raise Exception("import_node type error")
+        for file_name in self._resolve_import(import_node):
+            if file_name not in self._merged and file_name not in self._parsed:
+                self._parse_configs([file_name])
+            self._merge_config(file_name)
 
     def _is_valid_file(self, file, valid_file_ext):
         if not file.is_file():
@@ -524,18 +646,23 @@ class ConfigParser():
 
     def _scan_config_file(self, file_name):
         dir_config_file = os.path.join(self._path, file_name)
+        res = []
+        if self._cache:
+            self._cache.watch(dir_config_file)
         if not os.path.exists(dir_config_file):
-            return
+            return res
         try:
             with os.scandir(dir_config_file) as files:
                 for file in files:
                     if self._is_valid_file(file, ".cfg"):
-                        name = file.path[len(self._path) :]
-                        self.load_config(name)
+                        res.append(file.path[len(self._path) :])
         except:
             pass
+        return res
 
     def _scan_share_library_file(self, file_name):
+        if self._cache:
+            self._cache.watch(file_name)
         if not os.path.exists(file_name):
             return
         try:
@@ -551,18 +678,33 @@ class ConfigParser():
         except:
             pass
 
-    def _load_boot_event(self, event):
-        if self._jobs.__contains__(event.get("name")):
-            print("loadBootEvent_ %s %f" % (event.get("name"), event.get("dur")))
-            self._jobs.get(event.get("name"))["executionTime"] = event.get("dur")
+    def _load_boot_event(self, event, stats):
+        name = event.get("name")
+        dur = event.get("dur")
+        if not isinstance(dur, (int, float)):
+            return
+        if self._jobs.__contains__(name):
+            item = self._jobs.get(name)
+            stats["jobs"] += 1
+        elif self._services.__contains__(name):
+            item = self._services.get(name)
+            stats["services"] += 1
+        else:
+            return
+        item["executionTime"] = dur
+        ts = event.get("ts")
+        if isinstance(ts, (int, float)):
+            item["startTime"] = ts
+            item["endTime"] = ts + dur
 
 
-def startup_config_collect(base_path, target_cpu):
-    parser = ConfigParser(os.path.join(base_path, "packages/phone"))
+def startup_config_collect(base_path, target_cpu, cache=None):
+    parser = ConfigParser(os.path.join(base_path, "packages/phone"), cache=cache)
     parser.load_config("/system/etc/init.cfg")
     parser.scan_library(target_cpu)
     parser.scan_config()
     parser.load_selinux_config("system/etc/selinux/config")
+    print(parser.get_load_summary())
     return parser
 
 if __name__ == '__main__':
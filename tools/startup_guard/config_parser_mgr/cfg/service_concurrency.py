@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+
+from .boot_simulator import BootSimulator, BOOT_SERVICES_PHASE, NORMAL_SERVICES_PHASE
+
+# Cmds whose path arguments create or change files used by services
+FILE_CMDS = frozenset(["mkdir", "chmod", "chown", "write", "copy", "mknode", "makedev", "symlink", "restorecon",
+                       "mount", "mount_fstab", "load_param"])
+
+SOCKET_DIR = "/dev/unix/socket/"
+
+
+def _create_arg_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Analyze how many init services can start concurrently.')
+    parser.add_argument('-i', '--input',
+                        help='input config files base directory example "out/rk3568" ', required=True)
+    parser.add_argument('-c', '--target_cpu',
+                        help='target_cpu cpu type', required=False, default="arm64")
+    parser.add_argument('-b', '--bootevent',
+                        help='input bootevent file from system', required=True)
+    parser.add_argument('-t', '--top', type=int, default=20,
+                        help='number of serialized services to report', required=False)
+    return parser
+
+
+class ServiceConcurrency(object):
+    """
+    Start concurrency of init services on top of a BootSimulator.
+    The services a service really needs are derived from the cfgs:
+      start: the service owning the job that starts it with a "start" cmd,
+      files: jobs whose cmds create or change the paths in its "file" list,
+      sockets: services owning the sockets its files or on-start job refer to.
+    A service may start once its needs are finished and init starts services of its start mode
+    (after the post-init phase for normal services, after the init phase for the others).
+    Waiting longer than that means it is serialized behind a slow job or service without need.
+    """
+
+    def __init__(self, parser, simulator=None):
+        self._parser = parser
+        self._simulator = simulator or BootSimulator(parser)
+        self._needs = {}
+        self._path_jobs = {}
+        self._socket_owners = {}
+        self.__build_indexes()
+        for name in parser._services.keys():
+            self._needs[name] = self.__get_needs(name)
+
+    def __build_indexes(self):
+        parser = self._parser
+        self._jobs_by_id = {}
+        for job in parser._jobs.values():
+            self._jobs_by_id[job.get("jobId")] = job
+        services_by_id = {}
+        for service in parser._services.values():
+            services_by_id[service.get("serviceId")] = service
+        self._job_owners = {}
+        for job in parser._jobs.values():
+            owner = services_by_id.get(job.get("serviceId"))
+            if owner:
+                self._job_owners[job["name"]] = owner["name"]
+        for service in parser._services.values():
+            for job_field in ("start_job", "boot_job"):
+                if service.get(job_field):
+                    self._job_owners.setdefault(service.get(job_field), service["name"])
+
+        self._cmds_by_job = {}
+        for cmd in parser._cmds:
+            self._cmds_by_job.setdefault(cmd.get("jobId"), []).append(cmd)
+            if cmd["name"] not in FILE_CMDS:
+                continue
+            job = self._jobs_by_id.get(cmd.get("jobId"))
+            if not job:
+                continue
+            for item in cmd["content"].split():
+                if item.startswith("/"):
+                    self._path_jobs.setdefault(os.path.normpath(item), set()).add(job["name"])
+
+        for socket in parser._service_sockets.values():
+            owner = services_by_id.get(socket.get("serviceId"))
+            if owner:
+                self._socket_owners[socket["name"]] = owner["name"]
+
+    def __get_owner_key(self, job_name):
+        # A job belonging to a service is done when the service is started
+        if job_name not in self._parser._jobs:
+            return None
+        owner = self._job_owners.get(job_name)
+        if owner:
+            return BootSimulator.service_key(owner)
+        return BootSimulator.job_key(job_name)
+
+    def __get_needs(self, name):
+        parser = self._parser
+        service = parser._services[name]
+        needs = {}
+
+        trigger = self._simulator.get_trigger(BootSimulator.service_key(name))
+        if trigger and isinstance(trigger[1], dict):
+            job = self._jobs_by_id.get(trigger[1].get("jobId"))
+            if job and job["name"] in self._job_owners:
+                needs[self.__get_owner_key(job["name"])] = "start"
+
+        paths = [item.get("name") for item in parser._service_files.values()
+                 if item.get("serviceId") == service.get("serviceId")]
+        start_job = parser._jobs.get(service.get("start_job"))
+        if start_job:
+            for cmd in self._cmds_by_job.get(start_job.get("jobId"), ()):
+                paths.extend([item for item in cmd["content"].split() if item.startswith("/")])
+
+        for path in paths:
+            path = os.path.normpath(path)
+            for candidate in (path, os.path.dirname(path)):
+                for job_name in self._path_jobs.get(candidate, ()):
+                    if start_job and job_name == start_job["name"]:
+                        continue
+                    key = self.__get_owner_key(job_name)
+                    if key and key != BootSimulator.service_key(name):
+                        needs.setdefault(key, "file %s" % path)
+            if path.startswith(SOCKET_DIR):
+                owner = self._socket_owners.get(path[len(SOCKET_DIR):])
+                if owner and owner != name:
+                    needs.setdefault(BootSimulator.service_key(owner), "socket %s" % path)
+        return needs
+
+    def get_needs(self, name):
+        # {node key: reason} of a service
+        return self._needs.get(name, {})
+
+    def __get_earliest_start(self, name):
+        sim = self._simulator
+        # Boot and normal services are started by init itself, the others by cmds not earlier than boot services
+        if self._parser._services[name].get("start_mode") == "normal":
+            phase = NORMAL_SERVICES_PHASE
+        else:
+            phase = BOOT_SERVICES_PHASE
+        earliest = sim.get_finish_time(BootSimulator.job_key(phase)) or 0
+        for key in self._needs[name].keys():
+            finish = sim.get_finish_time(key)
+            if finish is not None and finish > earliest:
+                earliest = finish
+        return earliest
+
+    def __get_phase(self, start):
+        # The last boot phase started before the service, a phase starting with it has not run yet
+        phase = None
+        for name in self._simulator.get_phases():
+            phase_start = self._simulator.get_start_time(BootSimulator.job_key(name))
+            if phase_start is None or phase_start >= start:
+                break
+            phase = name
+        return phase
+
+    def get_phase_concurrency(self):
+        # [(phase, services started, max services starting at the same time)] in phase order
+        sim = self._simulator
+        intervals = {}
+        for name in self._parser._services.keys():
+            key = BootSimulator.service_key(name)
+            start = sim.get_start_time(key)
+            if start is None:
+                continue
+            intervals.setdefault(self.__get_phase(start), []).append((start, sim.get_finish_time(key)))
+
+        res = []
+        for phase in sim.get_phases() + [None]:
+            items = intervals.get(phase)
+            if not items:
+                continue
+            # (time, order, delta): a service finishing at the same time another starts does not overlap with it,
+            # but a service without duration still counts itself, it ends after all services starting with it
+            events = []
+            for start, finish in items:
+                events.append((start, 1, 1))
+                if finish is None or finish <= start:
+                    events.append((start, 2, -1))
+                else:
+                    events.append((finish, 0, -1))
+            events.sort()
+            width = 0
+            max_width = 0
+            for _, _, delta in events:
+                width += delta
+                max_width = max(max_width, width)
+            res.append((phase or "before phases", len(items), max_width))
+        return res
+
+    def get_serialized_services(self):
+        # [(avoidable wait, service name, node it waits behind, cmd or reason)] ranked by the wait
+        sim = self._simulator
+        res = []
+        for name in self._parser._services.keys():
+            key = BootSimulator.service_key(name)
+            start = sim.get_start_time(key)
+            if start is None:
+                continue
+            wait = start - self.__get_earliest_start(name)
+            if wait <= 0:
+                continue
+            pred, via = sim.get_trigger(key)
+            if pred in self._needs[name]:
+                continue
+            res.append((wait, name, pred, via))
+        res.sort(key=lambda item: (-item[0], item[1]))
+        return res
+
+    def report(self, top=20):
+        sim = self._simulator
+        print("Service start concurrency:")
+        print("    %-28s %10s %16s" % ("phase", "services", "max concurrent"))
+        for phase, count, width in self.get_phase_concurrency():
+            print("    %-28s %10d %16d" % (phase, count, width))
+
+        serialized = self.get_serialized_services()
+        print("    %d services serialized without need, top %d by avoidable wait:" % (len(serialized), top))
+        for wait, name, pred, via in serialized[:top]:
+            node = sim.get_node(pred)
+            needs = ", ".join(["%s(%s)" % (k, v) for k, v in sorted(self._needs[name].items())]) or "none"
+            print("        %12.3f  service '%s' waits behind %s of %.3f, %s, needs: %s"
+                  % (wait, name, node, node["duration"], sim.format_via(via), needs))
+
+
+if __name__ == '__main__':
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../.."))
+    from config_parser_mgr.cfg.config_parser import startup_config_collect
+
+    args_parser = _create_arg_parser()
+    options = args_parser.parse_args()
+    cfg_parser = startup_config_collect(options.input, options.target_cpu)
+    cfg_parser.load_boot_event_file(options.bootevent)
+    ServiceConcurrency(cfg_parser).report(options.top)
@@ -22,6 +22,7 @@ sys.path.append('.')
 from .param.system_parameter_parser import parameters_collect
 from .cfg.config_parser import startup_config_collect
 from .user_group.user_group_parser import create_user_group_parser
+from .parser_cache import ParserCache
 
 
 def __create_arg_parser():
@@ -31,6 +32,8 @@ def __create_arg_parser():
                         help='input config files base directory example "out/rk3568/packages/phone/" ', required=True)
     parser.add_argument('-c', '--target_cpu',
                     help='target_cpu cpu type" ', required=True)
+    parser.add_argument('--parser-cache',
+                        help='reuse parsers of unchanged files from this cache file', required=False)
     return parser
 
 
@@ -39,10 +42,30 @@ class ConfigParserMgr(object):
         self._path = path
         self._parser_list = {}
 
-    def load_all_parser(self, out_path, target_cpu):
-        cfg_parser = startup_config_collect(out_path, target_cpu)
-        param_parser = parameters_collect(out_path)
-        user_group = create_user_group_parser(out_path)
+    def load_all_parser(self, out_path, target_cpu, cache_file=None, content_cache=None):
+        if content_cache:
+            # Parse results are shared with the other products of a batch, not saved
+            self.__collect(out_path, target_cpu, content_cache)
+            return
+
+        cache = None
+        if cache_file:
+            cache = ParserCache(cache_file, out_path, target_cpu)
+            parser_list = cache.get_parsers()
+            if parser_list:
+                self._parser_list = parser_list
+                print(cache.get_summary())
+                return
+
+        self.__collect(out_path, target_cpu, cache)
+        if cache:
+            cache.save(self._parser_list)
+            print(cache.get_summary())
+
+    def __collect(self, out_path, target_cpu, cache):
+        cfg_parser = startup_config_collect(out_path, target_cpu, cache)
+        param_parser = parameters_collect(out_path, cache)
+        user_group = create_user_group_parser(out_path, cache)
         self._parser_list = {'config_parser':cfg_parser, 'system_parameter_parser':param_parser, "user_group":user_group}
 
     def get_parser_by_name(self, key):
@@ -53,4 +76,4 @@ if __name__ == '__main__':
     args_parser = __create_arg_parser()
     options = args_parser.parse_args()
     mgr = ConfigParserMgr()
-    mgr.load_all_parser(options.input, options.target_cpu)
+    mgr.load_all_parser(options.input, options.target_cpu, options.parser_cache)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Estimated layout of init's parameter workspaces, one shared memory area per selinux label plus one for DAC
+TRIE_NODE_SIZE = 24             # left, right, child, label, data and selinux indexes, key length
+PARAM_NODE_SIZE = 12            # commit id, key length, value length
+SECURITY_NODE_SIZE = 20         # uid, gid, selinux index, mode, type
+WORKSPACE_HEADER_SIZE = 64
+PARAM_VALUE_LEN_MAX = 96        # space reserved for values of parameters that are not const
+PAGE_SIZE = 4096
+PARAM_WORKSPACE_MAX = 80 * 1024
+
+DAC_WORKSPACE = "dac"
+DEFAULT_LABEL = "u:object_r:default_param:s0"
+
+
+def _align(size):
+    return (size + 3) & ~3
+
+
+class TrieNode(object):
+    __slots__ = ("children", "label", "dac", "param")
+
+    def __init__(self):
+        self.children = {}
+        self.label = None
+        self.dac = None
+        self.param = None
+
+
+class Workspace(object):
+    """
+    Trie of one shared memory area, sizes follow the node layout constants above.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._root = TrieNode()
+        self.nodes = 1
+        self.params = 0
+        self.size = WORKSPACE_HEADER_SIZE + _align(TRIE_NODE_SIZE + 1)
+
+    def add(self, segments):
+        node = self._root
+        for segment in segments:
+            child = node.children.get(segment)
+            if not child:
+                child = TrieNode()
+                node.children[segment] = child
+                self.nodes += 1
+                self.size += _align(TRIE_NODE_SIZE + len(segment) + 1)
+            node = child
+        return node
+
+    def add_param(self, name, value):
+        node = self.add(ParameterTrie.split(name))
+        if node.param is not None:
+            return
+        node.param = value
+        self.params += 1
+        if name.startswith("const."):
+            value_size = len(value) + 1
+        else:
+            value_size = max(len(value) + 1, PARAM_VALUE_LEN_MAX)
+        self.size += _align(PARAM_NODE_SIZE + len(name) + 1 + value_size)
+
+    def add_security(self, prefix):
+        node = self.add(ParameterTrie.split(prefix))
+        if node.dac is None:
+            node.dac = True
+            self.params += 1
+            self.size += _align(SECURITY_NODE_SIZE)
+
+    def get_mapped_size(self):
+        return (self.size + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+
+class ParameterTrie(object):
+    """
+    Model of init's parameter workspace built from .para, .para.dac and parameter_contexts.
+    Names are split by "." into trie nodes. Each parameter is stored in the workspace of the
+    selinux label of its longest matching prefix, DAC settings in a separate workspace.
+    """
+
+    def __init__(self, parser):
+        self._root = TrieNode()
+        self._nodes = 1
+        self._workspaces = {}
+        self._max_depth = 0
+        self._max_depth_name = ""
+        self._total_depth = 0
+        self._lookups = 0
+        self.__build(parser)
+
+    @staticmethod
+    def split(name):
+        # "a.b." is the prefix "a.b", trailing dots do not make nodes
+        return [segment for segment in name.split(".") if segment]
+
+    def __get_workspace(self, name):
+        workspace = self._workspaces.get(name)
+        if not workspace:
+            workspace = Workspace(name)
+            self._workspaces[name] = workspace
+        return workspace
+
+    def __add(self, name):
+        node = self._root
+        for segment in self.split(name):
+            child = node.children.get(segment)
+            if not child:
+                child = TrieNode()
+                node.children[segment] = child
+                self._nodes += 1
+            node = child
+        return node
+
+    def __lookup(self, name):
+        # Longest prefix match of selinux label and DAC, and the number of nodes visited
+        node = self._root
+        label = self._root.label
+        depth = 0
+        for segment in self.split(name):
+            node = node.children.get(segment)
+            if not node:
+                break
+            depth += 1
+            if node.label:
+                label = node.label
+        return label or DEFAULT_LABEL, depth
+
+    def __build(self, parser):
+        kinds = parser.get_parameter_kinds()
+        params = parser._parameters
+        for name, kind in kinds.items():
+            node = self.__add(name)
+            if "selinux" in kind and params[name].get("selinuxLabel"):
+                label = params[name]["selinuxLabel"].split()[0]
+                if name in ("*", "#"):
+                    self._root.label = label
+                else:
+                    node.label = label
+            if "dac" in kind:
+                self.__get_workspace(DAC_WORKSPACE).add_security(name)
+
+        for name, kind in kinds.items():
+            if "para" not in kind:
+                continue
+            label, depth = self.__lookup(name)
+            self._lookups += 1
+            self._total_depth += depth
+            if depth > self._max_depth:
+                self._max_depth = depth
+                self._max_depth_name = name
+            self.__get_workspace(label).add_param(name, params[name].get("value") or "")
+
+    def get_node_count(self):
+        return self._nodes
+
+    def get_workspaces(self):
+        # Largest first
+        return sorted(self._workspaces.values(), key=lambda w: (-w.size, w.name))
+
+    def get_total_size(self):
+        return sum([w.get_mapped_size() for w in self._workspaces.values()])
+
+    def get_max_depth(self):
+        return self._max_depth, self._max_depth_name
+
+    def get_average_depth(self):
+        if not self._lookups:
+            return 0
+        return float(self._total_depth) / self._lookups
+
+    def get_oversized_workspaces(self, limit=PARAM_WORKSPACE_MAX):
+        return [w for w in self.get_workspaces() if w.size > limit]
+
+    def report(self, log=print, top=10):
+        workspaces = self.get_workspaces()
+        max_depth, max_depth_name = self.get_max_depth()
+        log("Parameter workspace estimation:")
+        log("    %d trie nodes, %d workspaces, %.1f KB shared memory in total"
+            % (self._nodes, len(workspaces), self.get_total_size() / 1024.0))
+        log("    lookup depth: max %d (%s), average %.2f" % (max_depth, max_depth_name, self.get_average_depth()))
+        for w in workspaces[:top]:
+            log("    %-48s %6d entries %6d nodes %9d bytes %6d KB mapped"
+                % (w.name, w.params, w.nodes, w.size, w.get_mapped_size() // 1024))
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../.."))
+    from config_parser_mgr.param.system_parameter_parser import parameters_collect
+
+    if len(sys.argv) < 2:
+        print("Usage: %s out/rk3568" % sys.argv[0])
+        sys.exit(1)
+    ParameterTrie(parameters_collect(sys.argv[1])).report()
@@ -78,10 +78,25 @@ class ParameterSelinuxParser(ParameterParser):
 
 
 class ParameterFileParser():
-    def __init__(self):
+    def __init__(self, cache=None):
         self._parameters = {}
+        self._kinds = {}
+        self._cache = cache
+
+    def __getstate__(self):
+        # The file cache is saved with the parser, not in it
+        state = self.__dict__.copy()
+        state["_cache"] = None
+        return state
 
     def load_parameter_file(self, file_name, delimiter="="):
+        if self._cache:
+            items = self._cache.get(file_name)
+            if items is not None:
+                for name, info in items:
+                    self._handle_param_info(file_name, (name, delimiter, info))
+                return
+        items = []
         try:
             with open(file_name, encoding='utf-8') as fp:
                 line = fp.readline()
@@ -93,11 +108,18 @@ class ParameterFileParser():
                     if len(param_info) != 3:
                         line = fp.readline()
                         continue
+                    items.append((param_info[0], param_info[2]))
                     self._handle_param_info(file_name, param_info)
                     line = fp.readline()
         except:
             print("Warning, invalid parameter file ", file_name)
-            pass
+            return
+        if self._cache:
+            self._cache.put(file_name, items)
+
+    def get_parameter_kinds(self):
+        # {name: set of "para", "dac", "selinux"}, the kinds of files defining each parameter
+        return self._kinds
 
     def dump_parameter(self):
         for param in self._parameters.values():
@@ -118,17 +140,17 @@ class ParameterFileParser():
         param_name = param_info[0].strip()
         old_param = self._parameters.get(param_name)
         if file_name.endswith(".para.dac"):
+            kind = "dac"
             param = ParameterDacParser(param_name, old_param)
-            if (param.decode(param_info[2].strip())):
-                self._parameters[param_name] = param
         elif file_name.endswith(".para"):
+            kind = "para"
             param = ParameterParser(param_name, old_param)
-            if (param.decode(param_info[2].strip())):
-                self._parameters[param_name] = param
         else:
+            kind = "selinux"
             param = ParameterSelinuxParser(param_name, old_param)
-            if (param.decode(param_info[2].strip())):
-                self._parameters[param_name] = param
+        if (param.decode(param_info[2].strip())):
+            self._parameters[param_name] = param
+            self._kinds.setdefault(param_name, set()).add(kind)
 
     def _check_file(self, file):
         valid_file_ext = [".para", ".para.dac"]
@@ -140,6 +162,8 @@ class ParameterFileParser():
         return False
 
     def _scan_parameter_file(self, directory):
+        if self._cache:
+            self._cache.watch(directory)
         if not os.path.exists(directory):
             return
         with os.scandir(directory) as files:
@@ -157,8 +181,8 @@ def __create_arg_parser():
     return parser
 
 
-def parameters_collect(base_path):
-    parser = ParameterFileParser()
+def parameters_collect(base_path, cache=None):
+    parser = ParameterFileParser(cache)
     parser.scan_parameter_file(base_path)
     parser.load_parameter_file(
         "{}/packages/phone/system/etc/selinux/targeted/contexts/parameter_contexts".format(base_path), 
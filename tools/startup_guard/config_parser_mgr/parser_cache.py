@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+#coding=utf-8
+
+#
+# Copyright (c) 2025 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import pickle
+import hashlib
+import threading
+
+CACHE_VERSION = 1
+
+
+def _fingerprint(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class ParserCache(object):
+    """
+    On-disk cache of the parsers of ConfigParserMgr across startup_guard runs.
+    Every file and directory the parsers look at is watched by its size and mtime:
+      if none of them changed, the parsers of the last run are reused as they are,
+      otherwise all parsers are built again in the same order, but only changed files are
+      parsed, the others are merged from their parse results in the cache.
+    The cache is a pickle file, only use files written by this tool.
+    """
+
+    def __init__(self, cache_file, out_path, target_cpu):
+        self._cache_file = cache_file
+        self._key = (os.path.abspath(out_path), target_cpu)
+        self._watched = {}
+        self._entries = {}
+        self._old_watched = {}
+        self._old_entries = {}
+        self._parsers = None
+        self._hits = 0
+        self._misses = 0
+        self.__load()
+
+    def __load(self):
+        if not os.path.exists(self._cache_file):
+            return
+        try:
+            with open(self._cache_file, "rb") as f:
+                root = pickle.load(f)
+            if root.get("version") != CACHE_VERSION:
+                print("Parser cache %s has version %s, rebuild it" % (self._cache_file, root.get("version")))
+                return
+            if root.get("key") != self._key:
+                print("Parser cache %s is for %s, rebuild it" % (self._cache_file, root.get("key")))
+                return
+            self._old_watched = root["watched"]
+            self._old_entries = root["entries"]
+            self._parsers = root["parsers"]
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+                KeyError, TypeError, ValueError):
+            print("Warning: parser cache %s is corrupted, rebuild it" % self._cache_file)
+
+    def get_parsers(self):
+        # Parsers of the last run if no watched file or directory changed
+        if self._parsers is None:
+            return None
+        for path, fingerprint in self._old_watched.items():
+            if _fingerprint(path) != fingerprint:
+                self._parsers = None
+                return None
+        self._watched = self._old_watched
+        self._entries = self._old_entries
+        self._hits = len(self._entries)
+        return self._parsers
+
+    def watch(self, path):
+        # Directories, missing files and files read without cached entries only invalidate the parsers
+        path = os.fspath(path)
+        if path not in self._watched:
+            self._watched[path] = _fingerprint(path)
+        return self._watched[path]
+
+    def get(self, path):
+        fingerprint = self.watch(path)
+        entry = self._old_entries.get(os.fspath(path))
+        if fingerprint is None or not entry or entry[0] != fingerprint:
+            self._misses += 1
+            return None
+        self._entries[os.fspath(path)] = entry
+        self._hits += 1
+        return entry[1]
+
+    def put(self, path, info):
+        fingerprint = self.watch(path)
+        if fingerprint is not None:
+            self._entries[os.fspath(path)] = (fingerprint, info)
+
+    def save(self, parsers):
+        # Write to a temporary file and rename to keep the cache consistent
+        root = {
+            "version": CACHE_VERSION,
+            "key": self._key,
+            "watched": self._watched,
+            "entries": self._entries,
+            "parsers": parsers
+        }
+        tmp_file = self._cache_file + ".tmp"
+        try:
+            with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode=0o640), "wb") as f:
+                pickle.dump(root, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self._cache_file)
+        except (OSError, pickle.PicklingError) as e:
+            print("Warning: save parser cache failed: %s" % str(e))
+
+    def get_summary(self):
+        if self._parsers is not None:
+            return "Parser cache: reused, %d files and directories unchanged" % len(self._watched)
+        return "Parser cache: %d files reused, %d parsed, %d files and directories watched" % (
+            self._hits, self._misses, len(self._watched))
+
+
+class ContentCache(object):
+    """
+    In-memory cache of parse results shared by files with the same content,
+    e.g. the system cfgs and parameters of several products checked in one batch.
+    Entries are keyed by the file extension and the SHA-256 of the content,
+    as the extension decides how a file is parsed.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._digests = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def watch(self, path):
+        return None
+
+    def get(self, path):
+        path = os.fspath(path)
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        key = (os.path.splitext(path)[1], digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._digests[path] = key
+                self._misses += 1
+            else:
+                self._hits += 1
+        return entry
+
+    def put(self, path, info):
+        with self._lock:
+            key = self._digests.pop(os.fspath(path), None)
+            if key:
+                self._entries[key] = info
+
+    def get_summary(self):
+        return "Content cache: %d files shared by content, %d parsed" % (self._hits, self._misses)
@@ -24,7 +24,9 @@ class GroupFileParser():
     def __init__(self):
         self._group = {}
 
-    def load_file(self, file_name):
+    def load_file(self, file_name, cache=None):
+        if cache:
+            cache.watch(file_name)
         if not os.path.exists(file_name):
             return
         try:
@@ -69,7 +71,9 @@ class PasswdFileParser():
         self._name_list = []
         self._uid_list = []
 
-    def load_file(self, file_name):
+    def load_file(self, file_name, cache=None):
+        if cache:
+            cache.watch(file_name)
         if not os.path.exists(file_name):
             return
         try:
@@ -120,13 +124,13 @@ def _create_arg_parser():
                         help='output group information database directory', required=False)
     return parser
 
-def create_user_group_parser(base_path):
+def create_user_group_parser(base_path, cache=None):
     path = os.path.join(base_path, "packages/phone")
     parser = GroupFileParser()
-    parser.load_file(os.path.join(path, "system/etc/group"))
+    parser.load_file(os.path.join(path, "system/etc/group"), cache)
 
     passwd = PasswdFileParser()
-    passwd.load_file(os.path.join(path, "system/etc/passwd"))
+    passwd.load_file(os.path.join(path, "system/etc/passwd"), cache)
     return parser, passwd
 
 if __name__ == '__main__':
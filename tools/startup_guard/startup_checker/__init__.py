@@ -22,17 +22,22 @@ from .user_group_rule import UserGroupModuleRule
 from .plug_in_rule import PlugInModuleRule
 from .sa_directory_rule import SADirectoryRule
 
-def check_all_rules(mgr, args):
-    rules = [
-        CmdRule,
-        SystemParameterRule,
-        UserGroupModuleRule,
-        PlugInModuleRule,
-        SADirectoryRule,
-    ]
+ALL_RULES = [
+    CmdRule,
+    SystemParameterRule,
+    UserGroupModuleRule,
+    PlugInModuleRule,
+    SADirectoryRule,
+]
+
+def load_all_rule_files(args):
+    # Rule files are parsed once per process, batch workers forked later inherit them
+    for rule in ALL_RULES:
+        rule(None, args)
 
+def check_all_rules(mgr, args):
     passed = True
-    for rule in rules:
+    for rule in ALL_RULES:
         r = rule(mgr, args)
         r.log("Do %s rule checking now:" % rule.RULE_NAME)
         if not r.__check__():
@@ -23,6 +23,9 @@ import json
 class BaseRule(object):
     RULE_NAME = ""
 
+    # Rule files parsed by this process, shared by all rules and products
+    _loaded_files = {}
+
     def __init__(self, mgr, args):
         self._args = args
         self._mgr = mgr
@@ -42,15 +45,24 @@ class BaseRule(object):
         res = []
         for d in rules_dir:
             rules_file = os.path.join(d, self.__class__.RULE_NAME, name)
-            try:
-                with open(rules_file, "r") as f:
-                    jsonstr = "".join([line.strip() for line in f if not line.strip().startswith("//")])
-                    res = res + json.loads(jsonstr)
-            except:
-                pass
+            if rules_file not in BaseRule._loaded_files:
+                BaseRule._loaded_files[rules_file] = self.__read_rule_file(rules_file)
+            res = res + BaseRule._loaded_files[rules_file]
 
         return res
 
+    @staticmethod
+    def __read_rule_file(rules_file):
+        try:
+            with open(rules_file, "r") as f:
+                jsonstr = "".join([line.strip() for line in f if not line.strip().startswith("//")])
+                content = json.loads(jsonstr)
+        except:
+            return []
+        if not isinstance(content, list):
+            return []
+        return content
+
     def get_mgr(self):
         return self._mgr
     
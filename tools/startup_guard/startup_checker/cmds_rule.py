@@ -59,10 +59,8 @@ class CmdRule(BaseRule):
 
     def _get_start_cmds(self, parser):
         lists = {}
-        for cmd in parser._cmds:
-            if cmd["name"] == "start":
-                lists[cmd["content"]] = cmd["fileId"]
-                pass
+        for cmd in parser.get_cmds_by_name("start"):
+            lists[cmd["content"]] = cmd["fileId"]
         return lists
 
     def _parse_while_list(self):
@@ -87,6 +85,8 @@ class CmdRule(BaseRule):
         boot_passed = True
         condition_passed = True
         start_cmd_list = self._get_start_cmds(parser).keys()
+        self._boot_list = set(self._boot_list)
+        self._condition_list = set(self._condition_list)
         for key, item in parser._services.items(): 
             if item.get("start_mode") == "boot":
                 if key not in self._boot_list:
@@ -95,29 +95,23 @@ class CmdRule(BaseRule):
                 condition_passed = self._check_condition_start_mode(start_cmd_list, key, condition_passed)
         return boot_passed and condition_passed
 
-    def _check_file_id_in_cmds(self, cmdlist, cmdline):
+    def _check_file_id_in_cmds(self, parser, cmdline):
         file_id_list = set()
-        for _, cmd in enumerate(cmdlist):
-            if cmdline == cmd["name"]:
-                file_id_list.add(cmd["fileId"])
+        for cmd in parser.get_cmds_by_name(cmdline):
+            file_id_list.add(cmd["fileId"])
         return file_id_list
 
     def _check_cmdline_in_parser(self, parser):
         passed = True
-        cmdline = []
-        file_id_list = set()
-        parser_cmds = parser._cmds
-
         for cmd in self._cmds:
-            cmdline = cmd["cmd"]
-            file_id_list = self._check_file_id_in_cmds(parser_cmds, cmdline)
-            file_lists = cmd["location"]
-            for key, item in parser._files.items():
-                if item["fileId"] in file_id_list and key not in file_lists:
+            file_lists = set(cmd["location"])
+            # File ids grow in the order files are loaded
+            for file_id in sorted(self._check_file_id_in_cmds(parser, cmd["cmd"])):
+                key = parser.get_file_name(file_id)
+                if key is not None and key not in file_lists:
                     output = "\'{}\' is timeout command, in {}".format(cmd["cmd"], key)
                     self.error("%s" % str(output))
                     passed = False
-            file_id_list.clear()
         return passed
 
     def _check_selinux(self, parser):
@@ -136,14 +130,13 @@ class CmdRule(BaseRule):
     def _check_start_cmd(self, parser):
         passed = True
         start_cmd_list = self._get_start_cmds(parser)
+        allowed_cmds = set(self._start_cmd_list)
         for cmd, file_id in start_cmd_list.items():
-            if cmd in list(self._start_cmd_list):
-                pass
-            else:
-                for key, item in parser._files.items():
-                    if item["fileId"] == file_id:
-                        log_str = "{} is not in start cmd list. path:{}".format(cmd, item["file_name"])
-                        self.warn("%s" % log_str)
-                        passed = False
-                    pass
+            if cmd in allowed_cmds:
+                continue
+            file_name = parser.get_file_name(file_id)
+            if file_name is not None:
+                log_str = "{} is not in start cmd list. path:{}".format(cmd, file_name)
+                self.warn("%s" % log_str)
+                passed = False
         return passed
@@ -17,10 +17,29 @@
 #
 
 import os
-import subprocess
+import importlib.util
 
 from .base_rule import BaseRule
 
+# DT_NEEDED is read by the ELF reader of deps_guard, loaded by its file without the elf_file_mgr package
+_ELF_READER_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                "../../deps_guard/elf_file_mgr/elf_reader.py")
+_elf_reader = None
+
+
+def read_elf_needed(file):
+    global _elf_reader
+    if _elf_reader is None:
+        spec = importlib.util.spec_from_file_location("startup_guard_elf_reader", _ELF_READER_FILE)
+        _elf_reader = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_elf_reader)
+
+    # Files that are not ELF have no NEEDED entries, as readelf prints none for them
+    try:
+        return _elf_reader.read_elf_info(file)["needed"]
+    except (OSError, ValueError):
+        return []
+
 
 class PlugInModuleRule(BaseRule):
     RULE_NAME = "NO-Plug-In_Module-Init"
@@ -42,33 +61,21 @@ class PlugInModuleRule(BaseRule):
                 self._base_so = item
             if key == "private_library":
                 self._private_so = item 
-        keys = list(self._private_so.keys())
         for name in cfg_parser._plug_in:
-            if os.path.basename(name) not in keys:
+            if os.path.basename(name) not in self._private_so:
                 self.error("%s is not in whitelists" % os.path.basename(name))
                 self._passwd = False
                 continue
-            self._read_elf_dt_needed(name)
+            self._check_dt_needed(name, read_elf_needed(name))
         return self._passwd
 
-    def _read_elf_dt_needed(self, file):
-        paser = self._private_so
+    def _check_dt_needed(self, file, needed_list):
         file_name = os.path.basename(file)
-        proc = subprocess.Popen(["readelf", "-d", file],
-                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        out, _ = proc.communicate()
-        lines = out.splitlines()
-        for line in lines:
-            line = str(line)
-            if " (NEEDED) " in line:
-                needed = line.strip().split("[")[-1].split("]")[0]
-                for key, item in paser.items():
-                    if file_name == key :
-                        if needed in item["deps"] or needed in self._base_so:
-                            pass
-                        else:
-                            self._passwd = False
-                            error_log = "the dependent shared library {} of {} is not in whitelist".format(needed, file_name) 
-                            self.error("%s" % error_log)
-                            continue
-                        pass
+        allowed = set(self._private_so[file_name]["deps"])
+        allowed.update(self._base_so)
+        for needed in needed_list:
+            if needed in allowed:
+                continue
+            self._passwd = False
+            error_log = "the dependent shared library {} of {} is not in whitelist".format(needed, file_name) 
+            self.error("%s" % error_log)
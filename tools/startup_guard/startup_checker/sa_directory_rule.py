@@ -32,8 +32,6 @@ class SADirectoryRule(BaseRule):
         super().__init__(mgr, args)
         self._mkdir_cmd_whitelist = []
         self._parse_whitelist()
-        self._file_id_to_name_cache = {}  # Cache to map fileId to file name for faster lookup
-        self._file_id_cache_built = False  # Flag to indicate if cache is fully built
 
     def __check__(self):
         passed = True
@@ -73,8 +71,8 @@ class SADirectoryRule(BaseRule):
         """Check all mkdir commands according to the new flow"""
         passed = True
 
-        # Get commands using get method to avoid KeyError
-        cmds = getattr(cfg_parser, '_cmds', [])
+        # Only mkdir commands are checked, get them from the index of the parser
+        cmds = cfg_parser.get_cmds_by_name('mkdir')
         for cmd in cmds:
             # Use a safe method to get attributes from both dict and object-like cmd
             cmd_name = self._safe_get(cmd, 'name')
@@ -353,19 +351,7 @@ class SADirectoryRule(BaseRule):
 
     def _get_file_name(self, cfg_parser, file_id):
         """Get file name based on file_id"""
-        # Check if file_id is already in cache
-        if file_id in self._file_id_to_name_cache:
-            return self._file_id_to_name_cache[file_id]
-
-        # Get files using getattr to avoid accessing protected member directly
-        files_dict = getattr(cfg_parser, '_files', {})
-
-        # Build cache if not fully built yet
-        if not self._file_id_cache_built:
-            for file_name, file_info in files_dict.items():
-                current_file_id = self._safe_get(file_info, 'fileId')
-                self._file_id_to_name_cache[current_file_id] = file_name
-            self._file_id_cache_built = True
-
-        # Return from cache or 'unknown_file'
-        return self._file_id_to_name_cache.get(file_id, 'unknown_file')
+        file_name = cfg_parser.get_file_name(file_id)
+        if file_name is None:
+            return 'unknown_file'
+        return file_name
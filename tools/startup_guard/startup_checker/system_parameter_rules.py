@@ -16,8 +16,18 @@
 # limitations under the License.
 #
 
+import re
+import time
+
+from config_parser_mgr.param.parameter_trie import ParameterTrie, PARAM_WORKSPACE_MAX
+
 from .base_rule import BaseRule
 
+# Same rules as _check_param_name: 1 to 96 characters of str.isalnum() (\w without "_") or "._-@:",
+# no leading "." and no "..", a trailing "." is only allowed for empty values
+_PARAM_NAME_PATTERN = re.compile(r"(?!\.)(?!.*\.\.)[\w.@:-]{1,96}")
+_PARAM_NAME_NO_TRAILING_DOT_PATTERN = re.compile(r"(?!\.)(?!.*\.\.)[\w.@:-]{0,95}[\w@:-]")
+
 
 class SystemParameterRule(BaseRule):
     RULE_NAME = "NO-Config-SystemParameter-In-INIT"
@@ -49,26 +59,50 @@ class SystemParameterRule(BaseRule):
             return False
         return True
 
+    def _check_param_names(self, names):
+        # Batch version of _check_param_name for [(param_name, empty_flag)], returns the invalid names in order
+        invalid = []
+        match = _PARAM_NAME_PATTERN.fullmatch
+        match_no_trailing_dot = _PARAM_NAME_NO_TRAILING_DOT_PATTERN.fullmatch
+        for param_name, empty_flag in names:
+            if param_name == "#":
+                continue
+            if empty_flag:
+                valid = match(param_name)
+            else:
+                valid = match_no_trailing_dot(param_name)
+            if not valid:
+                invalid.append(param_name)
+        return invalid
+
     def _check_param_in_init(self):
         passed = True
-        value_empty_flag = True
-        white_list = self.get_white_lists()
         parser = self.get_mgr().get_parser_by_name('system_parameter_parser')
         counts = 0
+        names = []
         for key, item in parser._parameters.items():
             if (item.get("dacMode") != 0):
                 counts += 1
-            if str(item)[-1] == "=":
-                value_empty_flag = True
-            else:
-                value_empty_flag = False
+            # str(item) ends with "value=%s", the value is empty when it ends with "="
+            value = "%s" % item["value"]
+            names.append((key, value == "" or value.endswith("=")))
 
-            if not self._check_param_name(key, value_empty_flag):
-                self.error("Invalid param: %s" % key)
-                continue
-            if key in white_list:
-                continue
+        start = time.time()
+        invalid = self._check_param_names(names)
+        self.log("Checked %d parameter names in %.3fs" % (len(names), time.time() - start))
+        for key in invalid:
+            self.error("Invalid param: %s" % key)
         if counts > SystemParameterRule.CONFIG_DAC_MAX_NUM:
             self.error("DAC overallocated memory")
             passed = False
+
+        self._check_param_workspace(parser)
         return passed
+
+    def _check_param_workspace(self, parser):
+        # Estimated shared memory of the parameter workspaces, reported but not failed
+        trie = ParameterTrie(parser)
+        trie.report(self.log)
+        for workspace in trie.get_oversized_workspaces():
+            self.warn("parameter workspace %s needs about %d bytes, more than %d"
+                      % (workspace.name, workspace.size, PARAM_WORKSPACE_MAX))
@@ -16,25 +16,40 @@
 # limitations under the License.
 #
 
+import io
+import os
+import time
+import contextlib
+
 from config_parser_mgr import ConfigParserMgr
 
 
 def __create_arg_parser():
     import argparse
     parser = argparse.ArgumentParser(description='Check startup architecture information from compiled output files.')
-    parser.add_argument('-i', '--input',
-                        help='input config files base directory example "out/rk3568" ', required=True)
+    parser.add_argument('-i', '--input', nargs='+',
+                        help='input config files base directory example "out/rk3568", '
+                             'several directories are checked in one batch', required=True)
     parser.add_argument('-c', '--target_cpu',
                     help='target_cpu cpu type" ', required=True)
     parser.add_argument('-r', '--rules', action='append',
                         help='rules directory', required=False)
     parser.add_argument('-n', '--no_fail',
                         help='force to pass all rules', required=False)
+    parser.add_argument('-b', '--bootevent',
+                        help='bootevent file from system, simulate boot and report the critical path', required=False)
+    parser.add_argument('--concurrency', action='store_true',
+                        help='with bootevent, report start concurrency of services by boot phase', required=False)
+    parser.add_argument('--parser-cache',
+                        help='reuse parsers of unchanged files from this cache file, '
+                             'only for one input directory', required=False)
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='processes checking products of a batch, default is the number of cpus', required=False)
     return parser
 
 def startup_guard(out_path, target_cpu ,args=None):
     mgr = ConfigParserMgr()
-    mgr.load_all_parser(out_path, target_cpu)
+    mgr.load_all_parser(out_path, target_cpu, getattr(args, "parser_cache", None))
 
     from startup_checker import check_all_rules
     passed = check_all_rules(mgr, args)
@@ -43,7 +58,94 @@ def startup_guard(out_path, target_cpu ,args=None):
     else:
         print("Please modify according to README.md")
 
+    boot_event_file = getattr(args, "bootevent", None)
+    if boot_event_file:
+        from config_parser_mgr.cfg.boot_events import BootPhaseStats
+        from config_parser_mgr.cfg.boot_simulator import BootSimulator
+        from config_parser_mgr.cfg.service_concurrency import ServiceConcurrency
+        cfg_parser = mgr.get_parser_by_name('config_parser')
+        cfg_parser.load_boot_event_file(boot_event_file)
+        BootPhaseStats(cfg_parser).report()
+        simulator = BootSimulator(cfg_parser)
+        simulator.report()
+        if getattr(args, "concurrency", False):
+            ServiceConcurrency(cfg_parser, simulator).report()
+
+# (out path, ConfigParserMgr, parse output) of the products in a batch, inherited by forked workers
+_batch_products = []
+
+def _check_product(idx, args):
+    # Run by batch workers, the output is returned to be reported in the order of products
+    from startup_checker import check_all_rules
+    mgr = _batch_products[idx][1]
+    output = io.StringIO()
+    start = time.time()
+    error = None
+    try:
+        with contextlib.redirect_stdout(output):
+            passed = check_all_rules(mgr, args)
+    except Exception as e:
+        error = str(e)
+        output.write("%s\n" % error)
+        passed = False
+    return passed, error, output.getvalue(), time.time() - start
+
+def startup_guard_batch(out_paths, target_cpu, args=None):
+    # Products share rule files and the parse results of identical files, rules run in parallel processes
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from config_parser_mgr.parser_cache import ContentCache
+    from startup_checker import load_all_rule_files
+
+    load_all_rule_files(args)
+    content_cache = ContentCache()
+    products = _batch_products
+    del products[:]
+    start = time.time()
+    for out_path in out_paths:
+        mgr = ConfigParserMgr()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            mgr.load_all_parser(out_path, target_cpu, content_cache=content_cache)
+        products.append((out_path, mgr, output.getvalue()))
+    parse_cost = time.time() - start
+
+    # Workers are forked after parsing, they inherit the rule files and the parsers and only get the index
+    # of a product. Without fork the products are checked in this process.
+    jobs = getattr(args, "jobs", 0) or os.cpu_count() or 1
+    if "fork" not in multiprocessing.get_all_start_methods():
+        jobs = 1
+    if jobs == 1 or len(products) == 1:
+        results = [_check_product(idx, args) for idx in range(len(products))]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(products)),
+                                 mp_context=multiprocessing.get_context("fork")) as pool:
+            results = list(pool.map(_check_product, range(len(products)), [args] * len(products)))
+
+    all_passed = True
+    for (out_path, _, parse_output), (passed, _, output, _) in zip(products, results):
+        print("==== %s ====" % out_path)
+        print(parse_output + output, end="")
+        print("All rules passed" if passed else "Please modify according to README.md")
+        all_passed = all_passed and passed
+
+    print("Startup guard batch report:")
+    print("    %s, parsed in %.3fs" % (content_cache.get_summary(), parse_cost))
+    for (out_path, _, _), (passed, _, _, cost) in zip(products, results):
+        print("    %-8s %8.3fs  %s" % ("passed" if passed else "failed", cost, out_path))
+
+    # Rules raising errors fail the run as they do for a single product
+    errors = [out_path for (out_path, _, _), result in zip(products, results) if result[1]]
+    if errors:
+        raise Exception("ERROR: startup_guard failed for %s" % ", ".join(errors))
+    return all_passed
+
 if __name__ == '__main__':
     parser = __create_arg_parser()
     args = parser.parse_args()
-    startup_guard(args.input, args.target_cpu, args)
+    if len(args.input) > 1 and args.parser_cache:
+        parser.error("--parser-cache is for one input directory, a batch shares parse results by content")
+    if len(args.input) > 1:
+        startup_guard_batch(args.input, args.target_cpu, args)
+    else:
+        startup_guard(args.input[0], args.target_cpu, args)